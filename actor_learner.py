@@ -0,0 +1,309 @@
+"""
+Asenkron Aktör-Öğrenen (Actor-Learner) Eğitimi
+
+Birden fazla aktör süreci paylaşımlı bellekteki politika kopyasıyla
+PortfolioEnvironment üzerinde episode toplar; öğrenen süreç kuyruktan
+gelen trajektorilerle PPO güncellemesi yapar. Böylece ortam adımları ve
+gradyan güncellemeleri aynı anda farklı çekirdeklerde çalışır.
+"""
+
+import contextlib
+import io
+import queue
+import time
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from torch.distributions import Categorical
+from tqdm import tqdm
+
+from agents import PPOAgent
+from models import PPONetwork
+from environment import PortfolioEnvironment
+from history import create_histories, new_history_dir
+from config import (NUM_EPISODES, UPDATE_FREQUENCY, REPORT_FREQUENCY, INITIAL_BALANCE,
+                    NUM_ACTORS, ACTOR_QUEUE_SIZE, ACTOR_QUEUE_TIMEOUT, IMPORTANCE_WEIGHT_CLIP)
+
+
+def _collect_episode(env, network, action_dim):
+    """
+    Yerel politika kopyasıyla stokastik bir episode topla
+
+    Returns:
+        dict: Trajektori (durumlar, aksiyonlar, ödüller, davranış log olasılıkları)
+    """
+    states, actions, rewards, log_probs, values, dones = [], [], [], [], [], []
+
+    state = env.reset()
+    done = False
+    with torch.no_grad():
+        while not done:
+            action_logits, state_value = network(torch.from_numpy(state).unsqueeze(0))
+            action_dist = Categorical(logits=action_logits)
+            action = action_dist.sample()
+
+            action_idx = action.item()
+            action_vector = np.zeros(action_dim)
+            action_vector[action_idx] = 1.0
+            next_state, reward, done, _ = env.step(action_vector)
+
+            states.append(state)
+            actions.append(action_idx)
+            rewards.append(reward)
+            log_probs.append(action_dist.log_prob(action).item())
+            values.append(state_value.item())
+            dones.append(done)
+
+            state = next_state
+
+    return {
+        'states': np.array(states, dtype=np.float32),
+        'actions': actions,
+        'rewards': rewards,
+        'log_probs': log_probs,
+        'values': values,
+        'dones': dones,
+        'episode_reward': float(np.sum(rewards)),
+        'final_portfolio_value': env.portfolio_history[-1]
+    }
+
+
+def _actor_worker(actor_id, processed_data, shared_policy, policy_version, policy_lock,
+                  trajectory_queue, stop_event, seed):
+    """
+    Aktör süreci: paylaşımlı politika değiştikçe yerel kopyayı günceller
+    ve topladığı trajektorileri kuyruğa yazar
+    """
+    torch.set_num_threads(1)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = PortfolioEnvironment(processed_data)
+
+    local_policy = PPONetwork(shared_policy.state_dim, shared_policy.action_dim, shared_policy.hidden_dim)
+    local_policy.eval()
+    local_version = -1
+
+    while not stop_event.is_set():
+        # Yeni politika sürümü yayınlandıysa senkronize et
+        if policy_version.value != local_version:
+            with policy_lock:
+                local_policy.load_state_dict(shared_policy.state_dict())
+                local_version = policy_version.value
+
+        trajectory = _collect_episode(env, local_policy, shared_policy.action_dim)
+        trajectory['policy_version'] = local_version
+        trajectory['actor_id'] = actor_id
+
+        while not stop_event.is_set():
+            try:
+                trajectory_queue.put(trajectory, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+
+
+def _learner_update(agent, trajectories, rho_clip):
+    """
+    Kuyruktan gelen trajektorilerle importance-düzeltmeli PPO güncellemesi
+
+    Trajektoriler öğrenenin güncel policy_old'undan daha eski bir politikayla
+    toplanmış olabilir. PPO oranı policy_old'a göre hesaplanır; avantajlar
+    ise kırpılmış importance weight min(rho_clip, pi_old / mu) ile
+    ağırlıklandırılır (mu: davranış politikası).
+
+    Returns:
+        dict: Eğitim ve importance weight metrikleri
+    """
+    agent.clear_buffer()
+    for trajectory in trajectories:
+        for i in range(len(trajectory['actions'])):
+            agent.store_transition(trajectory['states'][i], trajectory['actions'][i],
+                                   trajectory['rewards'][i], trajectory['log_probs'][i],
+                                   trajectory['values'][i], trajectory['dones'][i])
+
+    behaviour_log_probs = np.array(agent.buffer['log_probs'], dtype=np.float32)
+    proximal_log_probs = agent.evaluate_log_probs(agent.buffer['states'], agent.buffer['actions'])
+    importance_weights = np.exp(proximal_log_probs - behaviour_log_probs)
+    clipped_weights = np.minimum(importance_weights, rho_clip)
+
+    agent.buffer['log_probs'] = list(proximal_log_probs)
+    metrics = agent.update(sample_weights=clipped_weights)
+
+    metrics['mean_importance_weight'] = float(np.mean(importance_weights))
+    metrics['clipped_fraction'] = float(np.mean(importance_weights > rho_clip))
+    return metrics
+
+
+def _next_trajectory(trajectory_queue, actors, timeout=ACTOR_QUEUE_TIMEOUT):
+    """
+    Kuyruktan sıradaki trajektoriyi al; beklerken aktörlerin canlılığını kontrol et
+
+    Aktörler stop_event gelene kadar çıkmaz; erken çıkan bir aktör hata
+    olarak kabul edilir ve öğrenen sonsuza kadar beklemek yerine durur.
+
+    Args:
+        trajectory_queue: Trajektori kuyruğu
+        actors (list): Aktör süreçleri
+        timeout (float): Yoklama aralığı (sn)
+
+    Returns:
+        dict: Trajektori
+    """
+    while True:
+        try:
+            return trajectory_queue.get(timeout=timeout)
+        except queue.Empty:
+            failed = [(actor.name, actor.exitcode) for actor in actors if not actor.is_alive()]
+            if failed:
+                raise RuntimeError(f"Aktör süreçleri beklenmedik şekilde sonlandı (ad, çıkış kodu): {failed}")
+
+
+def train_actor_learner(processed_data, num_episodes=NUM_EPISODES, n_actors=NUM_ACTORS,
+                        update_frequency=UPDATE_FREQUENCY, rho_clip=IMPORTANCE_WEIGHT_CLIP, seed=0,
+                        history_dir=None):
+    """
+    Asenkron aktör-öğrenen modunda eğitim
+
+    Args:
+        processed_data (dict): DataManager.process_data çıktısı
+        num_episodes (int): Öğrenenin tüketeceği toplam episode sayısı
+        n_actors (int): Aktör süreci sayısı
+        update_frequency (int): Kaç trajektoride bir güncelleme
+        rho_clip (float): Importance weight kırpma eşiği
+        seed (int): Aktör tohumlarının başlangıç değeri
+        history_dir (str): Ödül geçmişlerinin taşma dizini (None: yalnızca son değerler bellekte,
+            sonuçlardaki eski episode'lar NaN olur)
+
+    Returns:
+        tuple: (trained_agent, results)
+    """
+    ctx = mp.get_context('spawn')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = PortfolioEnvironment(processed_data)
+    state_dim = len(env.get_state())
+    action_dim = processed_data['n_stocks'] + 1
+
+    agent = PPOAgent(state_dim, action_dim)
+
+    # Aktörlerin okuduğu paylaşımlı politika anlık görüntüsü
+    shared_policy = PPONetwork(state_dim, action_dim, agent.policy.hidden_dim)
+    shared_policy.load_state_dict(agent.policy.state_dict())
+    shared_policy.share_memory()
+
+    policy_version = ctx.Value('i', 0)
+    policy_lock = ctx.Lock()
+    trajectory_queue = ctx.Queue(maxsize=ACTOR_QUEUE_SIZE)
+    stop_event = ctx.Event()
+
+    actors = [
+        ctx.Process(target=_actor_worker, daemon=True,
+                    args=(actor_id, processed_data, shared_policy, policy_version, policy_lock,
+                          trajectory_queue, stop_event, seed + actor_id))
+        for actor_id in range(n_actors)
+    ]
+    for actor in actors:
+        actor.start()
+
+    print(f"\n🎯 Aktör-öğrenen eğitimi başlıyor ({n_actors} aktör)...")
+    print("=" * 60)
+
+    histories = create_histories(['episode_rewards', 'episode_portfolio_values'], history_dir)
+    episode_rewards = histories['episode_rewards']
+    episode_portfolio_values = histories['episode_portfolio_values']
+    policy_lags = []
+    update_history = []
+    learner_wait_time = 0.0
+    learner_version = 0
+    pending = []
+    start_time = time.perf_counter()
+
+    try:
+        for episode in tqdm(range(num_episodes), desc="Öğrenen"):
+            wait_start = time.perf_counter()
+            trajectory = _next_trajectory(trajectory_queue, actors)
+            learner_wait_time += time.perf_counter() - wait_start
+
+            policy_lags.append(learner_version - trajectory['policy_version'])
+            episode_rewards.append(trajectory['episode_reward'])
+            episode_portfolio_values.append(trajectory['final_portfolio_value'])
+            pending.append(trajectory)
+
+            if len(pending) == update_frequency:
+                update_metrics = _learner_update(agent, pending, rho_clip)
+                pending = []
+
+                # Yeni politikayı aktörlere yayınla
+                with policy_lock:
+                    shared_policy.load_state_dict(agent.policy.state_dict())
+                    policy_version.value += 1
+                learner_version += 1
+
+                update_metrics['mean_policy_lag'] = float(np.mean(policy_lags[-update_frequency:]))
+                update_history.append(update_metrics)
+
+            if (episode + 1) % REPORT_FREQUENCY == 0:
+                avg_portfolio_value = np.mean(episode_portfolio_values[-REPORT_FREQUENCY:])
+                print(f"\n📈 Episode {episode + 1}/{num_episodes}")
+                print(f"   Ortalama Ödül (son {REPORT_FREQUENCY}): {np.mean(episode_rewards[-REPORT_FREQUENCY:]):.2f}")
+                print(f"   Getiri: %{(avg_portfolio_value / INITIAL_BALANCE - 1) * 100:.2f}")
+                print(f"   Politika Gecikmesi (ort/max): {np.mean(policy_lags[-REPORT_FREQUENCY:]):.2f} / "
+                      f"{np.max(policy_lags[-REPORT_FREQUENCY:])}")
+                if update_history:
+                    print(f"   Ortalama Importance Weight: {update_history[-1]['mean_importance_weight']:.3f}")
+                print("-" * 50)
+    finally:
+        stop_event.set()
+        # Kuyrukta bekleyen aktörlerin çıkabilmesi için kuyruğu boşalt
+        while any(actor.is_alive() for actor in actors):
+            try:
+                while True:
+                    trajectory_queue.get_nowait()
+            except queue.Empty:
+                pass
+            for actor in actors:
+                actor.join(timeout=0.1)
+
+    elapsed = time.perf_counter() - start_time
+
+    results = {
+        'episode_rewards': episode_rewards.to_numpy(),
+        'episode_portfolio_values': episode_portfolio_values.to_numpy(),
+        'policy_lags': policy_lags,
+        'update_history': update_history,
+        'elapsed_seconds': elapsed,
+        'episodes_per_second': num_episodes / elapsed,
+        'learner_wait_fraction': learner_wait_time / elapsed
+    }
+
+    print(f"\n✅ Aktör-öğrenen eğitimi tamamlandı: {num_episodes} episode, {elapsed:.1f} sn "
+          f"({results['episodes_per_second']:.2f} episode/sn)")
+    print(f"   Ortalama politika gecikmesi: {np.mean(policy_lags):.2f} güncelleme")
+    print(f"   Öğrenenin kuyrukta beklediği süre: %{results['learner_wait_fraction'] * 100:.1f}")
+
+    return agent, results
+
+
+if __name__ == "__main__":
+    import argparse
+    from data_manager import DataManager
+    from config import STOCK_SYMBOLS, DATA_PERIOD
+
+    parser = argparse.ArgumentParser(description="Asenkron aktör-öğrenen PPO eğitimi")
+    parser.add_argument("--actors", type=int, default=NUM_ACTORS, help="Aktör süreci sayısı")
+    parser.add_argument("--episodes", type=int, default=NUM_EPISODES, help="Toplam episode sayısı")
+    parser.add_argument("--output", default="actor_learner_agent.pt", help="Kaydedilecek agent dosyası")
+    args = parser.parse_args()
+
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, DATA_PERIOD)
+    if len(raw_data) < 2:
+        print("❌ Yeterli veri bulunamadı!")
+    else:
+        trained_agent, _ = train_actor_learner(data_manager.process_data(raw_data),
+                                               num_episodes=args.episodes, n_actors=args.actors,
+                                               history_dir=new_history_dir(args.output))
+        trained_agent.save_agent(args.output, split=True)
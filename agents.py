@@ -2,15 +2,26 @@
 PPO Agent - Proximal Policy Optimization
 """
 
+import copy
 import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
 import torch.nn.functional as F
+import torch.distributed as dist
 from torch.distributions import Categorical
 
 from models import PPONetwork
-from config import LEARNING_RATE, GAMMA, EPS_CLIP, K_EPOCHS
+from history import create_histories
+from timing import TIMER
+from profiler import profile_region
+from checkpoint import (weights_path_for, training_state_path_for, write_checkpoint, load_checkpoint,
+                        load_policy_state)
+from config import LEARNING_RATE, GAMMA, EPS_CLIP, K_EPOCHS, HIDDEN_DIM
+
+
+# Güncelleme başına kaydedilen eğitim metrikleri
+TRAINING_METRIC_NAMES = ('actor_losses', 'critic_losses', 'total_losses', 'entropies')
 
 
 class PPOAgent:
@@ -19,7 +30,7 @@ class PPOAgent:
     """
     
     def __init__(self, state_dim, action_dim, lr=LEARNING_RATE, gamma=GAMMA, 
-                 eps_clip=EPS_CLIP, k_epochs=K_EPOCHS):
+                 eps_clip=EPS_CLIP, k_epochs=K_EPOCHS, hidden_dim=HIDDEN_DIM):
         """
         PPO Agent başlatma
         
@@ -30,6 +41,7 @@ class PPOAgent:
             gamma (float): Discount factor
             eps_clip (float): PPO clipping parametresi
             k_epochs (int): Her güncellemede kaç epoch eğitim
+            hidden_dim (int): Gizli katman boyutu
         """
         self.state_dim = state_dim
         self.action_dim = action_dim
@@ -38,21 +50,26 @@ class PPOAgent:
         self.k_epochs = k_epochs
         
         # Ağları oluştur
-        self.policy = PPONetwork(state_dim, action_dim)
-        self.policy_old = PPONetwork(state_dim, action_dim)
+        self.policy = PPONetwork(state_dim, action_dim, hidden_dim)
+        self.policy_old = PPONetwork(state_dim, action_dim, hidden_dim)
         
         # Eski politikayı başlat
         self.policy_old.load_state_dict(self.policy.state_dict())
         
+        # Optimize edilmiş çıkarım modeli (load_inference_model ile yüklenir)
+        self.inference_model = None
+        
         # Optimizer
         self.optimizer = optim.Adam(self.policy.parameters(), lr=lr)
         
         # Loss fonksiyonu
         self.mse_loss = nn.MSELoss()
         
-        # Experience buffer
+        # Experience buffer (kompakt modda 'states' yerine 'steps' ve 'weights' dolar)
         self.buffer = {
             'states': [],
+            'steps': [],
+            'weights': [],
             'actions': [],
             'rewards': [],
             'log_probs': [],
@@ -60,13 +77,11 @@ class PPOAgent:
             'dones': []
         }
         
-        # Eğitim metrikleri
-        self.training_metrics = {
-            'actor_losses': [],
-            'critic_losses': [],
-            'total_losses': [],
-            'entropies': []
-        }
+        # Eğitim metrikleri (parçalı diziler; attach_history_dir ile diske taşar)
+        self.training_metrics = create_histories(TRAINING_METRIC_NAMES)
+        
+        # Kompakt rollout modunda durumları yeniden üreten ortam
+        self.state_builder = None
         
         print(f"PPO Agent oluşturuldu:")
         print(f"- Durum boyutu: {state_dim}")
@@ -84,15 +99,19 @@ class PPOAgent:
         Returns:
             tuple: (action_index, log_probability, state_value)
         """
-        with torch.no_grad():
+        with torch.no_grad(), profile_region("ppo.select_action"):
             # Durum tensörlere çevir
-            if isinstance(state, np.ndarray):
-                state_tensor = torch.FloatTensor(state).unsqueeze(0)
-            else:
-                state_tensor = state.unsqueeze(0) if len(state.shape) == 1 else state
+            with TIMER.phase("tensor_conversion"):
+                if isinstance(state, np.ndarray):
+                    state_tensor = torch.FloatTensor(state).unsqueeze(0)
+                else:
+                    state_tensor = state.unsqueeze(0) if len(state.shape) == 1 else state
             
             # Ağdan çıktı al
-            action_logits, state_value = self.policy_old(state_tensor)
+            if self.inference_model is not None:
+                action_logits, state_value = self.inference_model(state_tensor)
+            else:
+                action_logits, state_value = self.policy_old(state_tensor)
             
             # Aksiyon olasılıklarını hesapla
             action_probs = F.softmax(action_logits, dim=-1)
@@ -110,7 +129,22 @@ class PPOAgent:
             
             return action.item(), log_prob.item(), state_value.item()
     
-    def store_transition(self, state, action, reward, log_prob, value, done):
+    def enable_compact_rollouts(self, env):
+        """
+        Kompakt rollout saklama modunu aç
+        
+        Buffer'a tam durum vektörü yerine yalnızca adım indeksi ve portföy
+        ağırlıkları yazılır; durumlar update() sırasında env.build_states ile
+        getiri matrisinden toplu olarak yeniden oluşturulur.
+        
+        Args:
+            env (PortfolioEnvironment): Rollout'ların toplandığı ortam (None ile kapatılır)
+        """
+        if self.get_buffer_size():
+            raise RuntimeError("Saklama modu yalnızca buffer boşken değiştirilebilir")
+        self.state_builder = env
+    
+    def store_transition(self, state, action, reward, log_prob, value, done, step=None):
         """
         Deneyimi buffer'a sakla
         
@@ -121,32 +155,43 @@ class PPOAgent:
             log_prob: Log probability
             value: State value
             done: Terminal durum mu
+            step (int): Durumun alındığı env.current_step (kompakt modda gerekli)
         """
-        self.buffer['states'].append(state)
+        if self.state_builder is not None:
+            self.buffer['steps'].append(step)
+            self.buffer['weights'].append(np.array(state[-self.action_dim:]))
+        else:
+            self.buffer['states'].append(state)
         self.buffer['actions'].append(action)
         self.buffer['rewards'].append(reward)
         self.buffer['log_probs'].append(log_prob)
         self.buffer['values'].append(value)
         self.buffer['dones'].append(done)
     
-    def update(self):
+    def update(self, sample_weights=None):
         """
         Politikayı güncelle (PPO algoritması)
         
+        Args:
+            sample_weights (array-like): Örnek başına avantaj ağırlıkları
+                (opsiyonel, örn. eski politikadan toplanan veriler için
+                kırpılmış importance weight'ler)
+        
         Returns:
             dict: Eğitim metrikleri
         """
-        if len(self.buffer['states']) == 0:
+        if self.get_buffer_size() == 0:
             return {}
         
         # Buffer'ı tensörlere çevir
-        states = torch.FloatTensor(np.array(self.buffer['states']))
-        actions = torch.LongTensor(self.buffer['actions'])
-        old_log_probs = torch.FloatTensor(self.buffer['log_probs'])
-        
-        # Discounted rewards hesapla
-        discounted_rewards = self._calculate_discounted_rewards()
-        discounted_rewards = torch.FloatTensor(discounted_rewards)
+        with TIMER.phase("tensor_conversion"):
+            states = torch.from_numpy(self._rollout_states())
+            actions = torch.LongTensor(self.buffer['actions'])
+            old_log_probs = torch.FloatTensor(self.buffer['log_probs'])
+            
+            # Discounted rewards hesapla
+            discounted_rewards = self._calculate_discounted_rewards()
+            discounted_rewards = torch.FloatTensor(discounted_rewards)
         
         # Normalize rewards
         discounted_rewards = (discounted_rewards - discounted_rewards.mean()) / (discounted_rewards.std() + 1e-8)
@@ -161,19 +206,23 @@ class PPOAgent:
         
         for epoch in range(self.k_epochs):
             # Yeni politikadan çıktı al
-            action_logits, state_values = self.policy(states)
-            state_values = state_values.squeeze()
+            with profile_region("ppo.forward"):
+                action_logits, state_values = self.policy(states)
+                state_values = state_values.squeeze()
             
             # Yeni log probabilities
-            action_probs = F.softmax(action_logits, dim=-1)
-            action_dist = Categorical(action_probs)
-            new_log_probs = action_dist.log_prob(actions)
+            with profile_region("ppo.categorical"):
+                action_probs = F.softmax(action_logits, dim=-1)
+                action_dist = Categorical(action_probs)
+                new_log_probs = action_dist.log_prob(actions)
             
             # Importance sampling ratio
             ratio = torch.exp(new_log_probs - old_log_probs)
             
             # Advantages hesapla
             advantages = discounted_rewards - state_values.detach()
+            if sample_weights is not None:
+                advantages = advantages * torch.as_tensor(sample_weights, dtype=torch.float32)
             
             # Actor loss (PPO-Clip)
             surr1 = ratio * advantages
@@ -190,13 +239,20 @@ class PPOAgent:
             total_loss = actor_loss + 0.5 * critic_loss + 0.01 * entropy_loss
             
             # Backpropagation
-            self.optimizer.zero_grad()
-            total_loss.backward()
+            with profile_region("ppo.backward"):
+                self.optimizer.zero_grad()
+                total_loss.backward()
+            
+            # Dağıtık eğitimde gradyanları rank'ler arasında ortala
+            with profile_region("ppo.sync_gradients"):
+                self._sync_gradients()
             
             # Gradient clipping
-            torch.nn.utils.clip_grad_norm_(self.policy.parameters(), 0.5)
+            with profile_region("ppo.clip_grad_norm"):
+                torch.nn.utils.clip_grad_norm_(self.policy.parameters(), 0.5)
             
-            self.optimizer.step()
+            with profile_region("ppo.optimizer_step"):
+                self.optimizer.step()
             
             # Metrikleri kaydet
             epoch_metrics['actor_loss'] += actor_loss.item()
@@ -217,11 +273,57 @@ class PPOAgent:
         # Eski politikayı güncelle
         self.policy_old.load_state_dict(self.policy.state_dict())
         
+        # Eski çıkarım modeli artık güncel politikayı yansıtmıyor
+        self.inference_model = None
+        
         # Buffer'ı temizle
         self.clear_buffer()
         
         return epoch_metrics
     
+    def _sync_gradients(self):
+        """Dağıtık eğitim başlatılmışsa gradyanları tüm rank'ler arasında ortala"""
+        if not (dist.is_available() and dist.is_initialized()):
+            return
+        world_size = dist.get_world_size()
+        if world_size == 1:
+            return
+        
+        # Tek bir all-reduce çağrısı için gradyanları düzleştir
+        grads = [p.grad for p in self.policy.parameters() if p.grad is not None]
+        flat_grads = torch.cat([grad.reshape(-1) for grad in grads])
+        dist.all_reduce(flat_grads, op=dist.ReduceOp.SUM)
+        flat_grads /= world_size
+        
+        offset = 0
+        for grad in grads:
+            numel = grad.numel()
+            grad.copy_(flat_grads[offset:offset + numel].view_as(grad))
+            offset += numel
+    
+    def evaluate_log_probs(self, states, actions):
+        """
+        Verilen durum/aksiyon çiftleri için policy_old log olasılıklarını hesapla
+        
+        Args:
+            states (np.array): [N, state_dim] durumlar
+            actions (array-like): [N] aksiyon indeksleri
+            
+        Returns:
+            np.array: [N] log olasılıklar
+        """
+        with torch.no_grad():
+            action_logits, _ = self.policy_old(torch.FloatTensor(np.asarray(states)))
+            log_probs = F.log_softmax(action_logits, dim=-1)
+            chosen = log_probs.gather(1, torch.LongTensor(np.asarray(actions)).unsqueeze(1)).squeeze(1)
+        return chosen.numpy()
+    
+    def _rollout_states(self):
+        """Buffer'daki durumları [N, state_dim] float32 dizi olarak döndür"""
+        if self.buffer['steps']:
+            return self.state_builder.build_states(self.buffer['steps'], self.buffer['weights'])
+        return np.array(self.buffer['states'], dtype=np.float32)
+    
     def _calculate_discounted_rewards(self):
         """Discounted rewards hesapla"""
         rewards = []
@@ -241,37 +343,129 @@ class PPOAgent:
         for key in self.buffer:
             self.buffer[key] = []
     
-    def save_agent(self, filepath):
-        """Agent'ı kaydet"""
-        torch.save({
-            'policy_state_dict': self.policy.state_dict(),
-            'optimizer_state_dict': self.optimizer.state_dict(),
+    def save_agent(self, filepath, split=False):
+        """
+        Agent'ı kaydet
+        
+        Args:
+            filepath (str): Checkpoint dosya yolu
+            split (bool): True ise yalnızca-ağırlık (x.weights.pt) ve eğitim
+                durumu (x.train.pt) olarak iki ayrı dosyaya yaz
+        """
+        write_checkpoint(self.get_checkpoint_snapshot(), filepath, split)
+        
+        if split:
+            print(f"Agent kaydedildi: {weights_path_for(filepath)} + {training_state_path_for(filepath)}")
+        else:
+            print(f"Agent kaydedildi: {filepath}")
+    
+    def get_checkpoint_snapshot(self):
+        """
+        Agent durumunun eğitimden bağımsız bellek içi kopyasını al
+        
+        Returns:
+            dict: Kopyalanmış ağırlıklar, optimizer durumu ve metrikler
+        """
+        return {
+            'policy_state_dict': {key: value.detach().clone() for key, value in self.policy.state_dict().items()},
+            'optimizer_state_dict': copy.deepcopy(self.optimizer.state_dict()),
             'state_dim': self.state_dim,
             'action_dim': self.action_dim,
+            'hidden_dim': self.policy.hidden_dim,
             'gamma': self.gamma,
             'eps_clip': self.eps_clip,
             'k_epochs': self.k_epochs,
-            'training_metrics': self.training_metrics
-        }, filepath)
-        print(f"Agent kaydedildi: {filepath}")
+            'training_metrics': {key: values.state_dict() for key, values in self.training_metrics.items()}
+        }
     
     def load_agent(self, filepath):
-        """Agent'ı yükle"""
-        checkpoint = torch.load(filepath)
+        """Agent'ı yükle (tek dosya ile ayrık çiftten daha yeni olanı kullanılır)"""
+        checkpoint = load_checkpoint(filepath)
+        self.restore_checkpoint(checkpoint)
+        
+        print(f"Agent yüklendi: {filepath}")
+        return checkpoint
+    
+    def restore_checkpoint(self, checkpoint):
+        """
+        Checkpoint sözlüğünden ağırlıkları, optimizer'ı ve metrikleri geri yükle
         
+        Args:
+            checkpoint (dict): save_agent / get_checkpoint_snapshot formatı
+        """
         self.policy.load_state_dict(checkpoint['policy_state_dict'])
         self.policy_old.load_state_dict(checkpoint['policy_state_dict'])
         self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
+        self.inference_model = None
         
         if 'training_metrics' in checkpoint:
-            self.training_metrics = checkpoint['training_metrics']
+            for key, state in checkpoint['training_metrics'].items():
+                self.training_metrics[key].load_state_dict(state)
+    
+    def attach_history_dir(self, directory):
+        """
+        Eğitim metriklerini diske taşan geçmişlere çevir
         
-        print(f"Agent yüklendi: {filepath}")
-        return checkpoint
+        Checkpoint'ler bundan sonra yalnızca özet ve son parçayı içerir;
+        metriklerin tamamı directory altındaki dosyalarda büyür.
+        
+        Args:
+            directory (str): Taşma dosyalarının dizini
+        """
+        histories = create_histories(TRAINING_METRIC_NAMES, directory)
+        for key, history in histories.items():
+            history.extend(self.training_metrics[key])
+        self.training_metrics = histories
+    
+    def load_policy(self, filepath):
+        """
+        Değerlendirme için yalnızca politika ağırlıklarını yükle
+        
+        Optimizer durumu ve eğitim metrikleri okunmaz; x.weights.pt varsa
+        bellek eşlemeli (mmap) olarak yüklenir.
+        
+        Args:
+            filepath (str): Checkpoint veya ağırlık dosyası yolu
+        """
+        payload = load_policy_state(filepath)
+        self.policy.load_state_dict(payload['state_dict'])
+        self.policy_old.load_state_dict(payload['state_dict'])
+        self.inference_model = None
+        
+        print(f"Politika ağırlıkları yüklendi: {filepath}")
+        return payload
+    
+    def export_inference_model(self, filepath=None):
+        """
+        Güncel politikayı optimize edilmiş TorchScript modeline dönüştür
+        
+        Args:
+            filepath (str): Kaydedilecek dosya yolu (opsiyonel)
+            
+        Returns:
+            torch.jit.ScriptModule: Optimize edilmiş model
+        """
+        from inference import export_torchscript
+        return export_torchscript(self.policy_old, filepath)
+    
+    def load_inference_model(self, filepath):
+        """
+        Optimize edilmiş çıkarım modelini yükle (değerlendirme için)
+        
+        Yüklenen model select_action'da policy_old yerine kullanılır;
+        bir sonraki update() çağrısında devre dışı bırakılır.
+        
+        Args:
+            filepath (str): export_inference_model ile kaydedilmiş dosya
+        """
+        from inference import load_torchscript
+        self.inference_model = load_torchscript(filepath)
+        print(f"Çıkarım modeli yüklendi: {filepath}")
+        return self.inference_model
     
     def get_buffer_size(self):
         """Buffer boyutunu döndür"""
-        return len(self.buffer['states'])
+        return len(self.buffer['actions'])
     
     def get_training_summary(self):
         """Eğitim özetini döndür"""
@@ -0,0 +1,205 @@
+"""
+Toplu Checkpoint Değerlendirme - Çok sayıda modeli tek ileri yayılımla karşılaştır
+
+Veri bir kez yüklenir; aynı mimarideki checkpoint'lerin ağırlıkları
+torch.func.stack_module_state ile yığılır ve VectorizedPortfolioEnvironment
+üzerinde her gün tüm modeller için tek bir vmap'li ileri yayılım yapılır.
+Sonuç, seçilen metriğe göre sıralı bir karşılaştırma tablosudur.
+"""
+
+import copy
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from torch.func import functional_call, stack_module_state, vmap
+
+from models import PPONetwork
+from environment import VectorizedPortfolioEnvironment
+from checkpoint import load_policy_state
+from utils import PerformanceAnalyzer
+from config import RUN_REGISTRY_DIR
+
+# Varsayılan olarak aranan checkpoint dosyaları
+DEFAULT_PATTERNS = ["best_portfolio_agent.pt", "portfolio_results_agent_*.pt", "*.weights.pt",
+                    os.path.join(RUN_REGISTRY_DIR, "*", "agent.weights.pt")]
+
+
+def find_checkpoints(patterns=DEFAULT_PATTERNS):
+    """
+    Desenlere uyan checkpoint dosyalarını bul
+
+    Ayrık formatın .weights.pt / .train.pt dosyaları tek bir model
+    olarak (temel .pt adıyla) sayılır.
+
+    Args:
+        patterns (list): glob desenleri
+
+    Returns:
+        list: Sıralı, tekilleştirilmiş checkpoint yolları
+    """
+    paths = set()
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            if path.endswith(".train.pt"):
+                continue
+            if path.endswith(".weights.pt"):
+                path = path[:-len(".weights.pt")] + ".pt"
+            paths.add(path)
+    return sorted(paths)
+
+
+def group_checkpoints(paths):
+    """
+    Checkpoint ağırlıklarını oku ve mimariye göre grupla
+
+    Args:
+        paths (list): Checkpoint yolları
+
+    Returns:
+        tuple: ({(state_dim, action_dim, hidden_dim): [(yol, state_dict), ...]}, {yol: hata})
+    """
+    groups = {}
+    failures = {}
+    for path in paths:
+        try:
+            weights = load_policy_state(path)
+        except Exception as e:
+            failures[path] = str(e)
+            continue
+        key = (weights['state_dim'], weights['action_dim'], weights['hidden_dim'])
+        groups.setdefault(key, []).append((path, weights['state_dict']))
+    return groups, failures
+
+
+def _run_group(entries, processed_data, state_dim, action_dim, hidden_dim):
+    """
+    Aynı mimarideki modelleri vektörize ortamda deterministik olarak çalıştır
+
+    Returns:
+        np.array: [n_models, gün] portföy değer geçmişi
+    """
+    networks = []
+    for _, state_dict in entries:
+        network = PPONetwork(state_dim, action_dim, hidden_dim)
+        network.load_state_dict(state_dict)
+        network.eval()
+        networks.append(network)
+
+    params, buffers = stack_module_state(networks)
+    base_model = copy.deepcopy(networks[0]).to('meta')
+
+    def single_forward(params, buffers, x):
+        return functional_call(base_model, (params, buffers), (x,))
+
+    batched_forward = vmap(single_forward)
+    env = VectorizedPortfolioEnvironment(processed_data, len(networks))
+
+    state = env.reset()
+    done = False
+    with torch.no_grad():
+        while not done:
+            # [K, 1, state_dim]: her model yalnızca kendi alt ortamının durumunu görür
+            action_logits, _ = batched_forward(params, buffers, torch.from_numpy(state).unsqueeze(1))
+            action_indices = action_logits.squeeze(1).argmax(dim=-1).numpy()
+            state, _, dones, _ = env.step(env.action_vectors(action_indices, action_dim))
+            done = dones[0]
+
+    return env.portfolio_history.copy()
+
+
+def evaluate_checkpoints(paths, processed_data, rank_by='total_return_pct'):
+    """
+    Checkpoint'leri aynı veri üzerinde toplu olarak değerlendir
+
+    Args:
+        paths (list): Checkpoint yolları
+        processed_data (dict): Değerlendirme verisi (bir kez yüklenir)
+        rank_by (str): Sıralama metriği
+
+    Returns:
+        tuple: (sıralı karşılaştırma DataFrame'i, {yol: portföy geçmişi}, {yol: hata})
+    """
+    state_dim = VectorizedPortfolioEnvironment(processed_data, 1).state_dim
+    action_dim = processed_data['n_stocks'] + 1
+    groups, failures = group_checkpoints(paths)
+
+    analyzer = PerformanceAnalyzer()
+    rows = []
+    histories = {}
+    start_time = time.perf_counter()
+
+    for (group_state_dim, group_action_dim, hidden_dim), entries in groups.items():
+        if (group_state_dim, group_action_dim) != (state_dim, action_dim):
+            for path, _ in entries:
+                failures[path] = (f"Boyut uyumsuz: model ({group_state_dim}, {group_action_dim}), "
+                                  f"veri ({state_dim}, {action_dim})")
+            continue
+
+        group_history = _run_group(entries, processed_data, state_dim, action_dim, hidden_dim)
+        group_metrics = analyzer.calculate_performance_metrics(group_history)
+        for i, ((path, _), portfolio_history) in enumerate(zip(entries, group_history)):
+            histories[path] = portfolio_history
+            rows.append({'model': path, 'hidden_dim': hidden_dim,
+                         **{key: value[i] if isinstance(value, np.ndarray) else value
+                            for key, value in group_metrics.items()}})
+
+    elapsed = time.perf_counter() - start_time
+    table = pd.DataFrame(rows)
+    if not table.empty:
+        table = table.sort_values(rank_by, ascending=False).reset_index(drop=True)
+    print(f"⚡ {len(rows)} model {len(groups)} grupta {elapsed:.2f} sn'de değerlendirildi")
+
+    return table, histories, failures
+
+
+def print_comparison_table(table, failures=None):
+    """Sıralı karşılaştırma tablosunu yazdır"""
+    print("\n🏆 KARŞILAŞTIRMA TABLOSU")
+    print("=" * 85)
+    print(f"{'Model':<38} {'Final Değer':>13} {'Getiri (%)':>11} {'Sharpe':>8} {'Max DD (%)':>11}")
+    print("-" * 85)
+
+    for i, row in table.iterrows():
+        rank = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"{i+1}."
+        # Kayıt klasöründeki agent.pt dosyaları koşu kimliğiyle gösterilir
+        model_name = row['model']
+        if os.path.basename(model_name) == "agent.pt":
+            model_name = os.path.basename(os.path.dirname(model_name))
+        short_name = os.path.basename(model_name).replace("portfolio_results_agent_", "").replace(".pt", "")[:33]
+        print(f"{rank:<3} {short_name:<34} ${row['final_value']:>12,.0f} {row['total_return_pct']:>10.2f}% "
+              f"{row['sharpe_ratio']:>8.3f} {row['max_drawdown_pct']:>10.2f}%")
+
+    for path, error in (failures or {}).items():
+        print(f"❌ {path}: {error}")
+    print("=" * 85)
+
+
+if __name__ == "__main__":
+    import argparse
+    from data_manager import DataManager
+    from config import STOCK_SYMBOLS
+
+    parser = argparse.ArgumentParser(description="Checkpoint'leri toplu değerlendir ve sırala")
+    parser.add_argument("checkpoints", nargs="*", help="Checkpoint yolları (boşsa otomatik aranır)")
+    parser.add_argument("--period", default="1y", help="Değerlendirme verisi süresi")
+    parser.add_argument("--rank-by", default="total_return_pct", help="Sıralama metriği")
+    parser.add_argument("--output", default=None, help="Tablonun yazılacağı CSV")
+    args = parser.parse_args()
+
+    checkpoint_paths = args.checkpoints or find_checkpoints()
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, args.period)
+    if not checkpoint_paths:
+        print("❌ Checkpoint bulunamadı!")
+    elif len(raw_data) < 2:
+        print("❌ Yeterli veri bulunamadı!")
+    else:
+        comparison, _, errors = evaluate_checkpoints(checkpoint_paths, data_manager.process_data(raw_data),
+                                                     rank_by=args.rank_by)
+        print_comparison_table(comparison, errors)
+        if args.output:
+            comparison.to_csv(args.output, index=False)
@@ -0,0 +1,167 @@
+"""
+Bootstrap Güven Aralıkları - Strateji metriklerinin anlamlılığı
+
+Günlük getiriler blok (sabit uzunluklu, dairesel) veya durağan
+(stationary, geometrik blok uzunluklu) bootstrap ile binlerce kez
+yeniden örneklenir. Agent ve benchmark aynı indekslerle örneklenir
+(eşli bootstrap); böylece iki seri arasındaki korelasyon korunur ve
+benchmark'ı geçme olasılığı doğrudan hesaplanır. Tüm örneklemler
+NumPy dizi işlemleriyle parça parça (chunk) tek geçişte işlenir.
+"""
+
+import time
+
+import numpy as np
+
+from config import BOOTSTRAP_RESAMPLES, BOOTSTRAP_BLOCK_LENGTH, BOOTSTRAP_CONFIDENCE
+
+# Bellek kullanımını sınırlamak için tek seferde işlenen örneklem sayısı
+CHUNK_SIZE = 2500
+
+
+def bootstrap_indices(n_days, n_resamples, block_length=BOOTSTRAP_BLOCK_LENGTH, method="stationary", rng=None):
+    """
+    Yeniden örnekleme indekslerini üret
+
+    Args:
+        n_days (int): Getiri serisi uzunluğu
+        n_resamples (int): Örneklem sayısı
+        block_length (float): (Ortalama) blok uzunluğu
+        method (str): "stationary" (geometrik blok uzunluğu) veya "block" (sabit, dairesel)
+        rng (np.random.Generator): Rastgele sayı üreteci
+
+    Returns:
+        np.array: [n_resamples, n_days] indeks matrisi
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    positions = np.arange(n_days)
+
+    if method == "stationary":
+        new_block = rng.random((n_resamples, n_days)) < 1.0 / block_length
+    elif method == "block":
+        new_block = np.broadcast_to(positions % int(block_length) == 0, (n_resamples, n_days))
+    else:
+        raise ValueError(f"Bilinmeyen bootstrap yöntemi: {method}")
+
+    # Her gün için içinde bulunduğu bloğun başladığı pozisyon
+    block_start = np.where(new_block, positions, 0)
+    block_start[:, 0] = 0
+    block_start = np.maximum.accumulate(block_start, axis=1)
+
+    # Blok başına rastgele başlangıç günü, blok içinde ardışık (dairesel) ilerleme
+    random_starts = rng.integers(0, n_days, size=(n_resamples, n_days))
+    start_day = np.take_along_axis(random_starts, block_start, axis=1)
+    return (start_day + positions - block_start) % n_days
+
+
+def _path_metrics(returns):
+    """
+    Yeniden örneklenmiş getiri matrisinden metrikler
+
+    Args:
+        returns (np.array): [n_resamples, n_days] günlük getiriler
+
+    Returns:
+        dict: [n_resamples] toplam getiri (%), Sharpe ve max drawdown (%)
+    """
+    growth = np.cumprod(1 + returns, axis=1)
+    running_peak = np.maximum.accumulate(np.maximum(growth, 1.0), axis=1)
+    std = returns.std(axis=1)
+    return {
+        'total_return_pct': (growth[:, -1] - 1) * 100,
+        'sharpe_ratio': returns.mean(axis=1) / (std + 1e-8) * np.sqrt(252),
+        'max_drawdown_pct': np.minimum((growth / running_peak - 1).min(axis=1), 0.0) * 100
+    }
+
+
+def _daily_returns(portfolio_history):
+    """Portföy geçmişinden sonlu günlük getiriler"""
+    values = np.asarray(portfolio_history, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(values) / values[:-1]
+    return np.where(np.isfinite(returns), returns, 0.0)
+
+
+def bootstrap_metrics(agent_history, benchmark_history=None, n_resamples=BOOTSTRAP_RESAMPLES,
+                      block_length=BOOTSTRAP_BLOCK_LENGTH, method="stationary",
+                      confidence=BOOTSTRAP_CONFIDENCE, seed=0):
+    """
+    Agent (ve benchmark) metrikleri için bootstrap güven aralıkları
+
+    Args:
+        agent_history (list): Agent portföy değer geçmişi
+        benchmark_history (list): Benchmark portföy değer geçmişi (opsiyonel, aynı uzunlukta)
+        n_resamples (int): Örneklem sayısı
+        block_length (float): (Ortalama) blok uzunluğu
+        method (str): "stationary" veya "block"
+        confidence (float): Güven düzeyi
+        seed (int): Tohum
+
+    Returns:
+        dict: Strateji -> metrik -> {'estimate', 'lower', 'upper'}; benchmark verildiyse
+            'prob_outperform' altında getiri ve Sharpe için agent > benchmark olasılığı
+    """
+    start_time = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    series = {'agent': _daily_returns(agent_history)}
+    if benchmark_history is not None:
+        n_days = min(len(agent_history), len(benchmark_history)) - 1
+        series = {'agent': series['agent'][:n_days], 'benchmark': _daily_returns(benchmark_history)[:n_days]}
+    n_days = len(series['agent'])
+
+    samples = {name: {key: [] for key in ('total_return_pct', 'sharpe_ratio', 'max_drawdown_pct')}
+               for name in series}
+    for chunk_start in range(0, n_resamples, CHUNK_SIZE):
+        chunk = min(CHUNK_SIZE, n_resamples - chunk_start)
+        indices = bootstrap_indices(n_days, chunk, block_length, method, rng)
+        for name, returns in series.items():
+            for key, values in _path_metrics(returns[indices]).items():
+                samples[name][key].append(values)
+
+    alpha = (1 - confidence) / 2
+    result = {'n_resamples': n_resamples, 'block_length': block_length, 'method': method,
+              'confidence': confidence}
+    for name, returns in series.items():
+        point = _path_metrics(returns[None, :])
+        result[name] = {}
+        for key, chunks in samples[name].items():
+            values = np.concatenate(chunks)
+            samples[name][key] = values
+            lower, upper = np.quantile(values, [alpha, 1 - alpha])
+            result[name][key] = {'estimate': float(point[key][0]), 'lower': float(lower), 'upper': float(upper)}
+
+    if 'benchmark' in series:
+        result['prob_outperform'] = {
+            key: float(np.mean(samples['agent'][key] > samples['benchmark'][key]))
+            for key in ('total_return_pct', 'sharpe_ratio')
+        }
+
+    result['elapsed_seconds'] = time.perf_counter() - start_time
+    return result
+
+
+def print_bootstrap_report(result):
+    """Bootstrap güven aralıkları raporunu yazdır"""
+    level = result['confidence'] * 100
+    print("\n" + "=" * 70)
+    print(f"      BOOTSTRAP GÜVEN ARALIKLARI (%{level:.0f}, {result['n_resamples']:,} örneklem, "
+          f"{result['method']})")
+    print("=" * 70)
+
+    metric_names = [('Toplam Getiri (%)', 'total_return_pct'), ('Sharpe Oranı', 'sharpe_ratio'),
+                    ('Max Drawdown (%)', 'max_drawdown_pct')]
+    for name, label in [('agent', 'DRL Agent'), ('benchmark', 'Benchmark')]:
+        if name not in result:
+            continue
+        print(f"{label}:")
+        for metric_name, key in metric_names:
+            interval = result[name][key]
+            print(f"   {metric_name:<20} {interval['estimate']:>9.3f}   "
+                  f"[{interval['lower']:>9.3f}, {interval['upper']:>9.3f}]")
+
+    if 'prob_outperform' in result:
+        print("-" * 70)
+        print(f"Benchmark'ı geçme olasılığı (getiri): %{result['prob_outperform']['total_return_pct'] * 100:.1f}")
+        print(f"Benchmark'ı geçme olasılığı (Sharpe): %{result['prob_outperform']['sharpe_ratio'] * 100:.1f}")
+    print(f"Süre: {result['elapsed_seconds']:.2f} sn")
+    print("=" * 70)
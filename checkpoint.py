@@ -0,0 +1,423 @@
+"""
+Checkpoint Yönetimi - Ağırlık / eğitim durumu ayrık kayıt formatı
+"""
+
+import os
+import random
+import threading
+import time
+
+import numpy as np
+import torch
+
+from history import relativize_history_paths, resolve_history_paths
+
+WEIGHTS_FORMAT = "ppo-weights-v1"
+
+# Ayrık formatın dosya sonekleri
+SPLIT_SUFFIXES = (".weights.pt", ".train.pt")
+
+
+def weights_path_for(filepath):
+    """Checkpoint yolundan yalnızca-ağırlık dosya yolunu türet (x.pt -> x.weights.pt)"""
+    root, _ = os.path.splitext(filepath)
+    return f"{root}.weights.pt"
+
+
+def training_state_path_for(filepath):
+    """Checkpoint yolundan eğitim durumu dosya yolunu türet (x.pt -> x.train.pt)"""
+    root, _ = os.path.splitext(filepath)
+    return f"{root}.train.pt"
+
+
+def is_split_path(filepath):
+    """Yol ayrık formatın bir parçası mı (x.weights.pt / x.train.pt)"""
+    return filepath.endswith(SPLIT_SUFFIXES)
+
+
+def resolve_split_paths(filepath):
+    """
+    Yüklenecek ayrık dosya çiftini belirle
+
+    Aynı adla hem tek dosyalı checkpoint (x.pt) hem ayrık çift (x.weights.pt)
+    varsa daha yeni yazılmış olan (mtime) seçilir; böylece eğitimin ayrık
+    yazdığı model, depodaki eski tek dosyalı checkpoint'in gölgesinde
+    kalmaz. Yol zaten ayrık bir parçaysa her zaman ayrık çift döner.
+
+    Args:
+        filepath (str): Checkpoint, ağırlık veya eğitim durumu dosyası yolu
+
+    Returns:
+        tuple: (ağırlık yolu, eğitim durumu yolu) veya tek dosya yüklenecekse None
+    """
+    if os.path.exists(filepath) and not is_split_path(filepath):
+        weights_file = weights_path_for(filepath)
+        if not os.path.exists(weights_file) or os.path.getmtime(weights_file) < os.path.getmtime(filepath):
+            return None
+        return weights_file, training_state_path_for(filepath)
+    root = filepath
+    for suffix in SPLIT_SUFFIXES:
+        if filepath.endswith(suffix):
+            root = filepath[:-len(suffix)] + ".pt"
+    return weights_path_for(root), training_state_path_for(root)
+
+
+def _torch_load(filepath, weights_only, mmap=False):
+    """torch.load'u sürüm farklarını gözeterek çağır"""
+    kwargs = {'map_location': 'cpu', 'weights_only': weights_only}
+    if mmap:
+        kwargs['mmap'] = True
+    try:
+        return torch.load(filepath, **kwargs)
+    except TypeError:
+        # Eski PyTorch sürümleri mmap / weights_only parametrelerini desteklemez
+        return torch.load(filepath, map_location='cpu')
+
+
+def save_weights(network, filepath):
+    """
+    Yalnızca çıkarım için gereken ağırlıkları kaydet
+
+    Dosya yalnızca tensörler ve temel tipler içerir; weights_only=True ve
+    mmap=True ile güvenli ve hızlı yüklenebilir.
+
+    Args:
+        network (PPONetwork): Kaydedilecek ağ
+        filepath (str): Dosya yolu
+    """
+    torch.save({
+        'format': WEIGHTS_FORMAT,
+        'state_dict': {key: value.detach().cpu().contiguous() for key, value in network.state_dict().items()},
+        'state_dim': network.state_dim,
+        'action_dim': network.action_dim,
+        'hidden_dim': network.hidden_dim
+    }, filepath)
+
+
+def load_weights(filepath):
+    """
+    Yalnızca-ağırlık dosyasını bellek eşlemeli (mmap) olarak yükle
+
+    Args:
+        filepath (str): save_weights ile kaydedilmiş dosya
+
+    Returns:
+        dict: state_dict ve ağ boyutları
+    """
+    payload = _torch_load(filepath, weights_only=True, mmap=True)
+    if payload.get('format') != WEIGHTS_FORMAT:
+        raise ValueError(f"Bilinmeyen ağırlık formatı: {filepath}")
+    return payload
+
+
+def save_training_state(state, filepath):
+    """
+    Eğitime devam etmek için gereken durumu kaydet (optimizer, metrikler)
+
+    Args:
+        state (dict): Eğitim durumu
+        filepath (str): Dosya yolu
+    """
+    torch.save(state, filepath)
+
+
+def load_training_state(filepath):
+    """Eğitim durumu (veya tek dosyalı checkpoint) dosyasını yükle; geçmiş yollarını çöz"""
+    return resolve_history_paths(_torch_load(filepath, weights_only=False),
+                                 os.path.dirname(os.path.abspath(filepath)))
+
+
+def checkpoint_exists(filepath):
+    """Tek dosyalı checkpoint veya eksiksiz ayrık çift diskte var mı"""
+    split_paths = resolve_split_paths(filepath)
+    return split_paths is None or all(os.path.exists(path) for path in split_paths)
+
+
+def load_checkpoint(filepath):
+    """
+    Tam checkpoint'i oku (tek dosya ile ayrık çiftten daha yeni olanı)
+
+    Ayrık çiftte eğitim durumu ve ağırlıklar tek sözlükte birleştirilir;
+    dönen sözlük her iki formatta da save_agent / get_checkpoint_snapshot
+    biçimindedir.
+
+    Args:
+        filepath (str): Checkpoint, ağırlık veya eğitim durumu dosyası yolu
+
+    Returns:
+        dict: Checkpoint sözlüğü
+    """
+    split_paths = resolve_split_paths(filepath)
+    if split_paths is None:
+        return load_training_state(filepath)
+
+    weights_file, training_file = split_paths
+    checkpoint = load_training_state(training_file)
+    checkpoint['policy_state_dict'] = load_weights(weights_file)['state_dict']
+    return checkpoint
+
+
+def load_policy_state(filepath):
+    """
+    Değerlendirme için yalnızca politika ağırlıklarını oku
+
+    Tek dosyalı checkpoint ayrık çiftten daha yeniyse (veya tek başınaysa)
+    policy_state_dict ondan okunur; aksi halde yalnızca-ağırlık dosyası
+    (x.weights.pt) yüklenir (bkz. resolve_split_paths).
+
+    Args:
+        filepath (str): Checkpoint veya ağırlık dosyası yolu
+
+    Returns:
+        dict: state_dict, state_dim, action_dim ve hidden_dim
+    """
+    split_paths = resolve_split_paths(filepath)
+    if split_paths is not None:
+        if not os.path.exists(split_paths[0]):
+            raise FileNotFoundError(split_paths[0])
+        return load_weights(split_paths[0])
+
+    checkpoint = _torch_load(filepath, weights_only=False)
+    state_dict = checkpoint['policy_state_dict']
+    return {
+        'format': WEIGHTS_FORMAT,
+        'state_dict': state_dict,
+        'state_dim': checkpoint['state_dim'],
+        'action_dim': checkpoint['action_dim'],
+        'hidden_dim': state_dict['shared_layers.0.weight'].shape[0]
+    }
+
+
+def load_inference_network(filepath):
+    """
+    Checkpoint'ten eval modunda PPONetwork oluştur
+
+    Args:
+        filepath (str): Checkpoint veya ağırlık dosyası yolu
+
+    Returns:
+        PPONetwork: Ağırlıkları yüklenmiş ağ
+    """
+    from models import PPONetwork
+
+    payload = load_policy_state(filepath)
+    network = PPONetwork(payload['state_dim'], payload['action_dim'], payload['hidden_dim'])
+    network.load_state_dict(payload['state_dict'])
+    network.eval()
+    return network
+
+
+def _atomic_torch_save(obj, filepath):
+    """Geçici dosyaya yazıp atomik olarak yeniden adlandır"""
+    tmp_path = f"{filepath}.tmp"
+    torch.save(obj, tmp_path)
+    os.replace(tmp_path, filepath)
+
+
+def write_checkpoint(snapshot, filepath, split=False):
+    """
+    Agent anlık görüntüsünü (snapshot) diske yaz
+
+    Aynı adın diğer formattaki eski dosyaları silinir (ayrık yazımda x.pt,
+    tek dosyalı yazımda x.weights.pt / x.train.pt).
+
+    Args:
+        snapshot (dict): PPOAgent.get_checkpoint_snapshot() çıktısı
+        filepath (str): Checkpoint dosya yolu
+        split (bool): Ağırlık ve eğitim durumunu ayrı dosyalara yaz
+    """
+    # Geçmiş taşma dosyaları checkpoint'e göreli saklanır (birlikte taşınabilir)
+    snapshot = relativize_history_paths(snapshot, os.path.dirname(os.path.abspath(filepath)))
+    if not split:
+        _atomic_torch_save(snapshot, filepath)
+        _remove_stale(weights_path_for(filepath), training_state_path_for(filepath))
+        return
+
+    training_state = {key: value for key, value in snapshot.items() if key != 'policy_state_dict'}
+    _atomic_torch_save({
+        'format': WEIGHTS_FORMAT,
+        'state_dict': snapshot['policy_state_dict'],
+        'state_dim': snapshot['state_dim'],
+        'action_dim': snapshot['action_dim'],
+        'hidden_dim': snapshot['hidden_dim']
+    }, weights_path_for(filepath))
+    _atomic_torch_save(training_state, training_state_path_for(filepath))
+    _remove_stale(filepath)
+
+
+def _remove_stale(*paths):
+    """
+    Aynı adın diğer formattaki eski dosyalarını sil
+
+    Böylece yükleyiciler (resolve_split_paths) depodaki eski bir checkpoint
+    yerine tam olarak son yazılan dosyaları bulur.
+    """
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class AsyncCheckpointWriter:
+    """
+    Arka planda, debounce'lu checkpoint yazıcı
+
+    submit() çağrısı yalnızca agent durumunun bellek içi kopyasını alır ve
+    hemen döner; serileştirme ve disk yazımı ayrı bir thread'de yapılır.
+    Aynı dosya için bekleyen bir kayıt varsa yenisi onun yerini alır
+    ("latest wins") ve aynı dosyaya min_interval saniyeden sık yazılmaz.
+    """
+
+    def __init__(self, min_interval=5.0):
+        self.min_interval = min_interval
+        self._pending = {}
+        self._last_write = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = []
+
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, agent, filepath, split=False):
+        """
+        Agent durumunu kaydedilmek üzere kuyruğa al
+
+        Args:
+            agent (PPOAgent): Kaydedilecek agent
+            filepath (str): Checkpoint dosya yolu
+            split (bool): Ayrık formatta yaz
+        """
+        self.submit_snapshot(agent.get_checkpoint_snapshot(), filepath, split)
+
+    def submit_snapshot(self, snapshot, filepath, split=False):
+        """
+        Önceden alınmış bir anlık görüntüyü kaydedilmek üzere kuyruğa al
+
+        Args:
+            snapshot (dict): Diske yazılacak durum
+            filepath (str): Checkpoint dosya yolu
+            split (bool): Ayrık formatta yaz
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Checkpoint yazıcı kapatılmış")
+            if filepath in self._pending:
+                self.coalesced += 1
+            self._pending[filepath] = (snapshot, split)
+            self._condition.notify()
+
+    def _next_ready(self):
+        """Yazılmaya hazır kaydı ve gerekirse bekleme süresini döndür"""
+        now = time.monotonic()
+        wait_time = None
+        for filepath in self._pending:
+            ready_at = self._last_write.get(filepath, float('-inf')) + self.min_interval
+            if self._closed or ready_at <= now:
+                return filepath, None
+            remaining = ready_at - now
+            wait_time = remaining if wait_time is None else min(wait_time, remaining)
+        return None, wait_time
+
+    def _run(self):
+        """Yazıcı thread döngüsü"""
+        while True:
+            with self._condition:
+                while True:
+                    filepath, wait_time = self._next_ready()
+                    if filepath is not None:
+                        snapshot, split = self._pending.pop(filepath)
+                        break
+                    if self._closed and not self._pending:
+                        return
+                    self._condition.wait(timeout=wait_time)
+
+            try:
+                write_checkpoint(snapshot, filepath, split)
+                self.writes += 1
+            except Exception as e:
+                self.errors.append((filepath, e))
+                print(f"Checkpoint yazma hatası {filepath}: {e}")
+
+            with self._condition:
+                self._last_write[filepath] = time.monotonic()
+
+    def close(self):
+        """Bekleyen kayıtları debounce beklemeden yaz ve thread'i durdur"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+
+def capture_rng_state():
+    """Python, NumPy ve PyTorch rastgele sayı üreteci durumlarını al"""
+    return {
+        'python': random.getstate(),
+        'numpy': np.random.get_state(),
+        'torch': torch.get_rng_state()
+    }
+
+
+def restore_rng_state(rng_state):
+    """capture_rng_state ile alınmış üreteç durumlarını geri yükle"""
+    random.setstate(rng_state['python'])
+    np.random.set_state(rng_state['numpy'])
+    torch.set_rng_state(rng_state['torch'])
+
+
+def create_resume_snapshot(agent, **loop_state):
+    """
+    Eğitime kaldığı yerden devam etmek için tam durum anlık görüntüsü al
+
+    Agent ağırlıkları, optimizer durumu, yarım kalmış rollout buffer'ı,
+    RNG durumları ve eğitim döngüsü durumu (episode indeksi, en iyi değer,
+    ödül geçmişleri vb.) birlikte saklanır.
+
+    Args:
+        agent (PPOAgent): Eğitilen agent
+        **loop_state: Eğitim döngüsü durumu
+
+    Returns:
+        dict: Diske yazılabilir anlık görüntü
+    """
+    snapshot = agent.get_checkpoint_snapshot()
+    snapshot['buffer'] = {key: list(values) for key, values in agent.buffer.items()}
+    snapshot['rng_state'] = capture_rng_state()
+    snapshot['loop_state'] = loop_state
+    return snapshot
+
+
+def load_resume_checkpoint(filepath):
+    """
+    Devam ettirilebilir checkpoint dosyasını oku
+
+    Args:
+        filepath (str): Checkpoint dosya yolu
+
+    Returns:
+        dict: create_resume_snapshot formatında checkpoint
+    """
+    return load_checkpoint(filepath)
+
+
+def restore_resume_checkpoint(agent, checkpoint):
+    """
+    Checkpoint'i agent'a, rollout buffer'ına ve RNG'lere geri yükle
+
+    RNG durumları agent oluşturulduktan sonra yüklenmelidir; aksi halde
+    ağırlık başlatma üreteci ilerletir.
+
+    Args:
+        agent (PPOAgent): Durumu geri yüklenecek agent
+        checkpoint (dict): load_resume_checkpoint çıktısı
+
+    Returns:
+        dict: Eğitim döngüsü durumu
+    """
+    agent.restore_checkpoint(checkpoint)
+    agent.clear_buffer()
+    agent.buffer.update({key: list(values) for key, values in checkpoint['buffer'].items()})
+    restore_rng_state(checkpoint['rng_state'])
+    return checkpoint['loop_state']
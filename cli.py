@@ -0,0 +1,251 @@
+"""
+Birleşik Komut Satırı Arayüzü - Hızlı açılan tek giriş noktası
+
+Alt komutlar: train, quick, test, compare, inspect. Modül yüklenirken
+yalnızca standart kütüphane ve config içe aktarılır; torch, matplotlib, pandas ve
+yfinance gibi ağır paketler yalnızca ilgili alt komut çalışırken yüklenir.
+Böylece --help ve hatalı argüman mesajları anında döner.
+
+Kullanım:
+    python cli.py train --episodes 500
+    python cli.py test best_portfolio_agent.pt --detailed
+    python cli.py --import-report
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from config import RESUME_CHECKPOINT_PATH
+
+# Açılış süresi raporunda karşılaştırılan eski giriş noktaları
+LEGACY_ENTRY_POINTS = ("main", "quick_test", "test_model", "test_commands", "debug_test")
+
+# Raporda ayrıca izlenen ağır paketler
+HEAVY_PACKAGES = ("torch", "matplotlib", "pandas", "yfinance")
+
+
+def cmd_train(args):
+    """Tam eğitim"""
+    import config
+    if args.episodes is not None:
+        config.NUM_EPISODES = args.episodes
+    config.TIMING_ENABLED = config.TIMING_ENABLED or args.timing
+    config.PROFILE_ENABLED = config.PROFILE_ENABLED or args.profile
+    if args.metrics_port is not None:
+        config.METRICS_PORT = args.metrics_port
+    if args.validation_split is not None:
+        config.VALIDATION_SPLIT = args.validation_split
+    config.RUN_BOOTSTRAP = config.RUN_BOOTSTRAP or args.bootstrap
+    config.RUN_MONTE_CARLO = config.RUN_MONTE_CARLO or args.monte_carlo
+    from main import train_portfolio_agent
+    train_portfolio_agent(args.resume)
+
+
+def cmd_quick(args):
+    """50 episode'luk hızlı eğitim"""
+    import config
+    config.TIMING_ENABLED = config.TIMING_ENABLED or args.timing
+    config.PROFILE_ENABLED = config.PROFILE_ENABLED or args.profile
+    if args.metrics_port is not None:
+        config.METRICS_PORT = args.metrics_port
+    if args.validation_split is not None:
+        config.VALIDATION_SPLIT = args.validation_split
+    config.RUN_BOOTSTRAP = config.RUN_BOOTSTRAP or args.bootstrap
+    config.RUN_MONTE_CARLO = config.RUN_MONTE_CARLO or args.monte_carlo
+    from main import quick_test
+    quick_test(args.resume)
+
+
+def cmd_test(args):
+    """Kaydedilmiş modeli test et"""
+    if args.detailed:
+        from test_model import load_and_test_model
+        load_and_test_model(args.model)
+    else:
+        from quick_test import quick_test_model
+        quick_test_model(args.model, test_days=args.days)
+
+
+def cmd_compare(args):
+    """Checkpoint'leri aynı veri üzerinde toplu karşılaştır"""
+    from batch_evaluation import find_checkpoints, evaluate_checkpoints, print_comparison_table
+    from data_manager import DataManager
+    from config import STOCK_SYMBOLS
+
+    checkpoint_paths = args.checkpoints or find_checkpoints()
+    if not checkpoint_paths:
+        print("❌ Checkpoint bulunamadı!")
+        return
+
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, args.period)
+    if len(raw_data) < 2:
+        print("❌ Yeterli veri bulunamadı!")
+        return
+
+    table, _, failures = evaluate_checkpoints(checkpoint_paths, data_manager.process_data(raw_data),
+                                              rank_by=args.rank_by)
+    print_comparison_table(table, failures)
+    if args.output:
+        table.to_csv(args.output, index=False)
+
+
+def cmd_inspect(args):
+    """Checkpoint boyutlarını ve eğitim özetini yazdır (veri indirmeden)"""
+    from checkpoint import load_policy_state, load_training_state, resolve_split_paths
+
+    payload = load_policy_state(args.checkpoint)
+    n_params = sum(tensor.numel() for tensor in payload['state_dict'].values())
+    print(f"🔍 {args.checkpoint}")
+    print(f"   Durum boyutu: {payload['state_dim']}")
+    print(f"   Aksiyon boyutu: {payload['action_dim']} ({payload['action_dim'] - 1} hisse + nakit)")
+    print(f"   Gizli katman: {payload['hidden_dim']}")
+    print(f"   Parametre sayısı: {n_params:,}")
+
+    split_paths = resolve_split_paths(args.checkpoint)
+    training_path = split_paths[1] if split_paths is not None else args.checkpoint
+    if not os.path.exists(training_path):
+        return
+
+    training_metrics = load_training_state(training_path).get('training_metrics', {})
+    for name, history in training_metrics.items():
+        # ArrayHistory durumu özet içerir; eski checkpoint'lerde düz liste vardır
+        if isinstance(history, dict):
+            summary = history['summary']
+        else:
+            summary = {'count': len(history), 'last': history[-1] if history else float('nan')}
+        print(f"   {name:<14} güncelleme: {summary['count']:>6}  son: {summary['last']:.4f}")
+
+
+def _measure_import(module):
+    """
+    Modülü -X importtime ile ayrı bir süreçte içe aktar
+
+    Returns:
+        dict: Toplam süre (sn), modül sayısı ve yüklenen ağır paketler
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               capture_output=True, text=True)
+    total_us = 0
+    modules = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.add(name)
+        if name == module:
+            total_us = int(cumulative)
+    return {
+        'seconds': total_us / 1e6,
+        'modules': len(modules),
+        'heavy': [package for package in HEAVY_PACKAGES if package in modules],
+        'ok': completed.returncode == 0
+    }
+
+
+def import_time_report(modules=("cli",) + LEGACY_ENTRY_POINTS):
+    """
+    Giriş noktalarının açılış (içe aktarma) süresini karşılaştır
+
+    Her modül `python -X importtime` ile temiz bir süreçte ölçülür.
+
+    Args:
+        modules (tuple): Ölçülecek modüller
+
+    Returns:
+        dict: Modül -> ölçüm
+    """
+    results = {module: _measure_import(module) for module in modules}
+
+    print("\n" + "=" * 70)
+    print("              AÇILIŞ SÜRESİ RAPORU (python -X importtime)")
+    print("=" * 70)
+    print(f"{'Giriş noktası':<16} {'Süre (sn)':>10} {'Modül':>7}   Ağır paketler")
+    print("-" * 70)
+    for module, result in results.items():
+        heavy = ", ".join(result['heavy']) or "-"
+        status = "" if result['ok'] else "  (hata)"
+        print(f"{module:<16} {result['seconds']:>10.3f} {result['modules']:>7}   {heavy}{status}")
+
+    legacy = [results[module]['seconds'] for module in modules if module != "cli" and results[module]['ok']]
+    if "cli" in results and legacy:
+        print("-" * 70)
+        print(f"cli açılışı, eski giriş noktalarının ortalamasından "
+              f"{sum(legacy) / len(legacy) / max(results['cli']['seconds'], 1e-6):.0f}x hızlı")
+    print("=" * 70)
+    return results
+
+
+def build_parser():
+    """Alt komutlu argüman ayrıştırıcısı"""
+    parser = argparse.ArgumentParser(description="PPO Portföy Yönetimi - birleşik komut satırı")
+    parser.add_argument("--import-report", action="store_true",
+                        help="Giriş noktalarının içe aktarma sürelerini karşılaştır ve çık")
+    subparsers = parser.add_subparsers(dest="command")
+
+    train = subparsers.add_parser("train", help="Tam eğitim")
+    train.add_argument("--episodes", type=int, default=None, help="Episode sayısı (varsayılan: config)")
+    train.add_argument("--resume", nargs="?", const=RESUME_CHECKPOINT_PATH, default=None,
+                       metavar="CHECKPOINT", help="Devam ettirilebilir checkpoint'ten devam et")
+    train.add_argument("--timing", action="store_true", help="Faz sürelerini ölç ve raporla")
+    train.add_argument("--profile", action="store_true", help="Bir güncelleme penceresini torch.profiler ile kaydet")
+    train.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                       help="Canlı metrikleri bu portta /metrics yolunda yayınla")
+    train.add_argument("--validation-split", type=float, default=None, metavar="ORAN",
+                       help="Son günlerin bu oranını doğrulamaya ayır")
+    train.add_argument("--bootstrap", action="store_true", help="Eğitim sonunda bootstrap güven aralıklarını hesapla")
+    train.add_argument("--monte-carlo", action="store_true", help="Eğitim sonunda Monte Carlo değerlendirmesini çalıştır")
+    train.set_defaults(handler=cmd_train)
+
+    quick = subparsers.add_parser("quick", help="50 episode'luk hızlı eğitim")
+    quick.add_argument("--resume", nargs="?", const=RESUME_CHECKPOINT_PATH, default=None,
+                       metavar="CHECKPOINT", help="Devam ettirilebilir checkpoint'ten devam et")
+    quick.add_argument("--timing", action="store_true", help="Faz sürelerini ölç ve raporla")
+    quick.add_argument("--profile", action="store_true", help="Bir güncelleme penceresini torch.profiler ile kaydet")
+    quick.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                       help="Canlı metrikleri bu portta /metrics yolunda yayınla")
+    quick.add_argument("--validation-split", type=float, default=None, metavar="ORAN",
+                       help="Son günlerin bu oranını doğrulamaya ayır")
+    quick.add_argument("--bootstrap", action="store_true", help="Eğitim sonunda bootstrap güven aralıklarını hesapla")
+    quick.add_argument("--monte-carlo", action="store_true", help="Eğitim sonunda Monte Carlo değerlendirmesini çalıştır")
+    quick.set_defaults(handler=cmd_quick)
+
+    test = subparsers.add_parser("test", help="Kaydedilmiş modeli test et")
+    test.add_argument("model", nargs="?", default="best_portfolio_agent.pt", help="Checkpoint yolu")
+    test.add_argument("--days", type=int, default=30, help="Hızlı testte gün sayısı")
+    test.add_argument("--detailed", action="store_true", help="Benchmark ve bootstrap içeren detaylı test")
+    test.set_defaults(handler=cmd_test)
+
+    compare = subparsers.add_parser("compare", help="Checkpoint'leri toplu karşılaştır")
+    compare.add_argument("checkpoints", nargs="*", help="Checkpoint yolları (boşsa otomatik aranır)")
+    compare.add_argument("--period", default="1y", help="Değerlendirme verisi süresi")
+    compare.add_argument("--rank-by", default="total_return_pct", help="Sıralama metriği")
+    compare.add_argument("--output", default=None, help="Tablonun yazılacağı CSV")
+    compare.set_defaults(handler=cmd_compare)
+
+    inspect_parser = subparsers.add_parser("inspect", help="Checkpoint boyutları ve eğitim özeti")
+    inspect_parser.add_argument("checkpoint", nargs="?", default="best_portfolio_agent.pt", help="Checkpoint yolu")
+    inspect_parser.set_defaults(handler=cmd_inspect)
+
+    return parser
+
+
+def main(argv=None):
+    """Komut satırı giriş noktası"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.import_report:
+        import_time_report()
+    elif args.command is None:
+        parser.print_help()
+    else:
+        args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,10 +24,86 @@ HIDDEN_DIM = 256  # Hidden layer boyutu
 NUM_EPISODES = 1000
 UPDATE_FREQUENCY = 10  # Kaç episode'da bir güncelleme
 REPORT_FREQUENCY = 50  # Kaç episode'da bir rapor
+CHECKPOINT_MIN_INTERVAL = 5.0  # En iyi model kayıtları arası minimum süre (saniye)
+CHECKPOINT_FREQUENCY = 50  # Kaç episode'da bir devam ettirilebilir checkpoint
+RESUME_CHECKPOINT_PATH = "resume_checkpoint.pt"  # Devam ettirilebilir checkpoint dosyası
+HISTORY_CHUNK_SIZE = 1024  # Bellekte tutulan geçmiş parçası; dolan parçalar diske eklenir
+COMPACT_ROLLOUTS = False  # Buffer'da durum yerine adım indeksi + ağırlık sakla (büyük evrenlerde bellek tasarrufu)
+TIMING_ENABLED = False  # Eğitim döngüsü fazlarını ölç ve her REPORT_FREQUENCY'de raporla
+PROFILE_ENABLED = False  # torch.profiler ile bir güncelleme penceresini kaydet (Chrome izi)
+PROFILE_WAIT_UPDATES = 2  # Kayıttan önce atlanan güncelleme sayısı
+PROFILE_ACTIVE_UPDATES = 2  # Kaydedilen güncelleme sayısı (her biri ayrı bir pencere)
+PROFILE_ROLLOUT_STEPS = 32  # Her pencerede güncellemeden sonra kaydedilen ortam adımı
+PROFILE_MEMORY = True  # Operatör başına CPU bellek ayırmalarını da kaydet
+PROFILE_RECORD_SHAPES = False  # Operatör girdi boyutlarını kaydet (izi belirgin büyütür)
+PROFILE_SUMMARY = False  # Operatör özet tablolarını arka planda üret (ayrıştırma yavaştır)
+PROFILE_DIR = "profiles"  # Koşu kaydına taşınmadan önce profil çıktılarının dizini
+METRICS_PORT = None  # Prometheus formatında canlı metrik uç noktası portu (None: kapalı)
+METRICS_HOST = "127.0.0.1"  # Metrik uç noktasının dinlediği adres
+
+# Doğrulama parametreleri
+VALIDATION_SPLIT = 0.0  # Eğitimden ayrılan son günlerin oranı (0: kapalı; > 0 ise eğitim verisi kısalır
+                        # ve en iyi model doğrulama skoruna göre seçilir)
+VALIDATION_FREQUENCY = 5  # Kaç güncellemede bir arka planda doğrulama
+VALIDATION_METRIC = 'sharpe_ratio'  # En iyi modeli seçen doğrulama metriği
+EARLY_STOPPING_PATIENCE = 10  # İyileşmesiz doğrulama sayısı (0: erken durdurma kapalı)
+
+# Aktör-öğrenen parametreleri
+NUM_ACTORS = 4  # Rollout süreci sayısı
+ACTOR_QUEUE_SIZE = 32  # Trajektori kuyruğu kapasitesi
+ACTOR_QUEUE_TIMEOUT = 1.0  # Öğrenenin aktör süreçlerinin canlılığını yoklama aralığı (sn)
+IMPORTANCE_WEIGHT_CLIP = 1.0  # Eski politikadan gelen veriler için importance weight üst sınırı
+
+# Ensemble parametreleri
+ENSEMBLE_SEEDS = [0, 1, 2, 3, 4]  # Tek süreçte birlikte eğitilen tohumlar
+
+# Hiperparametre araması parametreleri
+SWEEP_SEARCH_SPACE = {
+    'learning_rate': [1e-4, 3e-4, 1e-3],
+    'eps_clip': [0.1, 0.2, 0.3],
+    'k_epochs': [4, 8],
+    'hidden_dim': [128, 256],
+    'update_frequency': [5, 10]
+}
+SWEEP_NUM_TRIALS = 16  # Deneme sayısı
+SWEEP_MIN_EPISODES = 20  # İlk basamakta deneme başına episode
+SWEEP_MAX_EPISODES = 160  # Deneme başına maksimum episode
+SWEEP_REDUCTION_FACTOR = 2  # Her basamakta kalan oran 1/eta
+SWEEP_WORKERS = 4  # Paralel süreç sayısı
+
+# Walk-forward backtest parametreleri
+WALK_FORWARD_TRAIN_DAYS = 250  # Kat başına eğitim penceresi (gün)
+WALK_FORWARD_TEST_DAYS = 60  # Kat başına test penceresi (gün)
+WALK_FORWARD_EPISODES = 200  # Kat başına eğitim episode sayısı
+WALK_FORWARD_WORKERS = 4  # Paralel süreç sayısı
+
+# Çalıştırma kaydı
+RUN_REGISTRY_DIR = "runs"  # Koşu klasörleri ve index.sqlite
+
+# Benchmark parametreleri
+BENCHMARK_REBALANCE_FREQUENCY = 21  # Yeniden dengelenen benchmark'lar için gün (~aylık)
+BENCHMARK_LOOKBACK = 60  # Ters volatilite / minimum varyans tahmin penceresi (gün)
+
+# Bootstrap parametreleri
+RUN_BOOTSTRAP = False  # Eğitim sonunda agent-benchmark bootstrap güven aralıklarını hesapla
+BOOTSTRAP_RESAMPLES = 10000  # Yeniden örnekleme sayısı
+BOOTSTRAP_BLOCK_LENGTH = 10  # (Ortalama) blok uzunluğu, gün
+BOOTSTRAP_CONFIDENCE = 0.95  # Güven düzeyi
+
+# Monte Carlo değerlendirme parametreleri
+RUN_MONTE_CARLO = False  # Eğitim sonunda stokastik politika Monte Carlo değerlendirmesini çalıştır
+MONTE_CARLO_ROLLOUTS = 1000  # Eğitim sonrası örneklenen episode sayısı
+MONTE_CARLO_BATCH_SIZE = 1000  # Aynı anda simüle edilen episode sayısı
+
+# Akan metrik parametreleri
+ONLINE_METRICS_WINDOW = 20  # Kayan pencere metrikleri için gün (0: kapalı)
 
 # Görselleştirme
 FIGURE_SIZE = (15, 10)
 PLOT_ALPHA = 0.7
+PLOT_MODE = "auto"  # "show": pencere, "file": PLOT_DIR'e PNG (Agg), "auto": ekran yoksa "file"
+PLOT_DIR = "figures"  # Dosya modunda figürlerin yazıldığı dizin
+PLOT_MAX_POINTS = 2000  # Çizgi grafiklerinde seri başına maksimum nokta (şekli koruyan seyreltme)
 
 # Risk parametreleri
 MAX_LOSS_THRESHOLD = -0.05  # %5'den fazla kayıp cezası
@@ -94,6 +94,70 @@ class DataManager:
         self.processed_data = processed
         return processed
     
+    def save_cache(self, processed_data, filepath):
+        """
+        İşlenmiş veriyi sıkıştırılmamış .npz önbelleğine yaz
+        
+        Args:
+            processed_data (dict): process_data çıktısı
+            filepath (str): Önbellek dosya yolu
+        """
+        np.savez(filepath,
+                 prices=processed_data['prices'],
+                 returns=processed_data['returns'],
+                 normalized_prices=processed_data['normalized_prices'],
+                 stock_names=np.array(processed_data['stock_names']))
+    
+    def load_cache(self, filepath):
+        """
+        save_cache ile yazılmış önbellekten işlenmiş veriyi oku
+        
+        Args:
+            filepath (str): Önbellek dosya yolu
+            
+        Returns:
+            dict: İşlenmiş veriler
+        """
+        with np.load(filepath) as cache:
+            prices = cache['prices']
+            processed = {
+                'prices': prices,
+                'returns': cache['returns'],
+                'normalized_prices': cache['normalized_prices'],
+                'stock_names': [str(name) for name in cache['stock_names']],
+                'n_stocks': prices.shape[0],
+                'n_days': prices.shape[1]
+            }
+        
+        self.processed_data = processed
+        return processed
+    
+    def slice_data(self, processed_data, start, end):
+        """
+        İşlenmiş verinin [start, end) gün aralığını yeni bir veri seti olarak döndür
+        
+        Getiriler ve normalize fiyatlar dilimin ilk gününe göre yeniden
+        hesaplanır; dilim, o aralık için ayrıca indirilmiş veriyle aynıdır.
+        
+        Args:
+            processed_data (dict): process_data çıktısı
+            start (int): Başlangıç günü (dahil)
+            end (int): Bitiş günü (hariç)
+            
+        Returns:
+            dict: Dilimlenmiş veri
+        """
+        prices = processed_data['prices'][:, start:end].copy()
+        
+        return {
+            'prices': prices,
+            'returns': self._calculate_returns(prices),
+            'normalized_prices': prices / prices[:, 0:1],
+            'stock_names': list(processed_data['stock_names']),
+            'n_stocks': processed_data['n_stocks'],
+            'n_days': prices.shape[1]
+        }
+    
     def _calculate_returns(self, prices):
         """
         Günlük getiri hesapla
@@ -2,7 +2,7 @@
 Debug Test - Model boyutlarını kontrol et
 """
 
-import torch
+from checkpoint import load_policy_state
 from data_manager import DataManager
 from environment import PortfolioEnvironment
 from agents import PPOAgent
@@ -41,13 +41,13 @@ def check_model_dimensions():
     model_path = "best_portfolio_agent.pt"
     
     try:
-        # Model dosyasını yükle ve boyutları kontrol et
-        checkpoint = torch.load(model_path, map_location='cpu')
+        # Yalnızca politika ağırlıklarını yükle ve boyutları kontrol et
+        checkpoint = load_policy_state(model_path)
         
         print(f"\n🔧 Kaydedilmiş Model Boyutları:")
         
         # Network state dict'ten boyutları çıkar
-        state_dict = checkpoint['network_state_dict']
+        state_dict = checkpoint['state_dict']
         
         # İlk layer'dan input boyutunu al
         first_layer_weight = state_dict['shared_layers.0.weight']
@@ -106,7 +106,7 @@ def test_with_correct_dimensions():
         agent = PPOAgent(state_dim, action_dim)
         
         # Modeli yükle
-        agent.load_agent("best_portfolio_agent.pt")
+        agent.load_policy("best_portfolio_agent.pt")
         print(f"✅ Model başarıyla yüklendi!")
         
         # Kısa bir test yap
@@ -0,0 +1,276 @@
+"""
+Dağıtık Veri-Paralel PPO Eğitimi - torch.distributed (gloo)
+
+Her rank kendi rollout'larını toplar; PPOAgent.update içindeki gradyanlar
+tüm rank'ler arasında all-reduce ile ortalanır, böylece tüm rank'lerde
+ağırlıklar aynı kalır. Yerelde tek makinede birden fazla süreçle
+(python distributed.py --world-size 4) veya torchrun ile birden fazla
+CPU düğümünde çalıştırılabilir.
+"""
+
+import contextlib
+import io
+import os
+import time
+
+import numpy as np
+import torch
+import torch.distributed as dist
+
+from agents import PPOAgent
+from data_manager import DataManager
+from environment import PortfolioEnvironment
+from history import create_histories, new_history_dir
+from trainer import run_episode
+from config import (NUM_EPISODES, UPDATE_FREQUENCY, REPORT_FREQUENCY, INITIAL_BALANCE,
+                    STOCK_SYMBOLS, DATA_PERIOD)
+
+
+def init_distributed(rank=None, world_size=None, backend="gloo"):
+    """
+    Süreç grubunu başlat
+
+    rank / world_size verilmezse torchrun'ın ortam değişkenleri
+    (RANK, WORLD_SIZE, MASTER_ADDR, MASTER_PORT) kullanılır.
+
+    Returns:
+        tuple: (rank, world_size)
+    """
+    rank = int(os.environ.get("RANK", 0)) if rank is None else rank
+    world_size = int(os.environ.get("WORLD_SIZE", 1)) if world_size is None else world_size
+    os.environ.setdefault("MASTER_ADDR", "127.0.0.1")
+    os.environ.setdefault("MASTER_PORT", "29500")
+
+    dist.init_process_group(backend=backend, rank=rank, world_size=world_size)
+    return rank, world_size
+
+
+def broadcast_parameters(agent, src=0):
+    """Rank src'deki politika ağırlıklarını tüm rank'lere yayınla"""
+    with torch.no_grad():
+        for param in agent.policy.parameters():
+            dist.broadcast(param.data, src=src)
+    agent.policy_old.load_state_dict(agent.policy.state_dict())
+
+
+def broadcast_data(processed_data, src=0):
+    """Rank src'de hazırlanan veri setini tüm rank'lere gönder"""
+    payload = [processed_data]
+    dist.broadcast_object_list(payload, src=src)
+    return payload[0]
+
+
+def shard_data(processed_data, rank, world_size, mode="shared"):
+    """
+    Rank'e düşen veri setini döndür
+
+    Args:
+        processed_data (dict): Tüm veri
+        rank (int): Süreç sırası
+        world_size (int): Toplam süreç sayısı
+        mode (str): "shared" tüm rank'ler aynı veriyi kullanır,
+            "sharded" gün ekseni ardışık parçalara bölünür
+
+    Returns:
+        dict: Rank'in veri seti
+    """
+    if mode == "shared" or world_size == 1:
+        return processed_data
+    if mode != "sharded":
+        raise ValueError(f"Bilinmeyen veri paylaşım modu: {mode}")
+
+    boundaries = np.linspace(0, processed_data['n_days'], world_size + 1).astype(int)
+    return DataManager().slice_data(processed_data, boundaries[rank], boundaries[rank + 1])
+
+
+def all_reduce_metrics(values, op=dist.ReduceOp.SUM):
+    """
+    Skaler metrik listesini tüm rank'ler arasında birleştir
+
+    Args:
+        values (list): Skaler değerler
+        op: Birleştirme işlemi
+
+    Returns:
+        list: Birleştirilmiş değerler
+    """
+    tensor = torch.tensor(values, dtype=torch.float64)
+    dist.all_reduce(tensor, op=op)
+    return tensor.tolist()
+
+
+def train_distributed(rank, world_size, processed_data, num_episodes=NUM_EPISODES,
+                      update_frequency=UPDATE_FREQUENCY, data_mode="shared",
+                      checkpoint_path="distributed_agent.pt", seed=0):
+    """
+    Bir rank için dağıtık eğitim döngüsü
+
+    Tüm rank'ler aynı sayıda episode toplar ve aynı anda güncelleme yapar.
+    Metrikler REPORT_FREQUENCY'de bir rank'ler arasında toplanır; en iyi
+    model ve final model yalnızca rank 0 tarafından kaydedilir.
+
+    Args:
+        rank (int): Süreç sırası
+        world_size (int): Toplam süreç sayısı
+        processed_data (dict): İşlenmiş veri (tüm rank'lerde aynı)
+        num_episodes (int): Rank başına episode sayısı
+        update_frequency (int): Kaç episode'da bir güncelleme
+        data_mode (str): "shared" veya "sharded"
+        checkpoint_path (str): Final modelin kaydedileceği yol
+        seed (int): Tohum (rank ile kaydırılır)
+
+    Returns:
+        tuple: (agent, results) - results rank 0 dışında None
+    """
+    torch.manual_seed(seed + rank)
+    np.random.seed(seed + rank)
+
+    rank_data = shard_data(processed_data, rank, world_size, data_mode)
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = PortfolioEnvironment(rank_data)
+        state_dim = len(env.get_state())
+        action_dim = rank_data['n_stocks'] + 1
+        agent = PPOAgent(state_dim, action_dim)
+
+    # Tüm rank'ler aynı başlangıç ağırlıklarıyla başlar
+    broadcast_parameters(agent)
+
+    is_main = rank == 0
+    if is_main:
+        print(f"\n🌐 Dağıtık eğitim: {world_size} rank, veri modu: {data_mode}")
+        print("=" * 60)
+
+    best_path = os.path.join(os.path.dirname(checkpoint_path), "best_" + os.path.basename(checkpoint_path))
+    # Tüm geçmiş yalnızca rank 0'ın sonuçlarında döner; diğer rank'ler son değerleri bellekte tutar
+    histories = create_histories(['episode_rewards', 'episode_portfolio_values'],
+                                 new_history_dir(checkpoint_path) if is_main else None)
+    episode_rewards = histories['episode_rewards']
+    episode_portfolio_values = histories['episode_portfolio_values']
+    global_history = []
+    best_portfolio_value = 0
+    start_time = time.perf_counter()
+
+    for episode in range(num_episodes):
+        episode_reward, portfolio_history = run_episode(agent, env, action_dim, training=True)
+        episode_rewards.append(episode_reward)
+        episode_portfolio_values.append(portfolio_history[-1])
+
+        if (episode + 1) % update_frequency == 0:
+            # En iyi model: tüm rank'lerdeki en yüksek değer (ağırlıklar her rank'te aynı).
+            # Bu değeri üreten, güncelleme öncesi politika olduğu için kayıt güncellemeden önce yapılır
+            recent_best = max(episode_portfolio_values[-update_frequency:])
+            global_best = all_reduce_metrics([recent_best], op=dist.ReduceOp.MAX)[0]
+            if global_best > best_portfolio_value:
+                best_portfolio_value = global_best
+                if is_main:
+                    agent.save_agent(best_path, split=True)
+
+            # Boş buffer'lı bir rank güncellemeyi atlarsa diğerleri gradyan all-reduce'unda
+            # kilitlenir; güncelleme yalnızca tüm rank'lerde veri varsa yapılır
+            min_buffer_size = all_reduce_metrics([agent.get_buffer_size()], op=dist.ReduceOp.MIN)[0]
+            if min_buffer_size > 0:
+                agent.update()
+
+        if (episode + 1) % REPORT_FREQUENCY == 0:
+            reward_sum, value_sum, count = all_reduce_metrics([
+                sum(episode_rewards[-REPORT_FREQUENCY:]),
+                sum(episode_portfolio_values[-REPORT_FREQUENCY:]),
+                len(episode_rewards[-REPORT_FREQUENCY:])
+            ])
+            global_history.append({
+                'episode': episode + 1,
+                'avg_reward': reward_sum / count,
+                'avg_portfolio_value': value_sum / count
+            })
+            if is_main:
+                avg_value = value_sum / count
+                print(f"\n📈 Episode {episode + 1}/{num_episodes} (tüm rank'ler)")
+                print(f"   Ortalama Ödül: {reward_sum / count:.2f}")
+                print(f"   Ortalama Portföy Değeri: ${avg_value:,.2f}")
+                print(f"   Getiri: %{(avg_value / INITIAL_BALANCE - 1) * 100:.2f}")
+                print("-" * 50)
+
+    elapsed = time.perf_counter() - start_time
+    total_episodes = all_reduce_metrics([num_episodes])[0]
+
+    if not is_main:
+        return agent, None
+
+    agent.save_agent(checkpoint_path, split=True)
+    results = {
+        'world_size': world_size,
+        'episode_rewards': episode_rewards.to_numpy(),
+        'episode_portfolio_values': episode_portfolio_values.to_numpy(),
+        'global_history': global_history,
+        'best_portfolio_value': best_portfolio_value,
+        'elapsed_seconds': elapsed,
+        'episodes_per_second': total_episodes / elapsed
+    }
+    print(f"\n✅ Dağıtık eğitim tamamlandı: {int(total_episodes)} episode, {elapsed:.1f} sn "
+          f"({results['episodes_per_second']:.2f} episode/sn)")
+    return agent, results
+
+
+def _worker(rank, world_size, processed_data, kwargs):
+    """mp.spawn ile başlatılan yerel rank süreci"""
+    torch.set_num_threads(1)
+    init_distributed(rank, world_size)
+    try:
+        train_distributed(rank, world_size, processed_data, **kwargs)
+    finally:
+        dist.destroy_process_group()
+
+
+def launch_local(world_size, processed_data, **kwargs):
+    """
+    Tek makinede world_size süreçle dağıtık eğitimi başlat
+
+    Args:
+        world_size (int): Süreç sayısı
+        processed_data (dict): İşlenmiş veri
+        **kwargs: train_distributed parametreleri
+    """
+    import torch.multiprocessing as mp
+
+    os.environ.setdefault("MASTER_ADDR", "127.0.0.1")
+    os.environ.setdefault("MASTER_PORT", "29500")
+    mp.spawn(_worker, args=(world_size, processed_data, kwargs), nprocs=world_size, join=True)
+
+
+def _load_data():
+    """Eğitim verisini indir ve işle"""
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, DATA_PERIOD)
+    if len(raw_data) < 2:
+        return None
+    return data_manager.process_data(raw_data)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dağıtık veri-paralel PPO eğitimi (gloo)")
+    parser.add_argument("--world-size", type=int, default=None,
+                        help="Yerel süreç sayısı (torchrun ile çalıştırılırken verilmez)")
+    parser.add_argument("--episodes", type=int, default=NUM_EPISODES, help="Rank başına episode sayısı")
+    parser.add_argument("--data-mode", choices=["shared", "sharded"], default="shared",
+                        help="Veriyi rank'ler arasında paylaş veya gün ekseninde böl")
+    args = parser.parse_args()
+    train_kwargs = {'num_episodes': args.episodes, 'data_mode': args.data_mode}
+
+    if args.world_size is not None:
+        # Yerel çok süreçli çalıştırma
+        processed_data = _load_data()
+        if processed_data is None:
+            print("❌ Yeterli veri bulunamadı!")
+        else:
+            launch_local(args.world_size, processed_data, **train_kwargs)
+    else:
+        # torchrun: veriyi rank 0 indirir ve diğer rank'lere yayınlar
+        rank, world_size = init_distributed()
+        processed_data = broadcast_data(_load_data() if rank == 0 else None)
+        try:
+            if processed_data is not None:
+                train_distributed(rank, world_size, processed_data, **train_kwargs)
+        finally:
+            dist.destroy_process_group()
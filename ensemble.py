@@ -0,0 +1,359 @@
+"""
+Vektörize Çok Tohumlu (Multi-Seed) Ensemble Eğitimi
+
+K adet PPONetwork kopyasının ağırlıkları torch.func.stack_module_state ile
+yığılır ve vmap ile tek bir toplu ileri/geri yayılımda eğitilir. Her kopya
+UPDATE_FREQUENCY episode'unu VectorizedPortfolioEnvironment içinde paralel
+toplar; böylece K tohumlu bir deney tek süreçte, büyük matris çarpımlarıyla
+çalışır.
+"""
+
+import copy
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.func import functional_call, stack_module_state, vmap
+
+from models import PPONetwork
+from environment import VectorizedPortfolioEnvironment
+from checkpoint import save_weights
+from config import (LEARNING_RATE, GAMMA, EPS_CLIP, K_EPOCHS, HIDDEN_DIM, NUM_EPISODES,
+                    UPDATE_FREQUENCY, REPORT_FREQUENCY, INITIAL_BALANCE, ENSEMBLE_SEEDS)
+
+
+class EnsemblePPOTrainer:
+    """
+    Yığılmış ağırlıklarla K bağımsız PPO agent'ını birlikte eğiten sınıf
+
+    Her kopyanın kaybı yalnızca kendi ağırlıklarına bağlı olduğundan toplam
+    kaybın gradyanı kopya başına gradyanlara ayrışır. Adam eleman bazlı
+    çalıştığı için tek optimizer K ayrı optimizer ile eşdeğerdir; gradyan
+    kırpma ise kopya başına norm ile yapılır.
+
+    Her kopyanın kendi tohumundan oluşturulan bir torch.Generator'ı vardır;
+    aksiyon örnekleme ve dropout maskeleri bu üreteçten çekilir. Böylece bir
+    kopyanın sonuçları diğer kopyalardan ve global RNG'den bağımsızdır.
+    """
+
+    def __init__(self, processed_data, seeds=ENSEMBLE_SEEDS, lr=LEARNING_RATE, gamma=GAMMA,
+                 eps_clip=EPS_CLIP, k_epochs=K_EPOCHS, hidden_dim=HIDDEN_DIM,
+                 episodes_per_update=UPDATE_FREQUENCY):
+        """
+        Args:
+            processed_data (dict): DataManager.process_data çıktısı
+            seeds (list): Kopya başına ağırlık başlatma, örnekleme ve dropout tohumları
+            lr (float): Öğrenme oranı
+            gamma (float): Discount factor
+            eps_clip (float): PPO clipping parametresi
+            k_epochs (int): Her güncellemede kaç epoch eğitim
+            hidden_dim (int): Gizli katman boyutu
+            episodes_per_update (int): Güncelleme başına kopya başına episode
+        """
+        self.seeds = list(seeds)
+        self.n_models = len(self.seeds)
+        self.gamma = gamma
+        self.eps_clip = eps_clip
+        self.k_epochs = k_epochs
+        self.episodes_per_update = episodes_per_update
+
+        # Her kopya için E paralel alt ortam (toplam K * E)
+        self.env = VectorizedPortfolioEnvironment(processed_data, self.n_models * episodes_per_update)
+        self.state_dim = self.env.state_dim
+        self.action_dim = processed_data['n_stocks'] + 1
+
+        models = []
+        self.generators = []
+        for seed in self.seeds:
+            generator = torch.Generator().manual_seed(seed)
+            with torch.random.fork_rng():
+                torch.manual_seed(seed)
+                models.append(PPONetwork(self.state_dim, self.action_dim, hidden_dim))
+            self.generators.append(generator)
+
+        # Ağırlıkları [K, ...] tensörlerine yığ
+        params, buffers = stack_module_state(models)
+        self.params = {name: param.detach().requires_grad_() for name, param in params.items()}
+        self.buffers = buffers
+        self.base_model = copy.deepcopy(models[0]).to('meta')
+        self.hidden_dim = hidden_dim
+
+        # Dropout katmanları: maskeler kopya üreteçlerinden çekilir ve forward hook ile uygulanır
+        self._dropout_layers = []
+        width = self.state_dim
+        for module in self.base_model.modules():
+            if isinstance(module, nn.Linear):
+                width = module.out_features
+            elif isinstance(module, nn.Dropout):
+                module.register_forward_hook(self._apply_dropout_mask)
+                self._dropout_layers.append((module, width))
+        self._active_masks = None
+
+        self.optimizer = torch.optim.Adam(self.params.values(), lr=lr)
+
+        self.training_metrics = {
+            'actor_losses': [],
+            'critic_losses': [],
+            'total_losses': [],
+            'entropies': []
+        }
+
+        print(f"Ensemble oluşturuldu: {self.n_models} kopya x {episodes_per_update} paralel episode")
+
+    def _apply_dropout_mask(self, module, inputs, output):
+        """Dropout katmanının çıktısına o anki kopya maskesini uygula (eğitim modunda)"""
+        if self._active_masks is None:
+            return output
+        return output * self._active_masks[module]
+
+    def _dropout_masks(self, n_samples):
+        """
+        Kopya üreteçlerinden ölçeklenmiş dropout maskeleri çek
+
+        Returns:
+            list: Dropout katmanı başına [K, N, genişlik] maske
+        """
+        masks = []
+        for module, width in self._dropout_layers:
+            keep = 1 - module.p
+            masks.append(torch.stack([
+                torch.bernoulli(torch.full((n_samples, width), keep), generator=generator) / keep
+                for generator in self.generators
+            ]))
+        return masks
+
+    def _forward(self, states, training):
+        """
+        Tüm kopyalar için toplu ileri yayılım
+
+        Ağ her zaman eval modunda çağrılır; eğitim modunda dropout, kopya
+        üreteçlerinden çekilen maskelerle hook üzerinden uygulanır.
+
+        Args:
+            states (torch.Tensor): [K, N, state_dim]
+            training (bool): Dropout açık mı
+
+        Returns:
+            tuple: ([K, N, action_dim] logitler, [K, N] değerler)
+        """
+        self.base_model.eval()
+        modules = [module for module, _ in self._dropout_layers]
+        masks = self._dropout_masks(states.shape[1]) if training else []
+
+        def single_forward(params, buffers, x, masks):
+            self._active_masks = dict(zip(modules, masks)) if masks else None
+            try:
+                return functional_call(self.base_model, (params, buffers), (x,))
+            finally:
+                self._active_masks = None
+
+        return vmap(single_forward)(self.params, self.buffers, states, masks)
+
+    def collect_rollouts(self):
+        """
+        Her kopya için episodes_per_update episode'u paralel topla
+
+        Returns:
+            dict: [T, K, E] boyutlu rollout dizileri ve [K, E] final değerler
+        """
+        K, E = self.n_models, self.episodes_per_update
+        states, actions, log_probs, rewards = [], [], [], []
+
+        state = self.env.reset()
+        done = False
+        with torch.no_grad():
+            while not done:
+                state_tensor = torch.from_numpy(state).view(K, E, self.state_dim)
+                action_logits, _ = self._forward(state_tensor, training=False)
+                action_dist = torch.distributions.Categorical(logits=action_logits)
+                # Her kopya kendi üretecinden örnekler
+                action = torch.stack([
+                    torch.multinomial(probs, 1, generator=generator).squeeze(-1)
+                    for probs, generator in zip(action_dist.probs, self.generators)
+                ])
+
+                action_indices = action.view(-1).numpy()
+                next_state, reward, dones, _ = self.env.step(
+                    self.env.action_vectors(action_indices, self.action_dim))
+
+                states.append(state_tensor)
+                actions.append(action)
+                log_probs.append(action_dist.log_prob(action))
+                rewards.append(torch.from_numpy(reward).float().view(K, E))
+
+                state = next_state
+                done = dones[0]
+
+        return {
+            'states': torch.stack(states),
+            'actions': torch.stack(actions),
+            'log_probs': torch.stack(log_probs),
+            'rewards': torch.stack(rewards),
+            'final_values': self.env.portfolio_history[:, -1].reshape(K, E)
+        }
+
+    def _discounted_rewards(self, rewards):
+        """[T, K, E] ödüllerden episode sonunda sıfırlanan indirimli getiriler"""
+        returns = torch.zeros_like(rewards)
+        running = torch.zeros_like(rewards[0])
+        for t in reversed(range(rewards.shape[0])):
+            running = rewards[t] + self.gamma * running
+            returns[t] = running
+        return returns
+
+    def _clip_grad_norm(self, max_norm=0.5):
+        """Gradyanları her kopya için ayrı ayrı norm ile kırp"""
+        grads = [param.grad for param in self.params.values()]
+        squared = torch.stack([grad.pow(2).reshape(self.n_models, -1).sum(dim=1) for grad in grads]).sum(dim=0)
+        clip_coef = torch.clamp(max_norm / (squared.sqrt() + 1e-6), max=1.0)
+        for grad in grads:
+            grad.mul_(clip_coef.view(-1, *([1] * (grad.dim() - 1))))
+
+    def update(self, rollouts):
+        """
+        Tüm kopyaları tek seferde PPO ile güncelle
+
+        Args:
+            rollouts (dict): collect_rollouts çıktısı
+
+        Returns:
+            dict: [K] boyutlu kopya başına eğitim metrikleri
+        """
+        K = self.n_models
+        T, _, E = rollouts['actions'].shape
+
+        # [T, K, E, ...] -> [K, E * T, ...] (episode sırası korunur)
+        states = rollouts['states'].permute(1, 2, 0, 3).reshape(K, E * T, self.state_dim)
+        actions = rollouts['actions'].permute(1, 2, 0).reshape(K, E * T)
+        old_log_probs = rollouts['log_probs'].permute(1, 2, 0).reshape(K, E * T)
+        discounted = self._discounted_rewards(rollouts['rewards']).permute(1, 2, 0).reshape(K, E * T)
+
+        # Kopya başına normalizasyon
+        discounted = (discounted - discounted.mean(dim=1, keepdim=True)) / (discounted.std(dim=1, keepdim=True) + 1e-8)
+
+        epoch_metrics = {key: torch.zeros(K) for key in ['actor_loss', 'critic_loss', 'total_loss', 'entropy']}
+
+        for _ in range(self.k_epochs):
+            action_logits, state_values = self._forward(states, training=True)
+
+            log_probs_all = F.log_softmax(action_logits, dim=-1)
+            new_log_probs = log_probs_all.gather(-1, actions.unsqueeze(-1)).squeeze(-1)
+            entropy = -(log_probs_all.exp() * log_probs_all).sum(dim=-1).mean(dim=1)
+
+            ratio = torch.exp(new_log_probs - old_log_probs)
+            advantages = discounted - state_values.detach()
+
+            surr1 = ratio * advantages
+            surr2 = torch.clamp(ratio, 1 - self.eps_clip, 1 + self.eps_clip) * advantages
+            actor_loss = -torch.min(surr1, surr2).mean(dim=1)
+            critic_loss = ((state_values - discounted) ** 2).mean(dim=1)
+            total_loss = actor_loss + 0.5 * critic_loss - 0.01 * entropy
+
+            self.optimizer.zero_grad()
+            total_loss.sum().backward()
+            self._clip_grad_norm(0.5)
+            self.optimizer.step()
+
+            epoch_metrics['actor_loss'] += actor_loss.detach()
+            epoch_metrics['critic_loss'] += critic_loss.detach()
+            epoch_metrics['total_loss'] += total_loss.detach()
+            epoch_metrics['entropy'] += entropy.detach()
+
+        epoch_metrics = {key: (value / self.k_epochs).numpy() for key, value in epoch_metrics.items()}
+        self.training_metrics['actor_losses'].append(epoch_metrics['actor_loss'])
+        self.training_metrics['critic_losses'].append(epoch_metrics['critic_loss'])
+        self.training_metrics['total_losses'].append(epoch_metrics['total_loss'])
+        self.training_metrics['entropies'].append(epoch_metrics['entropy'])
+
+        return epoch_metrics
+
+    def train(self, num_episodes=NUM_EPISODES):
+        """
+        Her kopyayı num_episodes episode boyunca eğit
+
+        Args:
+            num_episodes (int): Kopya başına episode sayısı
+
+        Returns:
+            dict: [episode, K] boyutlu ödül ve portföy değeri geçmişleri
+        """
+        n_updates = max(1, num_episodes // self.episodes_per_update)
+        portfolio_values = []
+        start_time = time.perf_counter()
+
+        for update_idx in range(n_updates):
+            rollouts = self.collect_rollouts()
+            self.update(rollouts)
+
+            # [K, E] -> E satır, K sütun
+            portfolio_values.extend(rollouts['final_values'].T)
+
+            episode = (update_idx + 1) * self.episodes_per_update
+            if episode % REPORT_FREQUENCY < self.episodes_per_update:
+                recent = np.array(portfolio_values[-REPORT_FREQUENCY:])
+                returns = (recent.mean(axis=0) / INITIAL_BALANCE - 1) * 100
+                print(f"\n📈 Episode {episode}/{num_episodes}")
+                print("   Getiri (tohum başına): " +
+                      ", ".join(f"{seed}: %{ret:.2f}" for seed, ret in zip(self.seeds, returns)))
+
+        elapsed = time.perf_counter() - start_time
+        print(f"\n✅ Ensemble eğitimi tamamlandı: {self.n_models} tohum x {n_updates * self.episodes_per_update} "
+              f"episode, {elapsed:.1f} sn")
+
+        return {
+            'seeds': self.seeds,
+            'episode_portfolio_values': np.array(portfolio_values),
+            'elapsed_seconds': elapsed
+        }
+
+    def to_networks(self):
+        """Yığılmış ağırlıkları ayrı PPONetwork nesnelerine aç"""
+        networks = []
+        for k in range(self.n_models):
+            network = PPONetwork(self.state_dim, self.action_dim, self.hidden_dim)
+            network.load_state_dict({name: param[k].detach().clone() for name, param in self.params.items()})
+            networks.append(network)
+        return networks
+
+    def save(self, filename_prefix="ensemble_agent"):
+        """
+        Her kopyayı yalnızca-ağırlık dosyası olarak kaydet
+
+        Args:
+            filename_prefix (str): Dosya adı öneki
+
+        Returns:
+            list: Kaydedilen dosya yolları
+        """
+        paths = []
+        for seed, network in zip(self.seeds, self.to_networks()):
+            path = f"{filename_prefix}_seed{seed}.weights.pt"
+            save_weights(network, path)
+            paths.append(path)
+        print(f"Ensemble kaydedildi: {', '.join(paths)}")
+        return paths
+
+
+if __name__ == "__main__":
+    import argparse
+    from data_manager import DataManager
+    from config import STOCK_SYMBOLS, DATA_PERIOD
+
+    parser = argparse.ArgumentParser(description="Vektörize çok tohumlu PPO ensemble eğitimi")
+    parser.add_argument("--seeds", type=int, nargs="+", default=ENSEMBLE_SEEDS, help="Tohum listesi")
+    parser.add_argument("--episodes", type=int, default=NUM_EPISODES, help="Tohum başına episode sayısı")
+    args = parser.parse_args()
+
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, DATA_PERIOD)
+    if len(raw_data) < 2:
+        print("❌ Yeterli veri bulunamadı!")
+    else:
+        trainer = EnsemblePPOTrainer(data_manager.process_data(raw_data), seeds=args.seeds)
+        results = trainer.train(args.episodes)
+        trainer.save()
+
+        final_returns = (results['episode_portfolio_values'][-REPORT_FREQUENCY:].mean(axis=0) / INITIAL_BALANCE - 1) * 100
+        print(f"\nTohumlar arası getiri: ortalama %{final_returns.mean():.2f}, std %{final_returns.std():.2f}")
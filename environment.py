@@ -4,6 +4,7 @@ Portföy Yönetimi Ortamı - RL Environment
 
 import numpy as np
 from config import INITIAL_BALANCE, TRANSACTION_COST, MAX_LOSS_THRESHOLD, LOSS_PENALTY, VOLATILITY_WINDOW
+from timing import TIMER
 
 class PortfolioEnvironment:
     """
@@ -33,6 +34,16 @@ class PortfolioEnvironment:
         self.total_portfolio_value = initial_balance
         self.portfolio_history = [initial_balance]
         
+        # Opsiyonel akan metrik izleyici (attach_metrics ile bağlanır)
+        self.online_metrics = None
+        
+        # build_states için temizlenmiş, başına 2 gün sıfır eklenmiş getiri matrisi
+        # (sütun step + k, get_state'teki returns[:, step - 2 + k] değerine karşılık gelir)
+        n_return_days = min(self.returns.shape[1], self.n_days)
+        self._padded_returns = np.zeros((self.n_stocks, self.n_days + 2))
+        clean_returns = self.returns[:, :n_return_days]
+        self._padded_returns[:, 2:n_return_days + 2] = np.where(np.isfinite(clean_returns), clean_returns, 0.0)
+        
         print(f"Portföy ortamı oluşturuldu:")
         print(f"- Hisse senedi sayısı: {self.n_stocks}")
         print(f"- Toplam gün sayısı: {self.n_days}")
@@ -49,8 +60,25 @@ class PortfolioEnvironment:
         self.total_portfolio_value = self.initial_balance
         self.portfolio_history = [self.initial_balance]
         
+        if self.online_metrics is not None:
+            self.online_metrics.reset(self.initial_balance)
+        
         return self.get_state()
     
+    def attach_metrics(self, online_metrics):
+        """
+        Her adımda güncellenecek akan metrik izleyiciyi bağla
+        
+        Args:
+            online_metrics (OnlineMetrics): İzleyici (None ile ayrılır)
+        """
+        self.online_metrics = online_metrics
+        if online_metrics is not None:
+            online_metrics.reset(self.portfolio_history[0])
+            for value in self.portfolio_history[1:]:
+                online_metrics.update(value)
+    
+    @TIMER.timed("env.get_state")
     def get_state(self):
         """
         Mevcut durum vektörünü döndür
@@ -96,6 +124,34 @@ class PortfolioEnvironment:
         
         return state
     
+    def build_states(self, steps, weights):
+        """
+        Adım indeksleri ve portföy ağırlıklarından durum matrisini toplu oluştur
+        
+        get_state() ile aynı durumları, getiri matrisinden tek bir vektörize
+        indeksleme (gather) ile üretir; kompakt rollout buffer'ı için kullanılır.
+        
+        Args:
+            steps (np.array): [N] durumun alındığı current_step değerleri
+            weights (np.array): [N, n_stocks + 1] o andaki portföy ağırlıkları
+            
+        Returns:
+            np.array: [N, state_dim] float32 durumlar
+        """
+        steps = np.asarray(steps, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float32)
+        n_states = len(steps)
+        
+        # [n_stocks, N, 3] pencere -> [N, n_stocks * 3] (hisse başına son 3 gün)
+        window = self._padded_returns[:, np.minimum(steps, self.n_days - 1)[:, None] + np.arange(3)]
+        states = np.empty((n_states, self.n_stocks * 4 + 1), dtype=np.float32)
+        states[:, :self.n_stocks * 3] = window.transpose(1, 0, 2).reshape(n_states, -1)
+        states[:, self.n_stocks * 3:] = np.where(np.isfinite(weights), weights, 0.0)
+        
+        # Terminal durumlar sıfır vektördür
+        states[steps >= self.n_days - 1] = 0.0
+        return states
+    
     def step(self, action):
         """
         Bir adım at
@@ -129,6 +185,8 @@ class PortfolioEnvironment:
         
         # Geçmişi güncelle
         self.portfolio_history.append(current_value)
+        if self.online_metrics is not None:
+            self.online_metrics.update(current_value)
         
         # Terminal kontrolü
         done = self.current_step >= self.n_days - 1
@@ -278,4 +336,168 @@ class PortfolioEnvironment:
             weight_pct = self.portfolio_weights[i] * 100
             summary += f"        {stock_name}: %{weight_pct:.1f}\n"
         
-        return summary 
\ No newline at end of file
+        return summary 
+
+class VectorizedPortfolioEnvironment:
+    """
+    Aynı fiyat verisi üzerinde n_envs bağımsız portföyü birlikte simüle eden ortam
+    
+    Her alt ortam PortfolioEnvironment ile aynı durum, yeniden dengeleme ve
+    ödül dinamiklerine sahiptir; tüm alt ortamlar aynı günde birlikte ilerler
+    ve adımlar NumPy dizi işlemleriyle tek seferde hesaplanır.
+    """
+    
+    def __init__(self, processed_data, n_envs, initial_balance=INITIAL_BALANCE, transaction_cost=TRANSACTION_COST):
+        # Veri yükleme
+        self.prices = processed_data['prices']
+        self.returns = processed_data['returns']
+        self.stock_names = processed_data['stock_names']
+        self.n_stocks = processed_data['n_stocks']
+        self.n_days = processed_data['n_days']
+        self.n_envs = n_envs
+        
+        # Ortam parametreleri
+        self.initial_balance = initial_balance
+        self.transaction_cost = transaction_cost
+        self.state_dim = self.n_stocks * 3 + self.n_stocks + 1
+        
+        # Son 3 günün getirileri için başa iki sıfır sütun eklenmiş getiri matrisi
+        clean_returns = np.where(np.isfinite(self.returns), self.returns, 0.0)
+        self._padded_returns = np.concatenate([np.zeros((self.n_stocks, 2)), clean_returns], axis=1)
+        
+        self.reset()
+    
+    def reset(self):
+        """Tüm alt ortamları başlangıç durumuna sıfırla"""
+        self.current_step = 0
+        self.balance = np.full(self.n_envs, float(self.initial_balance))
+        self.portfolio = np.zeros((self.n_envs, self.n_stocks))
+        self.portfolio_weights = np.zeros((self.n_envs, self.n_stocks + 1))
+        self.portfolio_weights[:, -1] = 1.0
+        
+        self.total_portfolio_value = np.full(self.n_envs, float(self.initial_balance))
+        self._history = np.zeros((self.n_envs, self.n_days))
+        self._history[:, 0] = self.initial_balance
+        self._history_length = 1
+        
+        return self.get_state()
+    
+    @property
+    def portfolio_history(self):
+        """[n_envs, gün] portföy değer geçmişi"""
+        return self._history[:, :self._history_length]
+    
+    def get_state(self):
+        """
+        Tüm alt ortamların durum matrisini döndür
+        
+        Returns:
+            np.array: [n_envs, state_dim] durum matrisi
+        """
+        if self.current_step >= self.n_days - 1:
+            return np.zeros((self.n_envs, self.state_dim), dtype=np.float32)
+        
+        window = self._padded_returns[:, self.current_step:self.current_step + 3].reshape(-1)
+        weights = np.where(np.isfinite(self.portfolio_weights), self.portfolio_weights, 0.0)
+        
+        state = np.empty((self.n_envs, self.state_dim), dtype=np.float32)
+        state[:, :self.n_stocks * 3] = window
+        state[:, self.n_stocks * 3:] = weights
+        return state
+    
+    def step(self, actions):
+        """
+        Tüm alt ortamlarda bir adım at
+        
+        Args:
+            actions (np.array): [n_envs, n_stocks + 1] aksiyon vektörleri
+            
+        Returns:
+            tuple: (next_states, rewards, dones, info)
+        """
+        if self.current_step >= self.n_days - 1:
+            return self.get_state(), np.zeros(self.n_envs), np.ones(self.n_envs, dtype=bool), {}
+        
+        prev_value = self.calculate_portfolio_value()
+        
+        # Softmax normalizasyonu ve yeniden dengeleme
+        actions = np.asarray(actions, dtype=np.float64)
+        exp_actions = np.exp(actions - actions.max(axis=1, keepdims=True))
+        new_weights = exp_actions / exp_actions.sum(axis=1, keepdims=True)
+        self._rebalance_portfolio(new_weights, prev_value)
+        
+        # Bir gün ileri
+        self.current_step += 1
+        current_value = self.calculate_portfolio_value()
+        
+        rewards = self._calculate_reward(prev_value, current_value)
+        
+        self._history[:, self._history_length] = current_value
+        self._history_length += 1
+        
+        done = self.current_step >= self.n_days - 1
+        safe_prev = np.where(prev_value > 0, prev_value, 1.0)
+        info = {
+            'portfolio_value': current_value,
+            'portfolio_weights': self.portfolio_weights.copy(),
+            'daily_return': np.where(prev_value > 0, (current_value - prev_value) / safe_prev, 0.0)
+        }
+        
+        return self.get_state(), rewards, np.full(self.n_envs, done), info
+    
+    @staticmethod
+    def action_vectors(action_indices, action_dim):
+        """Aksiyon indekslerini one-hot aksiyon vektörlerine çevir"""
+        vectors = np.zeros((len(action_indices), action_dim))
+        vectors[np.arange(len(action_indices)), action_indices] = 1.0
+        return vectors
+    
+    def _rebalance_portfolio(self, new_weights, current_value):
+        """Tüm alt portföyleri yeniden dengele"""
+        weight_changes = np.abs(new_weights - self.portfolio_weights).sum(axis=1)
+        transaction_cost_amount = weight_changes * self.transaction_cost * current_value
+        
+        current_prices = self.prices[:, self.current_step]
+        target_values = new_weights[:, :-1] * current_value[:, None]
+        safe_prices = np.where(current_prices > 0, current_prices, 1.0)
+        self.portfolio = np.where(current_prices > 0, target_values / safe_prices, 0.0)
+        
+        self.balance = np.maximum(0, new_weights[:, -1] * current_value - transaction_cost_amount)
+        self.portfolio_weights = new_weights.copy()
+    
+    def calculate_portfolio_value(self):
+        """Tüm alt portföylerin toplam değerini hesapla"""
+        if self.current_step >= self.n_days:
+            return self.total_portfolio_value
+        
+        stock_value = self.portfolio @ self.prices[:, self.current_step]
+        self.total_portfolio_value = stock_value + self.balance
+        return self.total_portfolio_value
+    
+    def _calculate_reward(self, prev_value, current_value):
+        """PortfolioEnvironment._calculate_reward'ın vektörize karşılığı"""
+        safe_prev = np.where(prev_value > 0, prev_value, 1.0)
+        daily_return = np.where(prev_value > 0, (current_value - prev_value) / safe_prev, 0.0)
+        
+        # Risk ayarlı getiri (son VOLATILITY_WINDOW değer üzerinden)
+        risk_adjusted_return = daily_return
+        if self._history_length > VOLATILITY_WINDOW:
+            recent_values = self._history[:, self._history_length - VOLATILITY_WINDOW:self._history_length]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                recent_returns = np.diff(recent_values, axis=1) / recent_values[:, :-1]
+            finite = np.isfinite(recent_returns)
+            count = finite.sum(axis=1)
+            clean = np.where(finite, recent_returns, 0.0)
+            mean = clean.sum(axis=1) / np.maximum(count, 1)
+            volatility = np.sqrt(np.where(finite, (clean - mean[:, None]) ** 2, 0.0).sum(axis=1) / np.maximum(count, 1))
+            risk_adjusted_return = np.where(count > 1, daily_return / (volatility + 1e-8), daily_return)
+        
+        # Çeşitlendirme bonusu
+        non_cash_weights = self.portfolio_weights[:, :-1]
+        diversification_bonus = np.where(non_cash_weights.sum(axis=1) > 0,
+                                         1 - (non_cash_weights ** 2).sum(axis=1), 0.0)
+        
+        reward = daily_return * 150 + risk_adjusted_return * 10 + diversification_bonus * 2
+        reward = np.where(daily_return < MAX_LOSS_THRESHOLD, reward - LOSS_PENALTY, reward)
+        
+        return np.where(np.isfinite(reward), reward, 0.0)
@@ -0,0 +1,344 @@
+"""
+Sınırlı Bellekli Eğitim Geçmişi - Parçalı NumPy dizileri ve diske taşma
+
+Episode ödülleri, portföy değerleri ve kayıp metrikleri Python listeleri
+yerine sabit boyutlu NumPy parçalarında (chunk) tutulur. Bellekte en fazla
+iki parça (önceki + güncel) kalır. Bir taşma (spill) dosyası verildiyse
+dolan parçalar yalnızca sona eklenen ham bir dosyaya yazılır; verilmediyse
+daha eski değerler atılır ve yalnızca özet istatistiklerde yaşar.
+Checkpoint'lere tüm geçmiş yerine özet istatistikler, taşan değer sayısı ve
+son parçalar konur; böylece bellek kullanımı ve checkpoint boyutu eğitim
+uzunluğundan bağımsız kalır.
+
+Checkpoint'lerde taşma dosyasının yolu checkpoint dosyasına göreli
+saklanır (relativize_history_paths / resolve_history_paths). Diskteki
+değerler yalnızca erişildiğinde okunur; taşma dosyası silinmiş veya
+taşınmışsa checkpoint yine yüklenir, özet istatistikler korunur ve eksik
+değerler NaN olarak döner.
+"""
+
+import math
+import os
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+from config import HISTORY_CHUNK_SIZE
+
+
+class ArrayHistory:
+    """
+    Sona ekleme (append) ile büyüyen, parçalı ve tipli sayı dizisi
+
+    Son değerlere (ör. history[-10:]) bellekten, daha eski değerlere taşma
+    dosyasından erişilir (taşma dosyası yoksa NaN döner). np.mean, matplotlib
+    ve pandas doğrudan dizi olarak kullanabilir (__array__).
+    """
+
+    def __init__(self, spill_path=None, chunk_size=HISTORY_CHUNK_SIZE, dtype=np.float64):
+        """
+        Args:
+            spill_path (str): Dolan parçaların eklendiği dosya (None: yalnızca son iki parça tutulur)
+            chunk_size (int): Parça uzunluğu
+            dtype: Değer tipi
+        """
+        self.spill_path = spill_path
+        self.chunk_size = chunk_size
+        self.dtype = np.dtype(dtype)
+        self._chunk = np.empty(chunk_size, dtype=self.dtype)
+        self.clear()
+
+    def clear(self):
+        """Geçmişi boşalt (taşma dosyası bir sonraki yazımda üzerine yazılır)"""
+        self._fill = 0
+        self._spilled = 0
+        self._previous = None
+        self._previous_loaded = True
+        self._stored_summary = None
+        self._count = 0
+        self._sum = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+
+    def __len__(self):
+        return self._spilled + self._fill
+
+    def append(self, value):
+        """Değer ekle (O(1); parça dolduğunda önceki parça olur ve varsa diske eklenir)"""
+        self._chunk[self._fill] = value
+        self._fill += 1
+
+        value = float(value)
+        if math.isfinite(value):
+            self._count += 1
+            self._sum += value
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+
+        if self._fill == self.chunk_size:
+            self._flush_chunk()
+
+    def extend(self, values):
+        """Birden fazla değer ekle"""
+        for value in values:
+            self.append(value)
+
+    def _flush_chunk(self):
+        """Dolan parçayı önceki parça yap; taşma dosyası varsa sonuna yaz"""
+        chunk = self._chunk.copy()
+        if self.spill_path is not None:
+            # Diskteki geçerli uzunluktan itibaren yaz; devam edilen eğitimde
+            # checkpoint sonrasına ait eski değerler böylece kesilir
+            exists = os.path.exists(self.spill_path)
+            if not exists:
+                os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+            with open(self.spill_path, 'r+b' if exists else 'wb') as f:
+                if not exists and self._spilled:
+                    # Kayıp taşma dosyasının yerine eksik değerler NaN olarak yazılır
+                    np.full(self._spilled, np.nan, dtype=self.dtype).tofile(f)
+                f.seek(self._spilled * self.dtype.itemsize)
+                f.write(chunk.tobytes())
+                f.truncate()
+        self._spilled += self.chunk_size
+        self._previous = chunk
+        self._previous_loaded = True
+        self._fill = 0
+
+    @property
+    def spill_available(self):
+        """Diskteki değerler okunabilir mi (taşma yoksa da True)"""
+        return not self._spilled or (self.spill_path is not None and os.path.exists(self.spill_path))
+
+    def _read_spilled(self, start=0, count=None):
+        """Taşma dosyasından [start, start + count) aralığını oku (dosya yoksa NaN)"""
+        count = self._spilled - start if count is None else count
+        if count <= 0:
+            return np.empty(0, dtype=self.dtype)
+        if not self.spill_available:
+            if self.spill_path is None:
+                warnings.warn("Taşma dosyası olmayan geçmişte yalnızca son iki parça tutulur; eski değerler NaN")
+            else:
+                warnings.warn(f"Geçmiş dosyası bulunamadı, eksik değerler NaN: {self.spill_path}")
+            return np.full(count, np.nan, dtype=self.dtype)
+        return np.fromfile(self.spill_path, dtype=self.dtype, count=count,
+                           offset=start * self.dtype.itemsize)
+
+    def _previous_chunk(self):
+        """Bellekteki önceki parça (geri yüklenen geçmişte ilk erişimde diskten okunur)"""
+        if not self._previous_loaded:
+            self._previous = self._read_spilled(max(self._spilled - self.chunk_size, 0))
+            self._previous_loaded = True
+        return self._previous if self._previous is not None else np.empty(0, dtype=self.dtype)
+
+    def _range(self, start, stop):
+        """[start, stop) aralığındaki değerler; yalnızca gereken parçalar okunur / kopyalanır"""
+        previous = self._previous_chunk()
+        memory_start = self._spilled - len(previous)
+        parts = []
+        if start < memory_start:
+            parts.append(self._read_spilled(start, min(stop, memory_start) - start))
+        if start < self._spilled and stop > memory_start:
+            parts.append(previous[max(start - memory_start, 0):min(stop, self._spilled) - memory_start])
+        if stop > self._spilled:
+            parts.append(self._chunk[max(start - self._spilled, 0):stop - self._spilled])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=self.dtype)
+
+    def to_numpy(self):
+        """Tüm geçmişi tek bir dizi olarak döndür"""
+        return self._range(0, len(self))
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.to_numpy()
+        return array if dtype is None else array.astype(dtype)
+
+    def __iter__(self):
+        return iter(self.to_numpy())
+
+    def __getitem__(self, key):
+        length = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(length)
+            if step == 1:
+                return self._range(start, max(stop, start))
+            return self.to_numpy()[key]
+
+        index = key + length if key < 0 else key
+        if not 0 <= index < length:
+            raise IndexError("ArrayHistory index out of range")
+        if index >= self._spilled:
+            return self._chunk[index - self._spilled].item()
+        return self._range(index, index + 1)[0].item()
+
+    def summary(self):
+        """
+        Sonlu değerlerin özet istatistikleri
+
+        Taşma dosyası kayıpsa son değer checkpoint'teki özetten alınır.
+        Özet akan istatistiklerden hesaplanır; taşan değerler okunmaz.
+
+        Returns:
+            dict: count, mean, min, max ve last
+        """
+        if not self._fill and self.spill_path is not None and not self.spill_available \
+                and self._stored_summary is not None:
+            return dict(self._stored_summary, count=self._count)
+        return {
+            'count': self._count,
+            'mean': self._sum / self._count if self._count else math.nan,
+            'min': self._min if self._count else math.nan,
+            'max': self._max if self._count else math.nan,
+            'last': self[-1] if len(self) else math.nan
+        }
+
+    def state_dict(self):
+        """
+        Checkpoint'e yazılacak durum
+
+        Yalnızca özet, taşan değer sayısı ve son parça saklanır (boyut sabit);
+        taşma dosyası yoksa önceki parça da saklanır, çünkü diskten okunamaz.
+
+        Returns:
+            dict: load_state_dict ile geri yüklenebilir durum
+        """
+        state = {
+            'spill_path': os.path.abspath(self.spill_path) if self.spill_path else None,
+            'spilled': self._spilled,
+            'summary': self.summary(),
+            'stats': (self._count, self._sum, self._min, self._max),
+            'values': self._chunk[:self._fill].copy()
+        }
+        if self.spill_path is None and self._spilled:
+            state['previous'] = self._previous_chunk().copy()
+        return state
+
+    def load_state_dict(self, state):
+        """
+        state_dict çıktısından (veya eski formattaki düz listeden) geri yükle
+
+        Args:
+            state (dict | list): Kaydedilmiş durum
+        """
+        self.clear()
+        if not isinstance(state, dict):
+            self.extend(state)
+            return
+
+        if state['spilled']:
+            # Diskteki değerler bu checkpoint'in gördüğü uzunlukla sınırlanır;
+            # dosya ilk erişimde okunur
+            self.spill_path = self.spill_path or state['spill_path']
+            self._spilled = state['spilled']
+            self._previous_loaded = False
+            self._stored_summary = state.get('summary')
+
+        if state.get('previous') is not None:
+            self._previous = np.asarray(state['previous'], dtype=self.dtype).copy()
+            self._previous_loaded = True
+
+        # Eski formatta taşma dosyası olmayan geçmiş tüm değerleri içerir;
+        # dolu parçalar normal akıştaki gibi taşınır
+        pending = np.asarray(state['values'], dtype=self.dtype)
+        full_length = len(pending) - len(pending) % self.chunk_size
+        for start in range(0, full_length, self.chunk_size):
+            self._chunk[:] = pending[start:start + self.chunk_size]
+            self._flush_chunk()
+        pending = pending[full_length:]
+        self._chunk[:len(pending)] = pending
+        self._fill = len(pending)
+        self._count, self._sum, self._min, self._max = state['stats']
+
+
+def is_history_state(value):
+    """Değer bir ArrayHistory.state_dict çıktısı mı"""
+    return isinstance(value, dict) and {'spill_path', 'spilled', 'stats', 'values'} <= value.keys()
+
+
+def relativize_history_paths(obj, base_dir):
+    """
+    İç içe checkpoint yapısındaki geçmiş durumlarının taşma yollarını base_dir'e göreli yap
+
+    Girdi değiştirilmez; sözlük ve listeler yeniden oluşturulur, diğer
+    değerler (tensörler, diziler) paylaşılır.
+
+    Args:
+        obj: Checkpoint (sözlük / liste / demet içeren yapı)
+        base_dir (str): Checkpoint dosyasının dizini
+
+    Returns:
+        Göreli yollu kopya
+    """
+    if is_history_state(obj):
+        if obj['spill_path'] is None:
+            return obj
+        return dict(obj, spill_path=os.path.relpath(obj['spill_path'], base_dir))
+    if isinstance(obj, dict):
+        return {key: relativize_history_paths(value, base_dir) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(relativize_history_paths(value, base_dir) for value in obj)
+    return obj
+
+
+def resolve_history_paths(obj, base_dir):
+    """
+    Yüklenen checkpoint'teki göreli taşma yollarını base_dir'e göre çöz (yerinde)
+
+    Args:
+        obj: load edilmiş checkpoint yapısı
+        base_dir (str): Checkpoint dosyasının dizini
+
+    Returns:
+        Aynı nesne
+    """
+    if is_history_state(obj):
+        if obj['spill_path'] is not None and not os.path.isabs(obj['spill_path']):
+            obj['spill_path'] = os.path.normpath(os.path.join(base_dir, obj['spill_path']))
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            resolve_history_paths(value, base_dir)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            resolve_history_paths(value, base_dir)
+    return obj
+
+
+def new_history_dir(checkpoint_path):
+    """
+    Koşuya özel geçmiş dizini yolu (<checkpoint>_history/<zaman damgası>)
+
+    Her koşu kendi dizinine yazar; böylece yeni bir koşu, eski checkpoint'lerin
+    işaret ettiği taşma dosyalarının üzerine yazmaz.
+
+    Args:
+        checkpoint_path (str): Devam ettirilebilir checkpoint yolu
+
+    Returns:
+        str: Henüz var olmayan dizin yolu
+    """
+    base = os.path.join(f"{os.path.splitext(checkpoint_path)[0]}_history",
+                        datetime.now().strftime('%Y%m%d_%H%M%S'))
+    directory, suffix = base, 1
+    while os.path.exists(directory):
+        directory = f"{base}_{suffix}"
+        suffix += 1
+    return directory
+
+
+def create_histories(names, directory=None, chunk_size=HISTORY_CHUNK_SIZE):
+    """
+    Aynı dizine taşan, isimli geçmişler oluştur
+
+    Args:
+        names (list): Geçmiş adları
+        directory (str): Taşma dosyalarının dizini (None: yalnızca bellek)
+        chunk_size (int): Parça uzunluğu
+
+    Returns:
+        dict: Ad -> ArrayHistory
+    """
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    return {
+        name: ArrayHistory(os.path.join(directory, f"{name}.bin") if directory else None, chunk_size)
+        for name in names
+    }
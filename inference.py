@@ -0,0 +1,432 @@
+"""
+Çıkarım (Inference) Araçları - PPONetwork için optimize edilmiş dağıtım yolu
+"""
+
+import io
+import os
+import time
+import warnings
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from checkpoint import load_inference_network
+
+
+class InferencePPONetwork(nn.Module):
+    """
+    PPONetwork'ün yalnızca çıkarım için sadeleştirilmiş kopyası
+
+    Dropout katmanları (eval modunda birim dönüşüm) çıkarılır ve girdi boyut
+    kontrolü yapılmaz; girdi her zaman [batch, state_dim] olmalıdır.
+    """
+
+    def __init__(self, network):
+        super(InferencePPONetwork, self).__init__()
+
+        self.state_dim = network.state_dim
+        self.action_dim = network.action_dim
+        self.hidden_dim = network.hidden_dim
+
+        # Dropout'suz paylaşılan katmanlar (Linear + ReLU blokları)
+        shared_linears = [layer for layer in network.shared_layers if isinstance(layer, nn.Linear)]
+        shared_blocks = []
+        for linear in shared_linears:
+            shared_blocks.extend([_copy_linear(linear), nn.ReLU()])
+        self.shared_layers = nn.Sequential(*shared_blocks)
+
+        self.actor_head = nn.Sequential(*[_copy_module(layer) for layer in network.actor_head])
+        self.critic_head = nn.Sequential(*[_copy_module(layer) for layer in network.critic_head])
+
+        self.eval()
+
+    def forward(self, state):
+        """
+        İleri yayılım (boyut kontrolü yok)
+
+        Args:
+            state (torch.Tensor): [batch, state_dim] durum matrisi
+
+        Returns:
+            tuple: (action_logits, state_value)
+        """
+        shared_features = self.shared_layers(state)
+        action_logits = self.actor_head(shared_features)
+        state_value = self.critic_head(shared_features)
+        return action_logits, state_value.squeeze(-1)
+
+
+def _copy_linear(linear):
+    """Linear katmanın gradyansız kopyasını oluştur"""
+    copied = nn.Linear(linear.in_features, linear.out_features)
+    with torch.no_grad():
+        copied.weight.copy_(linear.weight)
+        copied.bias.copy_(linear.bias)
+    return copied
+
+
+def _copy_module(layer):
+    """Aktör/kritik kafasındaki katmanları kopyala"""
+    if isinstance(layer, nn.Linear):
+        return _copy_linear(layer)
+    return layer.__class__()
+
+
+def export_torchscript(network, filepath=None):
+    """
+    PPONetwork'ü dondurulmuş TorchScript çıkarım modeline dönüştür
+
+    Eval modunda dropout çıkarılır, model trace edilir, ardından
+    torch.jit.freeze ve optimize_for_inference ile Linear+ReLU
+    blokları birleştirilir (CPU'da mkldnn/fusion geçişleri).
+
+    Args:
+        network (PPONetwork): Kaynak ağ
+        filepath (str): Kaydedilecek dosya yolu (opsiyonel)
+
+    Returns:
+        torch.jit.ScriptModule: Optimize edilmiş model
+    """
+    inference_network = InferencePPONetwork(network)
+    example_input = torch.zeros(1, network.state_dim)
+
+    with warnings.catch_warnings():
+        # Yeni PyTorch sürümleri TorchScript için FutureWarning üretir
+        warnings.simplefilter("ignore", FutureWarning)
+        with torch.no_grad():
+            traced = torch.jit.trace(inference_network, example_input)
+        frozen = torch.jit.freeze(traced)
+        optimized = torch.jit.optimize_for_inference(frozen)
+
+    if filepath is not None:
+        torch.jit.save(optimized, filepath)
+        print(f"Çıkarım modeli kaydedildi: {filepath}")
+
+    return optimized
+
+
+def load_torchscript(filepath):
+    """
+    Kaydedilmiş TorchScript çıkarım modelini yükle
+
+    Args:
+        filepath (str): Model dosya yolu
+
+    Returns:
+        torch.jit.ScriptModule: Yüklenen model
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        model = torch.jit.load(filepath, map_location='cpu')
+    model.eval()
+    return model
+
+
+def compile_inference_network(network, mode="reduce-overhead"):
+    """
+    torch.compile ile bellek içi çıkarım modeli oluştur
+
+    Derleme ilk çağrıda yapılır ve C derleyicisi gerektirir; diske
+    yazılabilir bir artefakt için export_torchscript kullanın.
+
+    Args:
+        network (PPONetwork): Kaynak ağ
+        mode (str): torch.compile modu
+
+    Returns:
+        callable: Derlenmiş model
+    """
+    if not hasattr(torch, 'compile'):
+        raise RuntimeError("torch.compile bu PyTorch sürümünde mevcut değil")
+    return torch.compile(InferencePPONetwork(network), mode=mode)
+
+
+def _time_calls(model, inputs, n_iters, warmup=20):
+    """Model çağrısı başına ortalama süreyi mikrosaniye cinsinden ölç"""
+    with torch.no_grad():
+        for _ in range(warmup):
+            model(inputs)
+        start = time.perf_counter()
+        for _ in range(n_iters):
+            model(inputs)
+        elapsed = time.perf_counter() - start
+    return elapsed / n_iters * 1e6
+
+
+def benchmark_inference_latency(network, optimized_model=None, batch_size=256, n_iters=1000):
+    """
+    Eager ve optimize edilmiş model gecikmelerini karşılaştır
+
+    Args:
+        network (PPONetwork): Eager mod ağı
+        optimized_model: Optimize edilmiş model (None ise TorchScript oluşturulur)
+        batch_size (int): Toplu çağrı boyutu
+        n_iters (int): Ölçüm tekrar sayısı
+
+    Returns:
+        dict: Tekil ve toplu çağrı gecikmeleri (mikrosaniye) ve eager eval moduna göre hızlanma
+    """
+    if optimized_model is None:
+        optimized_model = export_torchscript(network)
+
+    single_state = torch.randn(1, network.state_dim)
+    batch_states = torch.randn(batch_size, network.state_dim)
+
+    was_training = network.training
+    results = {}
+
+    # select_action'ın eğitim modundaki (dropout açık) eager çağrısı
+    network.train()
+    results['eager_train_single_us'] = _time_calls(network, single_state, n_iters)
+    results['eager_train_batch_us'] = _time_calls(network, batch_states, n_iters)
+
+    network.eval()
+    results['eager_eval_single_us'] = _time_calls(network, single_state, n_iters)
+    results['eager_eval_batch_us'] = _time_calls(network, batch_states, n_iters)
+
+    results['optimized_single_us'] = _time_calls(optimized_model, single_state, n_iters)
+    results['optimized_batch_us'] = _time_calls(optimized_model, batch_states, n_iters)
+
+    network.train(was_training)
+
+    # Hızlanma, aynı hesaplamayı yapan eager eval() moduna göre ölçülür
+    results['single_speedup'] = results['eager_eval_single_us'] / results['optimized_single_us']
+    results['batch_speedup'] = results['eager_eval_batch_us'] / results['optimized_batch_us']
+    results['batch_size'] = batch_size
+
+    return results
+
+
+def print_latency_report(results):
+    """Gecikme karşılaştırma raporunu yazdır"""
+    print("\n" + "=" * 60)
+    print("              ÇIKARIM GECİKMESİ KARŞILAŞTIRMASI")
+    print("=" * 60)
+    print(f"{'Mod':<25} {'Tekil (µs)':<15} {'Toplu ' + str(results['batch_size']) + ' (µs)':<15}")
+    print("-" * 60)
+    print(f"{'Eager (train)':<25} {results['eager_train_single_us']:<15.1f} {results['eager_train_batch_us']:<15.1f}")
+    print(f"{'Eager (eval)':<25} {results['eager_eval_single_us']:<15.1f} {results['eager_eval_batch_us']:<15.1f}")
+    print(f"{'Optimize':<25} {results['optimized_single_us']:<15.1f} {results['optimized_batch_us']:<15.1f}")
+    print("-" * 60)
+    print(f"Hızlanma (eager eval'e göre) - Tekil: {results['single_speedup']:.2f}x | "
+          f"Toplu: {results['batch_speedup']:.2f}x")
+    print("=" * 60)
+
+
+def _quantize_dynamic():
+    """PyTorch sürümüne göre quantize_dynamic fonksiyonunu döndür"""
+    try:
+        from torch.ao.quantization import quantize_dynamic
+    except ImportError:
+        from torch.quantization import quantize_dynamic
+    return quantize_dynamic
+
+
+def quantize_dynamic_int8(network):
+    """
+    PPONetwork'ün dinamik int8 kuantize edilmiş çıkarım kopyasını oluştur
+
+    Linear ağırlıkları int8 olarak saklanır, aktivasyonlar çağrı anında
+    kuantize edilir. Optimizer durumu ve policy_old kopyası taşınmaz.
+
+    Args:
+        network (PPONetwork): Kaynak ağ
+
+    Returns:
+        nn.Module: Kuantize edilmiş model
+    """
+    quantize_dynamic = _quantize_dynamic()
+    return quantize_dynamic(InferencePPONetwork(network), {nn.Linear}, dtype=torch.qint8)
+
+
+def export_quantized_torchscript(network, filepath=None):
+    """
+    Dinamik int8 kuantize modeli TorchScript olarak dışa aktar
+
+    Args:
+        network (PPONetwork): Kaynak ağ
+        filepath (str): Kaydedilecek dosya yolu (opsiyonel)
+
+    Returns:
+        torch.jit.ScriptModule: Kuantize edilmiş model
+    """
+    quantized = quantize_dynamic_int8(network)
+    example_input = torch.zeros(1, network.state_dim)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        with torch.no_grad():
+            traced = torch.jit.trace(quantized, example_input)
+        frozen = torch.jit.freeze(traced)
+
+    if filepath is not None:
+        torch.jit.save(frozen, filepath)
+        print(f"Int8 çıkarım modeli kaydedildi: {filepath}")
+
+    return frozen
+
+
+def model_size_bytes(model):
+    """Modelin serileştirilmiş ağırlık boyutunu bayt cinsinden döndür"""
+    buffer = io.BytesIO()
+    if isinstance(model, torch.jit.ScriptModule):
+        torch.jit.save(model, buffer)
+    else:
+        torch.save(model.state_dict(), buffer)
+    return len(buffer.getvalue())
+
+
+def collect_states(env, agent, n_episodes=1, training=True):
+    """
+    Ortamda agent'ı çalıştırarak durum kümesi topla
+
+    Args:
+        env: Portföy ortamı
+        agent: PPO agent
+        n_episodes (int): Episode sayısı
+        training (bool): Stokastik aksiyon seçimi kullanılsın mı
+
+    Returns:
+        torch.Tensor: [n_states, state_dim] durum matrisi
+    """
+    states = []
+    for _ in range(n_episodes):
+        state = env.reset()
+        done = False
+        while not done:
+            states.append(state)
+            action_idx, _, _ = agent.select_action(state, training=training)
+            action_vector = np.zeros(agent.action_dim)
+            action_vector[action_idx] = 1.0
+            state, _, done, _ = env.step(action_vector)
+
+    return torch.from_numpy(np.array(states, dtype=np.float32))
+
+
+def evaluate_quantization(network, quantized_model, states, n_iters=500):
+    """
+    Int8 modelin fp32 modele uyumunu, boyutunu ve gecikmesini ölç
+
+    Args:
+        network (PPONetwork): fp32 referans ağ
+        quantized_model: Kuantize edilmiş model
+        states (torch.Tensor): Ayrılmış (held-out) durum kümesi
+        n_iters (int): Gecikme ölçümü tekrar sayısı
+
+    Returns:
+        dict: Uyum, bellek ve gecikme metrikleri
+    """
+    was_training = network.training
+    network.eval()
+
+    with torch.no_grad():
+        fp32_logits, fp32_values = network(states)
+        int8_logits, int8_values = quantized_model(states)
+
+    fp32_probs = torch.softmax(fp32_logits, dim=-1)
+    int8_probs = torch.softmax(int8_logits, dim=-1)
+    prob_drift = (fp32_probs - int8_probs).abs()
+
+    report = {
+        'n_states': states.shape[0],
+        'argmax_match_rate': (fp32_probs.argmax(-1) == int8_probs.argmax(-1)).float().mean().item(),
+        'mean_prob_drift': prob_drift.mean().item(),
+        'max_prob_drift': prob_drift.max().item(),
+        'max_value_drift': (fp32_values - int8_values).abs().max().item(),
+        'fp32_size_bytes': model_size_bytes(network),
+        'int8_size_bytes': model_size_bytes(quantized_model),
+        'fp32_single_us': _time_calls(network, states[:1], n_iters),
+        'int8_single_us': _time_calls(quantized_model, states[:1], n_iters),
+        'fp32_batch_us': _time_calls(network, states, n_iters),
+        'int8_batch_us': _time_calls(quantized_model, states, n_iters),
+    }
+    report['size_ratio'] = report['fp32_size_bytes'] / report['int8_size_bytes']
+
+    network.train(was_training)
+    return report
+
+
+def print_quantization_report(report):
+    """Int8 kuantizasyon raporunu yazdır"""
+    print("\n" + "=" * 60)
+    print("                INT8 KUANTİZASYON RAPORU")
+    print("=" * 60)
+    print(f"Durum Sayısı:            {report['n_states']}")
+    print(f"Argmax Eşleşme Oranı:    %{report['argmax_match_rate'] * 100:.2f}")
+    print(f"Ortalama Olasılık Farkı: {report['mean_prob_drift']:.2e}")
+    print(f"Maksimum Olasılık Farkı: {report['max_prob_drift']:.2e}")
+    print(f"Maksimum Değer Farkı:    {report['max_value_drift']:.2e}")
+    print("-" * 60)
+    print(f"fp32 Boyut: {report['fp32_size_bytes'] / 1024:.1f} KB | "
+          f"int8 Boyut: {report['int8_size_bytes'] / 1024:.1f} KB ({report['size_ratio']:.2f}x)")
+    print(f"Tekil Gecikme - fp32: {report['fp32_single_us']:.1f} µs | int8: {report['int8_single_us']:.1f} µs")
+    print(f"Toplu Gecikme - fp32: {report['fp32_batch_us']:.1f} µs | int8: {report['int8_batch_us']:.1f} µs")
+    print("=" * 60)
+
+
+def _held_out_states(network, validation_split=None):
+    """
+    Eğitimde kullanılmayan son günlerden durum kümesi hazırla
+
+    Eğitimle aynı veri indirilir ve main.py'deki gibi son VALIDATION_SPLIT
+    oranındaki günler (doğrulama penceresi) kullanılır.
+
+    Args:
+        network (PPONetwork): Durumları toplayacak politika
+        validation_split (float): Ayrılan son günlerin oranı (None ise config)
+
+    Returns:
+        torch.Tensor: [n_states, state_dim] durum matrisi
+    """
+    from data_manager import DataManager
+    from environment import PortfolioEnvironment
+    from agents import PPOAgent
+    from config import STOCK_SYMBOLS, DATA_PERIOD, VALIDATION_SPLIT
+
+    validation_split = VALIDATION_SPLIT if validation_split is None else validation_split
+    if validation_split <= 0:
+        raise ValueError("Eğitim dışı durum kümesi için model VALIDATION_SPLIT > 0 ile eğitilmiş olmalı "
+                         "(VALIDATION_SPLIT = 0 iken tüm günler eğitimde kullanılır)")
+
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, DATA_PERIOD)
+    if len(raw_data) + 1 != network.action_dim:
+        raise RuntimeError(f"{len(raw_data)} hisse verisi indirildi, model {network.action_dim - 1} hisse bekliyor")
+
+    processed_data = data_manager.process_data(raw_data)
+    split_day = int(processed_data['n_days'] * (1 - validation_split))
+    env = PortfolioEnvironment(data_manager.slice_data(processed_data, split_day, processed_data['n_days']))
+    agent = PPOAgent(network.state_dim, network.action_dim)
+    agent.policy_old.load_state_dict(network.state_dict())
+    return collect_states(env, agent, n_episodes=2)
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    model_path = args[0] if args else "best_portfolio_agent.pt"
+    network = load_inference_network(model_path)
+
+    if "--int8" in sys.argv:
+        print("⚡ Int8 çıkarım modeli oluşturuluyor...")
+        quantized = export_quantized_torchscript(network, os.path.splitext(model_path)[0] + "_int8.ts")
+        print_quantization_report(evaluate_quantization(network, quantized, _held_out_states(network)))
+        sys.exit(0)
+
+    output_path = os.path.splitext(model_path)[0] + "_inference.ts"
+
+    print("⚡ TorchScript çıkarım modeli oluşturuluyor...")
+    optimized = export_torchscript(network, output_path)
+
+    # Çıktı tutarlılığı kontrolü
+    network.eval()
+    check_states = torch.randn(64, network.state_dim)
+    with torch.no_grad():
+        eager_logits, eager_values = network(check_states)
+        opt_logits, opt_values = optimized(check_states)
+    print(f"Maksimum logit farkı: {(eager_logits - opt_logits).abs().max().item():.2e}")
+    print(f"Maksimum değer farkı: {(eager_values - opt_values).abs().max().item():.2e}")
+
+    print_latency_report(benchmark_inference_latency(network, optimized))
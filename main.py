@@ -2,6 +2,8 @@
 Ana Eğitim Dosyası - PPO Portföy Yönetimi
 """
 
+import os
+import time
 import numpy as np
 import warnings
 from tqdm import tqdm
@@ -12,15 +14,27 @@ import config
 from data_manager import DataManager
 from environment import PortfolioEnvironment
 from agents import PPOAgent
+from checkpoint import (AsyncCheckpointWriter, checkpoint_exists, create_resume_snapshot, load_resume_checkpoint,
+                        restore_resume_checkpoint)
 from utils import PerformanceAnalyzer, setup_plotting, save_results, print_system_info
+from validation import BackgroundValidator
+from history import create_histories, new_history_dir
+from timing import TIMER
+from profiler import TrainingProfiler, profile_region
+from metrics_server import MetricsServer
+from bootstrap import bootstrap_metrics, print_bootstrap_report
+from monte_carlo import monte_carlo_rollouts, summarize_monte_carlo, print_monte_carlo_report
 
 warnings.filterwarnings('ignore')
 
 
-def train_portfolio_agent():
+def train_portfolio_agent(resume_path=None):
     """
     Ana eğitim fonksiyonu
     
+    Args:
+        resume_path (str): Devam ettirilecek checkpoint yolu (opsiyonel)
+    
     Returns:
         tuple: (trained_agent, environment, results)
     """
@@ -30,11 +44,26 @@ def train_portfolio_agent():
     # Matplotlib ayarlarını yap
     setup_plotting()
     
+    # Devam ettirilecek checkpoint varsa oku
+    checkpoint_path = resume_path or config.RESUME_CHECKPOINT_PATH
+    resume_checkpoint = None
+    if resume_path is not None:
+        if checkpoint_exists(resume_path):
+            resume_checkpoint = load_resume_checkpoint(resume_path)
+            print(f"\n♻️  Eğitim devam ettiriliyor: {resume_path} "
+                  f"(episode {resume_checkpoint['loop_state']['next_episode']})")
+        else:
+            print(f"\n⚠️  Checkpoint bulunamadı, eğitim sıfırdan başlıyor: {resume_path}")
+    
     # Veri yöneticisi oluştur
     data_manager = DataManager()
     
-    print(f"\n{STOCK_SYMBOLS} hisse senetleri için veri indiriliyor...")
-    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, DATA_PERIOD)
+    if resume_checkpoint is not None:
+        # Aynı ortamda devam etmek için checkpoint'teki veriyi kullan
+        raw_data = resume_checkpoint['loop_state']['raw_data']
+    else:
+        print(f"\n{STOCK_SYMBOLS} hisse senetleri için veri indiriliyor...")
+        raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, DATA_PERIOD)
     
     if len(raw_data) < 2:
         print("❌ Yeterli veri bulunamadı!")
@@ -46,6 +75,15 @@ def train_portfolio_agent():
     processed_data = data_manager.process_data(raw_data)
     print(data_manager.get_data_summary())
     
+    # Son günleri eğitimde kullanılmayan doğrulama penceresi olarak ayır
+    validation_data = None
+    if config.VALIDATION_SPLIT > 0:
+        split_day = int(processed_data['n_days'] * (1 - config.VALIDATION_SPLIT))
+        validation_data = data_manager.slice_data(processed_data, split_day, processed_data['n_days'])
+        processed_data = data_manager.slice_data(processed_data, 0, split_day)
+        print(f"🔍 Doğrulama penceresi: son {validation_data['n_days']} gün "
+              f"(eğitim: {processed_data['n_days']} gün)")
+    
     # Ortamı oluştur
     env = PortfolioEnvironment(processed_data)
     
@@ -61,73 +99,215 @@ def train_portfolio_agent():
     # Agent'ı oluştur
     agent = PPOAgent(state_dim, action_dim)
     
+    # Buffer'da durumlar yerine adım indeksi + ağırlıklar saklanır
+    if config.COMPACT_ROLLOUTS:
+        agent.enable_compact_rollouts(env)
+    
     # Performans analiz aracı
     analyzer = PerformanceAnalyzer()
     
+    # En iyi model kayıtlarını arka planda yapan yazıcı
+    checkpoint_writer = AsyncCheckpointWriter(min_interval=config.CHECKPOINT_MIN_INTERVAL)
+    
+    # Doğrulama açıksa en iyi model doğrulama metriğine göre seçilir
+    validator = BackgroundValidator(validation_data) if validation_data is not None else None
+    
+    # Eğitim geçmişleri checkpoint'in yanındaki, koşuya özel dizine taşar; checkpoint'ler
+    # sabit boyutta kalır. Devam edilen koşu checkpoint'in dizinine yazmaya devam eder
+    # (silinmişse yeniden oluşturulur); yeni dizin yalnızca sıfırdan başlayan koşuda açılır
+    history_dir = None
+    if resume_checkpoint is not None:
+        previous_state = resume_checkpoint['loop_state']['episode_rewards']
+        if isinstance(previous_state, dict) and previous_state['spill_path'] is not None:
+            history_dir = os.path.dirname(previous_state['spill_path'])
+    if history_dir is None:
+        history_dir = new_history_dir(checkpoint_path)
+    agent.attach_history_dir(history_dir)
+    histories = create_histories(['episode_rewards', 'episode_portfolio_values'], history_dir)
+    episode_rewards = histories['episode_rewards']
+    episode_portfolio_values = histories['episode_portfolio_values']
+    
     # Eğitim döngüsü
-    episode_rewards = []
-    episode_portfolio_values = []
     best_portfolio_value = 0
+    start_episode = 0
+    
+    if resume_checkpoint is not None:
+        loop_state = restore_resume_checkpoint(agent, resume_checkpoint)
+        start_episode = loop_state['next_episode']
+        episode_rewards.load_state_dict(loop_state['episode_rewards'])
+        episode_portfolio_values.load_state_dict(loop_state['episode_portfolio_values'])
+        best_portfolio_value = loop_state['best_portfolio_value']
+        if validator is not None:
+            if loop_state.get('validator_state') is not None:
+                validator.load_state_dict(loop_state['validator_state'])
+            else:
+                # Eski checkpoint'lerde yalnızca en iyi skor saklanır
+                validator.best_score = loop_state.get('best_validation_score')
+    
+    # Faz zamanlayıcısı (kapalıyken ölçüm yapılmaz)
+    if config.TIMING_ENABLED:
+        TIMER.enable()
+    else:
+        TIMER.disable()
+    TIMER.reset()
+    
+    # İsteğe bağlı torch.profiler pencereleri (güncelleme + PROFILE_ROLLOUT_STEPS ortam adımı)
+    profiler = TrainingProfiler() if config.PROFILE_ENABLED else None
+    if profiler is not None:
+        profiler.start()
+    
+    # İsteğe bağlı canlı metrik uç noktası (Prometheus formatı)
+    metrics_server = MetricsServer(port=config.METRICS_PORT).start() if config.METRICS_PORT is not None else None
     
     print(f"\n🎯 Eğitim başlıyor...")
     print("="*60)
     
-    for episode in tqdm(range(config.NUM_EPISODES), desc="Eğitim"):
-        # Episode başlangıcı
-        state = env.reset()
-        episode_reward = 0
-        done = False
-        step_count = 0
-        
-        # Episode döngüsü
-        while not done:
-            # Aksiyon seç
-            action_idx, log_prob, value = agent.select_action(state, training=True)
+    validation_history = []
+    try:
+        for episode in tqdm(range(start_episode, config.NUM_EPISODES), desc="Eğitim",
+                            initial=start_episode, total=config.NUM_EPISODES):
+            # Episode başlangıcı
+            state = env.reset()
+            episode_reward = 0
+            done = False
+            step_count = 0
+            episode_start = time.perf_counter()
             
-            # Aksiyon vektörünü oluştur
-            action_vector = np.zeros(action_dim)
-            action_vector[action_idx] = 1.0
+            # Episode döngüsü
+            while not done:
+                # Aksiyon seç
+                with TIMER.phase("select_action"):
+                    action_idx, log_prob, value = agent.select_action(state, training=True)
+                
+                # Aksiyon vektörünü oluştur
+                action_vector = np.zeros(action_dim)
+                action_vector[action_idx] = 1.0
+                
+                # Adım at
+                step = env.current_step
+                with TIMER.phase("env.step"), profile_region("env.step"):
+                    next_state, reward, done, info = env.step(action_vector)
+                if profiler is not None:
+                    profiler.rollout_step()
+                
+                # Deneyimi kaydet
+                with TIMER.phase("store_transition"):
+                    agent.store_transition(state, action_idx, reward, log_prob, value, done, step=step)
+                
+                # Durumu güncelle
+                state = next_state
+                episode_reward += reward
+                step_count += 1
             
-            # Adım at
-            next_state, reward, done, info = env.step(action_vector)
+            TIMER.count("steps", step_count)
+            TIMER.count("episodes")
             
-            # Deneyimi kaydet
-            agent.store_transition(state, action_idx, reward, log_prob, value, done)
+            # Episode sonuçlarını kaydet
+            final_portfolio_value = env.portfolio_history[-1]
+            episode_rewards.append(episode_reward)
+            episode_portfolio_values.append(final_portfolio_value)
             
-            # Durumu güncelle
-            state = next_state
-            episode_reward += reward
-            step_count += 1
-        
-        # Episode sonuçlarını kaydet
-        final_portfolio_value = env.portfolio_history[-1]
-        episode_rewards.append(episode_reward)
-        episode_portfolio_values.append(final_portfolio_value)
-        
-        # En iyi modeli kaydet
-        if final_portfolio_value > best_portfolio_value:
-            best_portfolio_value = final_portfolio_value
-            agent.save_agent("best_portfolio_agent.pt")
-        
-        # Belirli aralıklarla güncelle
-        if (episode + 1) % config.UPDATE_FREQUENCY == 0:
-            update_metrics = agent.update()
-        
-        # İlerleme raporu
-        if (episode + 1) % config.REPORT_FREQUENCY == 0:
-            avg_reward = np.mean(episode_rewards[-config.REPORT_FREQUENCY:])
-            avg_portfolio_value = np.mean(episode_portfolio_values[-config.REPORT_FREQUENCY:])
-            total_return = (avg_portfolio_value / INITIAL_BALANCE - 1) * 100
+            # En iyi modeli kaydet (doğrulama kapalıysa eğitim değerine göre)
+            if final_portfolio_value > best_portfolio_value:
+                best_portfolio_value = final_portfolio_value
+                if validator is None:
+                    with TIMER.phase("checkpoint"):
+                        checkpoint_writer.submit(agent, "best_portfolio_agent.pt", split=True)
             
-            print(f"\n📈 Episode {episode + 1}/{config.NUM_EPISODES}")
-            print(f"   Ortalama Ödül (son {config.REPORT_FREQUENCY}): {avg_reward:.2f}")
-            print(f"   Ortalama Portföy Değeri: ${avg_portfolio_value:,.2f}")
-            print(f"   Getiri: %{total_return:.2f}")
+            if metrics_server is not None:
+                metrics_server.metrics.record_episode(episode + 1, episode_reward, final_portfolio_value,
+                                                      best_portfolio_value, step_count,
+                                                      time.perf_counter() - episode_start)
             
-            if agent.training_metrics['total_losses']:
-                print(f"   Son Total Loss: {agent.training_metrics['total_losses'][-1]:.4f}")
+            # Belirli aralıklarla güncelle
+            if (episode + 1) % config.UPDATE_FREQUENCY == 0:
+                update_start = time.perf_counter()
+                if profiler is not None:
+                    profiler.begin_update()
+                with TIMER.phase("update"):
+                    update_metrics = agent.update()
+                TIMER.count("updates")
+                if metrics_server is not None:
+                    metrics_server.metrics.record_update(update_metrics, time.perf_counter() - update_start)
+                if profiler is not None:
+                    profiler.step()
+                
+                # Güncel politikayı arka planda doğrula
+                update_count = (episode + 1) // config.UPDATE_FREQUENCY
+                if validator is not None and update_count % config.VALIDATION_FREQUENCY == 0:
+                    with TIMER.phase("validation"):
+                        validator.submit(agent, episode + 1)
             
-            print("-" * 50)
+            # Biten doğrulamaları topla (bloklamaz)
+            if validator is not None:
+                with TIMER.phase("validation"):
+                    save_validation_best(validator.poll(), checkpoint_writer)
+            
+            # İlerleme raporu
+            if (episode + 1) % config.REPORT_FREQUENCY == 0:
+                avg_reward = np.mean(episode_rewards[-config.REPORT_FREQUENCY:])
+                avg_portfolio_value = np.mean(episode_portfolio_values[-config.REPORT_FREQUENCY:])
+                total_return = (avg_portfolio_value / INITIAL_BALANCE - 1) * 100
+                
+                print(f"\n📈 Episode {episode + 1}/{config.NUM_EPISODES}")
+                print(f"   Ortalama Ödül (son {config.REPORT_FREQUENCY}): {avg_reward:.2f}")
+                print(f"   Ortalama Portföy Değeri: ${avg_portfolio_value:,.2f}")
+                print(f"   Getiri: %{total_return:.2f}")
+                
+                if agent.training_metrics['total_losses']:
+                    print(f"   Son Total Loss: {agent.training_metrics['total_losses'][-1]:.4f}")
+                
+                if validator is not None and validator.history:
+                    last_validation = validator.history[-1]
+                    print(f"   Doğrulama ({config.VALIDATION_METRIC}, episode {last_validation['episode']}): "
+                          f"{last_validation[config.VALIDATION_METRIC]:.3f} | en iyi: {validator.best_score:.3f}")
+                
+                if TIMER.enabled:
+                    TIMER.report()
+                
+                print("-" * 50)
+            
+            # Devam ettirilebilir checkpoint (arka planda yazılır)
+            if (episode + 1) % config.CHECKPOINT_FREQUENCY == 0:
+                with TIMER.phase("checkpoint"):
+                    checkpoint_writer.submit_snapshot(create_resume_snapshot(
+                        agent,
+                        next_episode=episode + 1,
+                        best_portfolio_value=best_portfolio_value,
+                        episode_rewards=episode_rewards.state_dict(),
+                        episode_portfolio_values=episode_portfolio_values.state_dict(),
+                        validator_state=validator.state_dict() if validator is not None else None,
+                        raw_data=raw_data
+                    ), checkpoint_path)
+            
+            # Doğrulama metriği iyileşmiyorsa erken durdur
+            if validator is not None and validator.should_stop:
+                print(f"\n⏹️  Erken durdurma: son {validator.patience} doğrulamada iyileşme yok "
+                      f"(en iyi episode {validator.best_episode})")
+                break
+        
+        # Final politikayı da doğrula (doğrulama zamanına denk gelmediyse), bekleyenleri tamamla.
+        # Kısa eğitimlerde best_portfolio_agent.pt böylece her zaman yazılır
+        if validator is not None:
+            if validator.last_submitted_episode != len(episode_rewards):
+                validator.submit(agent, len(episode_rewards))
+            save_validation_best(validator.close(), checkpoint_writer)
+            validation_history = validator.history
+            if validator.best_episode is not None:
+                print(f"🔍 En iyi doğrulama {config.VALIDATION_METRIC}: {validator.best_score:.3f} "
+                      f"(episode {validator.best_episode})")
+    finally:
+        # Hata veya KeyboardInterrupt durumunda da bekleyen checkpoint kayıtlarını yaz
+        # ve arka plan kaynaklarını (doğrulama süreçleri, profilleyici, metrik sunucusu) kapat
+        if profiler is not None:
+            profiler.stop()
+        if metrics_server is not None:
+            metrics_server.stop()
+        if validator is not None:
+            validator.close(wait=False)
+        checkpoint_writer.close()
+    print(f"💾 En iyi model kaydı: {checkpoint_writer.writes} yazım, "
+          f"{checkpoint_writer.coalesced} birleştirilmiş istek")
     
     print("\n✅ Eğitim tamamlandı!")
     
@@ -164,13 +344,35 @@ def train_portfolio_agent():
     # Performans raporu
     analyzer.print_performance_report(agent_metrics, benchmark_metrics)
     
+    # Agent ve benchmark farkının anlamlılığı (eşli blok bootstrap, isteğe bağlı)
+    bootstrap_result = None
+    if config.RUN_BOOTSTRAP:
+        bootstrap_result = bootstrap_metrics(final_agent_portfolio, benchmark_portfolio)
+        print_bootstrap_report(bootstrap_result)
+    
+    # Stokastik politikanın sonuç dağılımı (isteğe bağlı)
+    monte_carlo_summary = None
+    if config.RUN_MONTE_CARLO:
+        monte_carlo_result = monte_carlo_rollouts(agent, processed_data)
+        print_monte_carlo_report(monte_carlo_result)
+        monte_carlo_summary = summarize_monte_carlo(monte_carlo_result)
+    
+    # Benchmark aileleriyle karşılaştırma (eğitim ortamının fiyat matrisi üzerinde)
+    benchmark_family_metrics = analyzer.print_benchmark_comparison(
+        agent_metrics, analyzer.create_benchmark_portfolios(env.prices, len(final_agent_portfolio))
+    )
+    
     # Sonuçları kaydet
     results = {
         'agent_metrics': agent_metrics,
         'benchmark_metrics': benchmark_metrics,
-        'episode_rewards': episode_rewards,
-        'episode_portfolio_values': episode_portfolio_values,
+        'benchmark_family_metrics': benchmark_family_metrics,
+        'bootstrap': bootstrap_result,
+        'monte_carlo': monte_carlo_summary,
+        'episode_rewards': episode_rewards.to_numpy(),
+        'episode_portfolio_values': episode_portfolio_values.to_numpy(),
         'final_agent_portfolio': final_agent_portfolio,
+        'validation_history': validation_history,
         'config': {
             'stock_symbols': STOCK_SYMBOLS,
             'num_episodes': config.NUM_EPISODES,
@@ -179,11 +381,26 @@ def train_portfolio_agent():
         }
     }
     
-    save_results(agent, env, results)
+    # Profil çıktıları koşu klasörüne (runs/<run_id>/profile) taşınır
+    save_results(agent, env, results,
+                 artifacts={'profile': profiler.output_dir} if profiler is not None else None)
     
     return agent, env, results
 
 
+def save_validation_best(completed, checkpoint_writer):
+    """
+    Doğrulamada yeni en iyi olan anlık görüntüleri kaydet
+    
+    Args:
+        completed (list): BackgroundValidator.poll() çıktısı
+        checkpoint_writer (AsyncCheckpointWriter): Checkpoint yazıcı
+    """
+    for _, _, snapshot, is_best in completed:
+        if is_best:
+            checkpoint_writer.submit_snapshot(snapshot, "best_portfolio_agent.pt", split=True)
+
+
 def run_final_test(agent, env, action_dim):
     """
     Final test - eğitilmiş agent'la bir episode çalıştır
@@ -215,9 +432,12 @@ def run_final_test(agent, env, action_dim):
     return portfolio_history
 
 
-def quick_test():
+def quick_test(resume_path=None):
     """
     Hızlı test için küçük ölçekli eğitim
+    
+    Args:
+        resume_path (str): Devam ettirilecek checkpoint yolu (opsiyonel)
     """
     print("🔥 Hızlı test modu - sadece 50 episode")
     
@@ -230,7 +450,7 @@ def quick_test():
     config.REPORT_FREQUENCY = 10
     
     try:
-        result = train_portfolio_agent()
+        result = train_portfolio_agent(resume_path)
         return result
     finally:
         # Parametreleri geri yükle
@@ -239,16 +459,45 @@ def quick_test():
 
 
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="PPO Portföy Yönetimi Eğitimi")
+    parser.add_argument("--quick", action="store_true", help="50 episode'luk hızlı test")
+    parser.add_argument("--resume", nargs="?", const=config.RESUME_CHECKPOINT_PATH, default=None,
+                        metavar="CHECKPOINT", help="Devam ettirilebilir checkpoint'ten eğitime devam et")
+    parser.add_argument("--timing", action="store_true", help="Faz sürelerini ölç ve raporla")
+    parser.add_argument("--profile", action="store_true", help="Bir güncelleme penceresini torch.profiler ile kaydet")
+    parser.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                        help="Canlı metrikleri bu portta /metrics yolunda yayınla")
+    parser.add_argument("--bootstrap", action="store_true",
+                        help="Eğitim sonunda agent-benchmark bootstrap güven aralıklarını hesapla")
+    parser.add_argument("--monte-carlo", action="store_true",
+                        help="Eğitim sonunda stokastik politika Monte Carlo değerlendirmesini çalıştır")
+    parser.add_argument("--validation-split", type=float, default=None, metavar="ORAN",
+                        help="Son günlerin bu oranını doğrulamaya ayır (en iyi model doğrulama skoruyla seçilir)")
+    args = parser.parse_args()
+    
+    if args.timing:
+        config.TIMING_ENABLED = True
+    if args.profile:
+        config.PROFILE_ENABLED = True
+    if args.metrics_port is not None:
+        config.METRICS_PORT = args.metrics_port
+    if args.validation_split is not None:
+        config.VALIDATION_SPLIT = args.validation_split
+    if args.bootstrap:
+        config.RUN_BOOTSTRAP = True
+    if args.monte_carlo:
+        config.RUN_MONTE_CARLO = True
     
     print("🚀 PPO Portföy Yönetimi Projesi")
     print("=" * 50)
     
     # Komut satırı argümanlarını kontrol et
-    if len(sys.argv) > 1 and sys.argv[1] == "--quick":
-        trained_agent, environment, results = quick_test()
+    if args.quick:
+        trained_agent, environment, results = quick_test(args.resume)
     else:
-        trained_agent, environment, results = train_portfolio_agent()
+        trained_agent, environment, results = train_portfolio_agent(args.resume)
     
     if trained_agent is not None:
         print("\n🎉 Proje başarıyla tamamlandı!")
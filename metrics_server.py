@@ -0,0 +1,215 @@
+"""
+Canlı Eğitim Metrikleri - Prometheus metin formatında yerel HTTP uç noktası
+
+Yalnızca standart kütüphane kullanılır. Eğitim döngüsü TrainingMetrics
+üzerinde değerleri kısa bir kilit altında günceller; HTTP sunucusu ayrı bir
+daemon iş parçacığında çalışır ve her istekte (GET /metrics) anlık görüntüyü
+Prometheus metin formatında (0.0.4) döndürür. Böylece kazıma (scrape)
+istekleri eğitimi bloklamaz.
+
+Kullanım:
+    python main.py --metrics-port 9108
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_HOST, METRICS_PORT
+
+# Ad -> (tip, açıklama); tüm metrikler "ppo_" önekiyle yayınlanır
+METRIC_DEFINITIONS = {
+    'episode': ('gauge', "Son tamamlanan episode numarası"),
+    'episodes_total': ('counter', "Bu süreçte tamamlanan episode sayısı"),
+    'env_steps_total': ('counter', "Bu süreçte atılan ortam adımı sayısı"),
+    'env_steps_per_second': ('gauge', "Son episode'un ortam adımı hızı"),
+    'episode_reward': ('gauge', "Son episode'un toplam ödülü"),
+    'portfolio_value': ('gauge', "Son episode sonundaki portföy değeri"),
+    'best_portfolio_value': ('gauge', "Eğitimdeki en iyi portföy değeri"),
+    'updates_total': ('counter', "Bu süreçte yapılan PPO güncellemesi sayısı"),
+    'update_duration_seconds': ('summary', "PPO güncellemesi süresi"),
+    'update_last_duration_seconds': ('gauge', "Son PPO güncellemesinin süresi"),
+    'actor_loss': ('gauge', "Son güncellemenin actor kaybı"),
+    'critic_loss': ('gauge', "Son güncellemenin critic kaybı"),
+    'total_loss': ('gauge', "Son güncellemenin toplam kaybı"),
+    'entropy': ('gauge', "Son güncellemenin politika entropisi"),
+    'resident_memory_bytes': ('gauge', "Sürecin bellekte tuttuğu (RSS) bayt"),
+    'start_time_seconds': ('gauge', "Metrik sunucusunun başlangıç zamanı (Unix)"),
+}
+
+METRIC_PREFIX = "ppo_"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def resident_memory_bytes():
+    """
+    Sürecin güncel RSS bellek kullanımı
+
+    Linux'ta /proc/self/statm okunur; diğer sistemlerde en yüksek RSS
+    (resource.getrusage) döndürülür.
+
+    Returns:
+        float: Bayt (ölçülemezse NaN)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return float(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return float('nan')
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS bayt, Linux / BSD kilobayt döndürür
+    return float(max_rss if sys.platform == "darwin" else max_rss * 1024)
+
+
+def _format_value(value):
+    """Prometheus sayı gösterimi"""
+    if value != value:
+        return "NaN"
+    if value in (float('inf'), float('-inf')):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class TrainingMetrics:
+    """
+    Eğitim döngüsünden beslenen sayaç ve gösterge deposu
+
+    Kayıt metotları yalnızca sözlük atamaları yapar; kilit, sunucunun
+    tutarlı bir anlık görüntü alması için kısa süreli tutulur.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {name: 0.0 for name, (kind, _) in METRIC_DEFINITIONS.items() if kind == 'counter'}
+        self._summaries = {}
+        self._values['start_time_seconds'] = time.time()
+
+    def record_episode(self, episode, reward, portfolio_value, best_portfolio_value, steps, seconds):
+        """
+        Tamamlanan episode'u kaydet
+
+        Args:
+            episode (int): Episode numarası (1'den başlar)
+            reward (float): Toplam ödül
+            portfolio_value (float): Episode sonu portföy değeri
+            best_portfolio_value (float): En iyi portföy değeri
+            steps (int): Episode'daki ortam adımı sayısı
+            seconds (float): Episode süresi
+        """
+        with self._lock:
+            self._values['episode'] = float(episode)
+            self._values['episodes_total'] += 1
+            self._values['env_steps_total'] += steps
+            self._values['env_steps_per_second'] = steps / seconds if seconds > 0 else 0.0
+            self._values['episode_reward'] = float(reward)
+            self._values['portfolio_value'] = float(portfolio_value)
+            self._values['best_portfolio_value'] = float(best_portfolio_value)
+
+    def record_update(self, update_metrics, seconds):
+        """
+        PPO güncellemesini kaydet
+
+        Args:
+            update_metrics (dict): agent.update() çıktısı (boş olabilir)
+            seconds (float): Güncelleme süresi
+        """
+        with self._lock:
+            self._values['updates_total'] += 1
+            self._values['update_last_duration_seconds'] = seconds
+            total, count = self._summaries.get('update_duration_seconds', (0.0, 0))
+            self._summaries['update_duration_seconds'] = (total + seconds, count + 1)
+            for name in ('actor_loss', 'critic_loss', 'total_loss', 'entropy'):
+                if name in update_metrics:
+                    self._values[name] = float(update_metrics[name])
+
+    def render(self):
+        """
+        Prometheus metin formatında anlık görüntü
+
+        Returns:
+            str: Yayınlanacak metin
+        """
+        with self._lock:
+            values = dict(self._values)
+            summaries = dict(self._summaries)
+        values['resident_memory_bytes'] = resident_memory_bytes()
+
+        lines = []
+        for name, (kind, description) in METRIC_DEFINITIONS.items():
+            full_name = METRIC_PREFIX + name
+            if kind == 'summary':
+                if name not in summaries:
+                    continue
+                total, count = summaries[name]
+                samples = [(f"{full_name}_sum", total), (f"{full_name}_count", count)]
+            elif name in values:
+                samples = [(full_name, values[name])]
+            else:
+                continue
+            lines.append(f"# HELP {full_name} {description}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            lines.extend(f"{sample} {_format_value(value)}" for sample, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    TrainingMetrics'i /metrics yolunda yayınlayan arka plan HTTP sunucusu
+    """
+
+    def __init__(self, port=METRICS_PORT, host=METRICS_HOST, metrics=None):
+        """
+        Args:
+            port (int): Dinlenecek port (0: boş bir port seçilir)
+            host (str): Dinlenecek adres
+            metrics (TrainingMetrics): Yayınlanacak depo (None ise yeni oluşturulur)
+        """
+        self.metrics = metrics or TrainingMetrics()
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Sunucuyu daemon iş parçacığında başlat"""
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Kazıma istekleri eğitim çıktısını kirletmesin
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        print(f"📡 Metrik uç noktası: http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        """Sunucuyu kapat"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
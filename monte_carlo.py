@@ -0,0 +1,174 @@
+"""
+Stokastik Politika Monte Carlo Değerlendirmesi
+
+Değerlendirme normalde en olası aksiyonla (argmax) yapılır; oysa eğitilen
+politika stokastiktir. Burada aynı fiyat verisi üzerinde binlerce episode,
+aksiyonlar politikadan örneklenerek VectorizedPortfolioEnvironment içinde
+toplu çalıştırılır. Örnekleme tohumlu bir torch.Generator ile yapılır;
+aynı tohum ve parti boyutu aynı sonuçları üretir.
+"""
+
+import copy
+import time
+
+import numpy as np
+import torch
+
+from environment import VectorizedPortfolioEnvironment
+from checkpoint import load_inference_network
+from utils import PerformanceAnalyzer
+from config import INITIAL_BALANCE, MONTE_CARLO_ROLLOUTS, MONTE_CARLO_BATCH_SIZE
+
+
+def _resolve_network(policy):
+    """Checkpoint yolu, PPOAgent veya PPONetwork'ten eval modunda ağ döndür"""
+    if isinstance(policy, str):
+        return load_inference_network(policy)
+    # Eğitimdeki ağın modu değişmesin diye eval modundaki kopya kullanılır
+    network = copy.deepcopy(getattr(policy, 'policy_old', policy))
+    network.eval()
+    return network
+
+
+def _rollout_batch(network, processed_data, n_envs, generator, greedy=False):
+    """
+    n_envs episode'u birlikte çalıştır
+
+    Returns:
+        tuple: ([n_envs, gün] portföy geçmişi, [n_envs] ortalama günlük turnover)
+    """
+    env = VectorizedPortfolioEnvironment(processed_data, n_envs)
+    action_dim = processed_data['n_stocks'] + 1
+
+    state = env.reset()
+    previous_weights = env.portfolio_weights.copy()
+    turnover = np.zeros(n_envs)
+    steps = 0
+    done = False
+    with torch.no_grad():
+        while not done:
+            action_logits, _ = network(torch.from_numpy(state))
+            if greedy:
+                action_indices = action_logits.argmax(dim=-1)
+            else:
+                probabilities = torch.softmax(action_logits, dim=-1)
+                action_indices = torch.multinomial(probabilities, 1, generator=generator).squeeze(-1)
+
+            state, _, dones, info = env.step(env.action_vectors(action_indices.numpy(), action_dim))
+            turnover += np.abs(info['portfolio_weights'] - previous_weights).sum(axis=1)
+            previous_weights = info['portfolio_weights']
+            steps += 1
+            done = dones[0]
+
+    return env.portfolio_history.copy(), turnover / max(steps, 1)
+
+
+def monte_carlo_rollouts(policy, processed_data, n_rollouts=MONTE_CARLO_ROLLOUTS,
+                         batch_size=MONTE_CARLO_BATCH_SIZE, seed=0, return_histories=False):
+    """
+    Stokastik politikanın sonuç dağılımını toplu rollout'larla çıkar
+
+    Args:
+        policy: Checkpoint yolu, PPOAgent veya PPONetwork
+        processed_data (dict): Değerlendirme verisi
+        n_rollouts (int): Örneklenen episode sayısı
+        batch_size (int): Aynı anda simüle edilen episode sayısı
+        seed (int): Aksiyon örnekleme tohumu
+        return_histories (bool): [n_rollouts, gün] portföy geçmişlerini de döndür
+
+    Returns:
+        dict: final_values ve metrics ([n_rollouts] diziler), greedy_metrics
+            (argmax politika), opsiyonel portfolio_histories ve süre
+    """
+    start_time = time.perf_counter()
+    network = _resolve_network(policy)
+    generator = torch.Generator().manual_seed(seed)
+
+    histories = []
+    turnovers = []
+    for batch_start in range(0, n_rollouts, batch_size):
+        n_envs = min(batch_size, n_rollouts - batch_start)
+        batch_history, batch_turnover = _rollout_batch(network, processed_data, n_envs, generator)
+        histories.append(batch_history)
+        turnovers.append(batch_turnover)
+
+    portfolio_histories = np.concatenate(histories)
+    analyzer = PerformanceAnalyzer()
+    metrics = analyzer.calculate_performance_metrics(portfolio_histories)
+    metrics['turnover'] = np.concatenate(turnovers)
+
+    greedy_history, greedy_turnover = _rollout_batch(network, processed_data, 1, generator, greedy=True)
+    greedy_metrics = analyzer.calculate_performance_metrics(greedy_history[0])
+    greedy_metrics['turnover'] = greedy_turnover[0]
+
+    result = {
+        'n_rollouts': n_rollouts,
+        'seed': seed,
+        'final_values': portfolio_histories[:, -1],
+        'metrics': metrics,
+        'greedy_metrics': greedy_metrics,
+        'elapsed_seconds': time.perf_counter() - start_time
+    }
+    if return_histories:
+        result['portfolio_histories'] = portfolio_histories
+    return result
+
+
+def summarize_monte_carlo(result, percentiles=(5, 25, 50, 75, 95)):
+    """
+    Monte Carlo sonucunun kaydedilebilir özeti
+
+    Returns:
+        dict: Metrik başına ortalama, standart sapma ve yüzdelikler
+    """
+    summary = {'n_rollouts': result['n_rollouts'], 'seed': result['seed'],
+               'prob_loss': float(np.mean(result['final_values'] < INITIAL_BALANCE)),
+               'prob_beat_greedy': float(np.mean(result['final_values'] > result['greedy_metrics']['final_value']))}
+    for key in ('final_value', 'total_return_pct', 'sharpe_ratio', 'max_drawdown_pct', 'turnover'):
+        values = result['metrics'][key]
+        summary[key] = {'mean': float(values.mean()), 'std': float(values.std()),
+                        **{f'p{p}': float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))}}
+    return summary
+
+
+def print_monte_carlo_report(result):
+    """Stokastik ve argmax politika sonuçlarını karşılaştıran rapor"""
+    summary = summarize_monte_carlo(result)
+    greedy = result['greedy_metrics']
+
+    print("\n" + "=" * 70)
+    print(f"     MONTE CARLO (STOKASTİK POLİTİKA) - {summary['n_rollouts']:,} episode, "
+          f"{result['elapsed_seconds']:.2f} sn")
+    print("=" * 70)
+    print(f"{'Metrik':<18} {'Argmax':>10} {'Ortalama':>10} {'%5':>10} {'Medyan':>10} {'%95':>10}")
+    print("-" * 70)
+    for label, key in [('Final Değer', 'final_value'), ('Getiri (%)', 'total_return_pct'),
+                       ('Sharpe', 'sharpe_ratio'), ('Max DD (%)', 'max_drawdown_pct'), ('Turnover', 'turnover')]:
+        stats = summary[key]
+        print(f"{label:<18} {greedy[key]:>10.2f} {stats['mean']:>10.2f} {stats['p5']:>10.2f} "
+              f"{stats['p50']:>10.2f} {stats['p95']:>10.2f}")
+    print("-" * 70)
+    print(f"Zarar olasılığı: %{summary['prob_loss'] * 100:.1f} | "
+          f"Argmax politikayı geçme olasılığı: %{summary['prob_beat_greedy'] * 100:.1f}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    import argparse
+    from data_manager import DataManager
+    from config import STOCK_SYMBOLS
+
+    parser = argparse.ArgumentParser(description="Stokastik politika Monte Carlo değerlendirmesi")
+    parser.add_argument("checkpoint", nargs="?", default="best_portfolio_agent.pt", help="Checkpoint yolu")
+    parser.add_argument("--rollouts", type=int, default=MONTE_CARLO_ROLLOUTS, help="Episode sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="Örnekleme tohumu")
+    parser.add_argument("--period", default="1y", help="Değerlendirme verisi süresi")
+    args = parser.parse_args()
+
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, args.period)
+    if len(raw_data) < 2:
+        print("❌ Yeterli veri bulunamadı!")
+    else:
+        print_monte_carlo_report(monte_carlo_rollouts(args.checkpoint, data_manager.process_data(raw_data),
+                                                      n_rollouts=args.rollouts, seed=args.seed))
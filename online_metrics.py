@@ -0,0 +1,164 @@
+"""
+Akan (Online) Performans Metrikleri - Her gözlemde O(1) güncelleme
+
+Portföy değerleri tek tek verilir; getiri ortalaması ve varyansı Welford
+yöntemiyle, drawdown koşan tepe değerle, kazanma oranı sayaçlarla tutulur.
+Kayan pencere metrikleri sabit boyutlu halka tamponlar (ring buffer) ve
+koşan toplamlarla hesaplanır. Metrikler geçmiş yeniden taranmadan her an
+sorgulanabilir; anahtarlar PerformanceAnalyzer ile uyumludur.
+"""
+
+import math
+
+import numpy as np
+
+from config import INITIAL_BALANCE, ONLINE_METRICS_WINDOW
+
+
+class OnlineMetrics:
+    """
+    Portföy değer akışından koşan performans metrikleri
+
+    PortfolioEnvironment.attach_metrics ile ortama bağlanabilir veya canlı
+    bir fiyat akışında update() ile elle beslenebilir.
+    """
+
+    def __init__(self, initial_value=INITIAL_BALANCE, window=ONLINE_METRICS_WINDOW):
+        """
+        Args:
+            initial_value (float): Başlangıç portföy değeri
+            window (int): Kayan pencere uzunluğu (gün, 0: kayan metrikler kapalı)
+        """
+        self.window = window
+        self._returns_buffer = np.zeros(max(window, 1))
+        self._values_buffer = np.zeros(max(window, 1) + 1)
+        self.reset(initial_value)
+
+    def reset(self, initial_value=None):
+        """Tüm sayaçları sıfırla"""
+        if initial_value is not None:
+            self.initial_value = initial_value
+        self.last_value = self.initial_value
+        self.peak = self.initial_value
+        self.max_drawdown = 0.0
+        self.total_days = 1
+
+        # Welford koşan ortalama / varyans (yalnızca sonlu getiriler)
+        self.n_returns = 0
+        self.mean_return = 0.0
+        self._m2 = 0.0
+        self._downside_sum_sq = 0.0
+        self.positive_days = 0
+        self.negative_days = 0
+
+        # Kayan pencere halka tamponu
+        self._buffer_position = 0
+        self._buffer_count = 0
+        self._window_sum = 0.0
+        self._window_sum_sq = 0.0
+        self._values_buffer[0] = self.initial_value
+
+    def update(self, value):
+        """
+        Yeni bir portföy değeri ekle (O(1))
+
+        Args:
+            value (float): Günün portföy değeri
+        """
+        prev_value = self.last_value
+        self.last_value = value
+        self.total_days += 1
+
+        # Drawdown: koşan tepe değere göre
+        if value > self.peak:
+            self.peak = value
+        if self.peak > 0:
+            self.max_drawdown = min(self.max_drawdown, (value - self.peak) / self.peak * 100)
+
+        daily_return = (value - prev_value) / prev_value if prev_value != 0 else math.nan
+        if math.isfinite(daily_return):
+            self.n_returns += 1
+            delta = daily_return - self.mean_return
+            self.mean_return += delta / self.n_returns
+            self._m2 += delta * (daily_return - self.mean_return)
+            if daily_return > 0:
+                self.positive_days += 1
+            elif daily_return < 0:
+                self.negative_days += 1
+                self._downside_sum_sq += daily_return ** 2
+        else:
+            daily_return = 0.0
+
+        if self.window > 0:
+            self._push_window(daily_return, value)
+
+    def _push_window(self, daily_return, value):
+        """Halka tampona getiri ekle, pencereden çıkanı koşan toplamlardan düş"""
+        position = self._buffer_position
+        if self._buffer_count == self.window:
+            old_return = self._returns_buffer[position]
+            self._window_sum -= old_return
+            self._window_sum_sq -= old_return ** 2
+        else:
+            self._buffer_count += 1
+
+        self._returns_buffer[position] = daily_return
+        self._window_sum += daily_return
+        self._window_sum_sq += daily_return ** 2
+        self._buffer_position = (position + 1) % self.window
+
+        # Değer tamponu bir fazla tutulur: pencere başındaki değer kayan getiri içindir
+        self._values_buffer[(self.total_days - 1) % (self.window + 1)] = value
+
+    @property
+    def volatility(self):
+        """Getirilerin popülasyon standart sapması (np.std ile aynı)"""
+        return math.sqrt(self._m2 / self.n_returns) if self.n_returns else 0.0
+
+    def rolling_metrics(self):
+        """
+        Son `window` gözlem üzerinden kayan metrikler
+
+        Returns:
+            dict: Kayan getiri, volatilite ve Sharpe
+        """
+        count = self._buffer_count
+        if count == 0:
+            return {'rolling_return_pct': 0.0, 'rolling_volatility_pct': 0.0, 'rolling_sharpe_ratio': 0.0}
+
+        mean = self._window_sum / count
+        variance = max(self._window_sum_sq / count - mean ** 2, 0.0)
+        std = math.sqrt(variance)
+        start_value = self._values_buffer[(self.total_days - 1 - count) % (self.window + 1)]
+        return {
+            'rolling_return_pct': (self.last_value / start_value - 1) * 100 if start_value else 0.0,
+            'rolling_volatility_pct': std * math.sqrt(252) * 100,
+            'rolling_sharpe_ratio': mean / (std + 1e-8) * math.sqrt(252)
+        }
+
+    def metrics(self):
+        """
+        Anlık metrik görüntüsü (geçmiş yeniden taranmaz)
+
+        Returns:
+            dict: PerformanceAnalyzer.calculate_performance_metrics ile uyumlu metrikler
+        """
+        std = self.volatility
+        downside_std = math.sqrt(self._downside_sum_sq / self.n_returns) if self.n_returns else 0.0
+        decided_days = self.positive_days + self.negative_days
+
+        metrics = {
+            'final_value': self.last_value,
+            'total_return_pct': (self.last_value / self.initial_value - 1) * 100,
+            'annualized_volatility_pct': std * math.sqrt(252) * 100,
+            'sharpe_ratio': self.mean_return / (std + 1e-8) * math.sqrt(252),
+            'sortino_ratio': self.mean_return / (downside_std + 1e-8) * math.sqrt(252),
+            'max_drawdown_pct': self.max_drawdown,
+            'win_rate_pct': self.positive_days / decided_days * 100 if decided_days else 0.0,
+            'total_days': self.total_days,
+            'positive_days': self.positive_days,
+            'negative_days': self.negative_days
+        }
+        if self.window > 0:
+            metrics.update(self.rolling_metrics())
+        return metrics
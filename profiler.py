@@ -0,0 +1,202 @@
+"""
+Eğitim Profilleyici - torch.profiler izleri ve py-spy bilgisi
+
+İsteğe bağlı olarak açılır. İlk PROFILE_WAIT_UPDATES güncelleme atlanır;
+sonraki PROFILE_ACTIVE_UPDATES güncellemenin her biri için ayrı bir kayıt
+penceresi açılır. Pencere güncellemenin hemen öncesinde ısınır (kineto
+hazırlığı kayda girmez), güncellemeyi ve ardından gelen
+PROFILE_ROLLOUT_STEPS ortam adımını kaydeder, sonra kapanır. Böylece iz
+tüm rollout episode'larını değil yalnızca küçük bir dilimi kapsar. Her
+pencere için bir Chrome izi (chrome://tracing veya Perfetto ile açılır)
+yazılır.
+
+Operatör özet tabloları (key_averages) olayları Python'da ayrıştırdığı
+için yavaştır; PROFILE_SUMMARY ile açılır ve eğitimi bloklamamak için arka
+plan iş parçacığında üretilir.
+
+PPOAgent.update içindeki forward, dağılım, loss, backward, gradyan
+kırpma ve optimizer adımı profile_region etiketleriyle işaretlenir.
+record_function her çağrıda birkaç mikrosaniye tuttuğu için etiketler
+yalnızca takvim kayıt (RECORD) durumundayken etkindir.
+"""
+
+import contextlib
+import os
+import sys
+import threading
+from datetime import datetime
+
+import torch
+from torch.profiler import ProfilerAction, ProfilerActivity, profile, record_function
+
+from config import (PROFILE_DIR, PROFILE_WAIT_UPDATES, PROFILE_ACTIVE_UPDATES, PROFILE_ROLLOUT_STEPS,
+                    PROFILE_MEMORY, PROFILE_RECORD_SHAPES, PROFILE_SUMMARY)
+
+# Takvim kayıt durumundayken True; profile_region etiketlerini açar
+_RECORDING = False
+
+_NULL_REGION = contextlib.nullcontext()
+
+_RECORD_ACTIONS = (ProfilerAction.RECORD, ProfilerAction.RECORD_AND_SAVE)
+
+
+def profile_region(name):
+    """
+    Profilleyici kaydı sürüyorsa torch.profiler etiketi, değilse boş bağlam
+
+    Args:
+        name (str): İzde görünecek bölge adı
+    """
+    return record_function(name) if _RECORDING else _NULL_REGION
+
+
+class TrainingProfiler:
+    """
+    Güncelleme + kısa rollout pencerelerini torch.profiler ile kaydeden sınıf
+
+    start() eğitim döngüsünden önce, begin_update() her güncellemeden önce,
+    step() her güncellemeden sonra, rollout_step() her ortam adımından sonra
+    ve stop() döngü bittikten sonra çağrılır.
+    """
+
+    def __init__(self, output_dir=None, wait=PROFILE_WAIT_UPDATES, active=PROFILE_ACTIVE_UPDATES,
+                 rollout_steps=PROFILE_ROLLOUT_STEPS, profile_memory=PROFILE_MEMORY,
+                 record_shapes=PROFILE_RECORD_SHAPES, summary=PROFILE_SUMMARY, with_stack=False):
+        """
+        Args:
+            output_dir (str): Çıktı dizini (None ise PROFILE_DIR/<zaman damgası>)
+            wait (int): Kayıttan önce atlanan güncelleme sayısı
+            active (int): Kaydedilen güncelleme (pencere) sayısı
+            rollout_steps (int): Her pencerede güncellemeden sonra kaydedilen ortam adımı
+            profile_memory (bool): Operatör başına CPU bellek ayırmalarını kaydet
+            record_shapes (bool): Operatör girdi boyutlarını kaydet (izi büyütür)
+            summary (bool): Operatör özet tablolarını arka planda üret
+            with_stack (bool): Python çağrı yığınlarını kaydet (daha yavaş)
+        """
+        self.output_dir = output_dir or os.path.join(PROFILE_DIR, datetime.now().strftime('%Y%m%d_%H%M%S'))
+        self.wait = wait
+        self.active = active
+        self.rollout_steps = rollout_steps
+        self.profile_memory = profile_memory
+        self.summary = summary
+        self.artifacts = []
+        self._running = False
+        self._updates = 0
+        self._windows = 0
+        self._window_steps = 0
+        self._next_action = ProfilerAction.NONE
+        self._summary_threads = []
+
+        activities = [ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(ProfilerActivity.CUDA)
+        self._profiler = profile(
+            activities=activities,
+            schedule=self._schedule,
+            on_trace_ready=self._on_trace_ready,
+            profile_memory=profile_memory,
+            record_shapes=record_shapes,
+            with_stack=with_stack
+        )
+
+    def start(self):
+        """Profilleyiciyi başlat (ilk pencereye kadar kayıt yapılmaz) ve py-spy bilgisini yaz"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._write_pyspy_info()
+        self._profiler.start()
+        self._running = True
+        print(f"🔬 Profilleyici açık: {self.output_dir} (PID {os.getpid()})")
+
+    def begin_update(self):
+        """Güncelleme başlıyor; sıradaki pencereyse ısın ve kaydı aç"""
+        if not self._running or self._windows >= self.active or self._updates < self.wait:
+            return
+        if self._recording():
+            # Önceki pencere rollout adımları dolmadan bitti
+            self._close_window()
+        self._advance(ProfilerAction.WARMUP)
+        self._advance(ProfilerAction.RECORD_AND_SAVE)
+        self._window_steps = 0
+
+    def step(self):
+        """Bir güncelleme tamamlandı; rollout adımı istenmiyorsa pencereyi kapat"""
+        self._updates += 1
+        if self._recording() and self.rollout_steps <= 0:
+            self._close_window()
+
+    def rollout_step(self):
+        """Bir ortam adımı tamamlandı; pencerenin rollout kotası dolduysa kapat"""
+        if self._recording():
+            self._window_steps += 1
+            if self._window_steps >= self.rollout_steps:
+                self._close_window()
+
+    def stop(self):
+        """Profilleyiciyi durdur (açık pencere eldekiyle yazılır; tekrar çağrılabilir)"""
+        global _RECORDING
+        if self._running:
+            if self._recording():
+                self._close_window()
+            self._running = False
+            self._profiler.stop()
+        _RECORDING = False
+        for thread in self._summary_threads:
+            thread.join()
+        self._summary_threads = []
+
+    def _schedule(self, step_num):
+        """torch.profiler takvimi: sıradaki durum eğitim döngüsünün olaylarından belirlenir"""
+        return self._next_action
+
+    def _advance(self, action):
+        """Takvimi verilen duruma geçir ve etiketleri kayıt durumuna göre aç/kapat"""
+        global _RECORDING
+        self._next_action = action
+        self._profiler.step()
+        _RECORDING = self._recording()
+
+    def _recording(self):
+        """Takvim şu anda kayıt durumunda mı"""
+        return self._running and self._profiler.current_action in _RECORD_ACTIONS
+
+    def _close_window(self):
+        """Açık pencereyi bitir (on_trace_ready tetiklenir)"""
+        self._advance(ProfilerAction.NONE)
+        self._windows += 1
+
+    def _on_trace_ready(self, prof):
+        """Pencere bitince Chrome izini yaz; özet istendiyse arka planda üret"""
+        trace_path = os.path.join(self.output_dir, f"trace_update{self._updates}.json")
+        prof.export_chrome_trace(trace_path)
+        self.artifacts.append(trace_path)
+        print(f"🔬 Profil izi kaydedildi: {trace_path}")
+
+        if self.summary:
+            # Her pencere kendi olay nesnesini tutar; sonraki pencere onu değiştirmez
+            summary_path = os.path.join(self.output_dir, f"operator_summary_update{self._updates}.txt")
+            thread = threading.Thread(target=self._write_summary, args=(prof.profiler, summary_path),
+                                      name="profiler-summary", daemon=True)
+            thread.start()
+            self._summary_threads.append(thread)
+            self.artifacts.append(summary_path)
+
+    def _write_summary(self, window_profile, summary_path):
+        """Operatör özet tablolarını yaz (arka plan iş parçacığı)"""
+        averages = window_profile.key_averages()
+        with open(summary_path, 'w') as f:
+            f.write("# CPU süresine göre\n")
+            f.write(averages.table(sort_by="cpu_time_total", row_limit=40))
+            if self.profile_memory:
+                f.write("\n\n# CPU bellek ayırmasına göre\n")
+                f.write(averages.table(sort_by="self_cpu_memory_usage", row_limit=40))
+
+    def _write_pyspy_info(self):
+        """py-spy ile bu sürece bağlanmak için gereken komutları yaz"""
+        pid = os.getpid()
+        path = os.path.join(self.output_dir, "pyspy.txt")
+        with open(path, 'w') as f:
+            f.write(f"pid: {pid}\n")
+            f.write(f"python: {sys.executable}\n")
+            f.write(f"py-spy record --pid {pid} --duration 30 -o {os.path.join(self.output_dir, 'pyspy.svg')}\n")
+            f.write(f"py-spy dump --pid {pid}\n")
+        self.artifacts.append(path)
@@ -38,7 +38,7 @@ def quick_test_model(model_path="best_portfolio_agent.pt", test_days=30):
         
         # Modeli yükle
         agent = PPOAgent(state_dim, action_dim)
-        agent.load_agent(model_path)
+        agent.load_policy(model_path)
         print(f"✅ Model yüklendi: {model_path}")
         
         # Test çalıştır
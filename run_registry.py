@@ -0,0 +1,259 @@
+"""
+Çalıştırma Kaydı (Run Registry) - Koşu başına klasör ve SQLite indeksi
+
+Her eğitim koşusu runs/<run_id>/ altında saklanır:
+    agent.weights.pt / agent.train.pt  - Ayrık formatta agent
+    series.npz                         - Episode / gün bazlı seriler (sütunsal)
+    metrics.json                       - Skaler metrikler ve konfigürasyon (küçük)
+runs/index.sqlite ise koşuların konfigürasyonunu ve skaler özet metriklerini
+tutar; yüzlerce koşu JSON dosyaları taranmadan sorgulanıp çizilebilir.
+"""
+
+import contextlib
+import json
+import os
+import shutil
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config import RUN_REGISTRY_DIR
+
+AGENT_FILENAME = "agent.pt"
+SERIES_FILENAME = "series.npz"
+METRICS_FILENAME = "metrics.json"
+INDEX_FILENAME = "index.sqlite"
+
+
+def _to_python(value):
+    """NumPy skalerlerini Python tiplerine çevir"""
+    return value.item() if hasattr(value, 'item') else value
+
+
+def split_results(results, prefix=""):
+    """
+    Sonuç sözlüğünü skaler metrikler, seriler ve konfigürasyon olarak ayır
+
+    İç içe sözlük anahtarları nokta ile birleştirilir; sayısal listeler ve
+    diziler seri olur, sözlük listeleri (ör. doğrulama geçmişi) anahtar
+    başına sütunlara çevrilir.
+
+    Args:
+        results (dict): Eğitim sonuç sözlüğü
+        prefix (str): Anahtar öneki
+
+    Returns:
+        tuple: (skalerler dict, seriler dict, konfigürasyon dict)
+    """
+    scalars, series, run_config = {}, {}, {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if key == 'config' and isinstance(value, dict):
+            run_config.update({k: _to_python(v) for k, v in value.items()})
+        elif isinstance(value, dict):
+            sub_scalars, sub_series, sub_config = split_results(value, prefix=f"{name}.")
+            scalars.update(sub_scalars)
+            series.update(sub_series)
+            run_config.update(sub_config)
+        elif isinstance(value, (list, tuple, np.ndarray)):
+            if len(value) and all(isinstance(item, dict) for item in value):
+                for column in value[0]:
+                    series[f"{name}.{column}"] = np.array([item.get(column, np.nan) for item in value])
+            else:
+                array = np.asarray(value)
+                if array.dtype.kind in 'biuf':
+                    series[name] = array
+        elif isinstance(value, (int, float, np.integer, np.floating, bool, np.bool_)):
+            scalars[name] = float(value)
+    return scalars, series, run_config
+
+
+class RunRegistry:
+    """Koşu klasörlerini ve SQLite indeksini yöneten sınıf"""
+
+    def __init__(self, root=RUN_REGISTRY_DIR):
+        """
+        Args:
+            root (str): Koşu klasörlerinin kök dizini
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.index_path = os.path.join(root, INDEX_FILENAME)
+        with self._connect() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    config TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS metrics (
+                    run_id TEXT NOT NULL REFERENCES runs(run_id),
+                    name TEXT NOT NULL,
+                    value REAL,
+                    PRIMARY KEY (run_id, name)
+                );
+                CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics(name, value);
+            """)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """İşlem sonunda commit edip kapanan indeks bağlantısı"""
+        connection = sqlite3.connect(self.index_path)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _new_run_id(self, prefix):
+        """Zaman damgalı, çakışmayan koşu kimliği üret"""
+        base = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        run_id, suffix = base, 1
+        while os.path.exists(os.path.join(self.root, run_id)):
+            run_id = f"{base}_{suffix}"
+            suffix += 1
+        return run_id
+
+    def run_path(self, run_id, filename=""):
+        """Koşu klasörü (veya içindeki dosya) yolu"""
+        return os.path.join(self.root, run_id, filename)
+
+    def save_run(self, agent, results, prefix="portfolio_results", artifacts=None):
+        """
+        Koşuyu kaydet ve indekse ekle
+
+        Args:
+            agent: Eğitilmiş agent (None ise yalnızca sonuçlar kaydedilir)
+            results (dict): Eğitim sonuç sözlüğü
+            prefix (str): Koşu kimliği öneki
+            artifacts (dict): Koşu klasörüne taşınacak dosya / dizinler (ad -> yol),
+                ör. {'profile': 'profiles/20250101_120000'}
+
+        Returns:
+            str: Koşu kimliği
+        """
+        run_id = self._new_run_id(prefix)
+        os.makedirs(self.run_path(run_id))
+
+        scalars, series, run_config = split_results(results)
+        if agent is not None:
+            agent.save_agent(self.run_path(run_id, AGENT_FILENAME), split=True)
+        np.savez_compressed(self.run_path(run_id, SERIES_FILENAME), **series)
+        with open(self.run_path(run_id, METRICS_FILENAME), 'w') as f:
+            json.dump({'metrics': scalars, 'config': run_config}, f)
+        for name, path in (artifacts or {}).items():
+            if path and os.path.exists(path):
+                shutil.move(path, self.run_path(run_id, name))
+
+        with self._connect() as connection:
+            connection.execute("INSERT INTO runs VALUES (?, ?, ?, ?)",
+                               (run_id, datetime.now().isoformat(timespec='seconds'),
+                                self.run_path(run_id), json.dumps(run_config)))
+            connection.executemany("INSERT INTO metrics VALUES (?, ?, ?)",
+                                   [(run_id, name, value) for name, value in scalars.items()])
+        return run_id
+
+    def query_runs(self, metrics=None, order_by=None, ascending=False, limit=None):
+        """
+        Koşuları konfigürasyon ve özet metrikleriyle tablo olarak getir
+
+        Args:
+            metrics (list): Getirilecek metrik adları (None ise tümü)
+            order_by (str): Sıralama sütunu
+            ascending (bool): Artan sıralama
+            limit (int): Maksimum satır
+
+        Returns:
+            pd.DataFrame: Koşu başına bir satır
+        """
+        with self._connect() as connection:
+            runs = pd.read_sql_query("SELECT run_id, created_at, path, config FROM runs", connection)
+            query = "SELECT run_id, name, value FROM metrics"
+            params = []
+            if metrics:
+                query += f" WHERE name IN ({', '.join('?' * len(metrics))})"
+                params = list(metrics)
+            values = pd.read_sql_query(query, connection, params=params)
+
+        if runs.empty:
+            return runs.drop(columns='config')
+
+        config_columns = pd.json_normalize([json.loads(text) for text in runs.pop('config')])
+        table = pd.concat([runs, config_columns.add_prefix('config.')], axis=1)
+        if not values.empty:
+            table = table.merge(values.pivot(index='run_id', columns='name', values='value'),
+                                left_on='run_id', right_index=True, how='left')
+
+        table = table.sort_values(order_by or 'created_at', ascending=ascending if order_by else False)
+        return table.head(limit).reset_index(drop=True) if limit else table.reset_index(drop=True)
+
+    def latest_run(self):
+        """En son kaydedilen koşunun kimliği (yoksa None)"""
+        with self._connect() as connection:
+            row = connection.execute("SELECT run_id FROM runs ORDER BY created_at DESC, rowid DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def load_series(self, run_id, names=None):
+        """
+        Koşunun serilerini oku
+
+        Args:
+            run_id (str): Koşu kimliği
+            names (list): Okunacak seri adları (None ise tümü)
+
+        Returns:
+            dict: Seri adı -> np.array
+        """
+        with np.load(self.run_path(run_id, SERIES_FILENAME)) as archive:
+            return {name: archive[name] for name in (names or archive.files)}
+
+    def load_metrics(self, run_id):
+        """Koşunun skaler metriklerini ve konfigürasyonunu oku"""
+        with open(self.run_path(run_id, METRICS_FILENAME)) as f:
+            return json.load(f)
+
+    def agent_path(self, run_id):
+        """Koşunun agent checkpoint yolu"""
+        return self.run_path(run_id, AGENT_FILENAME)
+
+    def plot_series(self, run_ids, name="episode_portfolio_values", ax=None):
+        """
+        Birden fazla koşunun aynı serisini üst üste çiz
+
+        Args:
+            run_ids (list): Koşu kimlikleri
+            name (str): Seri adı
+            ax: Matplotlib ekseni (None ise yeni figür)
+
+        Returns:
+            Matplotlib ekseni
+        """
+        import matplotlib.pyplot as plt
+
+        if ax is None:
+            _, ax = plt.subplots(figsize=(12, 6))
+        for run_id in run_ids:
+            ax.plot(self.load_series(run_id, [name])[name], label=run_id, alpha=0.7)
+        ax.set_title(name)
+        ax.legend(fontsize=8)
+        return ax
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kayıtlı eğitim koşularını listele")
+    parser.add_argument("--order-by", default=None, help="Sıralama metriği (ör. agent_metrics.sharpe_ratio)")
+    parser.add_argument("--limit", type=int, default=20, help="Maksimum satır")
+    args = parser.parse_args()
+
+    columns = ['agent_metrics.total_return_pct', 'agent_metrics.sharpe_ratio', 'agent_metrics.max_drawdown_pct',
+               'benchmark_metrics.total_return_pct']
+    table = RunRegistry().query_runs(metrics=columns, order_by=args.order_by, limit=args.limit)
+    if table.empty:
+        print("Kayıtlı koşu yok.")
+    else:
+        print(table[['run_id'] + [column for column in columns if column in table]].to_string(index=False))
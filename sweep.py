@@ -0,0 +1,246 @@
+"""
+Paralel Hiperparametre Araması - Ardışık yarılama (successive halving) ile erken eleme
+
+Her deneme config modülüne dokunmadan kendi parametre sözlüğüyle çalışır.
+Denemeler süreç havuzunda paralel eğitilir; her basamakta (rung) episode
+getirisine göre en iyi 1/eta kısmı devam eder, diğerleri erken durdurulur.
+İşçi süreçler veriyi indirmek yerine ortak .npz önbelleğinden okur.
+"""
+
+import contextlib
+import io
+import itertools
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+import numpy as np
+import pandas as pd
+import torch
+
+from agents import PPOAgent
+from data_manager import DataManager
+from environment import PortfolioEnvironment
+from trainer import run_episode
+from config import (LEARNING_RATE, EPS_CLIP, K_EPOCHS, HIDDEN_DIM, UPDATE_FREQUENCY, INITIAL_BALANCE,
+                    SWEEP_SEARCH_SPACE, SWEEP_NUM_TRIALS, SWEEP_MIN_EPISODES, SWEEP_MAX_EPISODES,
+                    SWEEP_REDUCTION_FACTOR, SWEEP_WORKERS)
+
+# İşçi süreç başına bir kez yüklenen veri
+_WORKER_DATA = None
+
+DEFAULT_PARAMS = {
+    'learning_rate': LEARNING_RATE,
+    'eps_clip': EPS_CLIP,
+    'k_epochs': K_EPOCHS,
+    'hidden_dim': HIDDEN_DIM,
+    'update_frequency': UPDATE_FREQUENCY
+}
+
+
+def _init_worker(cache_path):
+    """İşçi süreç başlatıcı: ortak veri önbelleğini yükle"""
+    global _WORKER_DATA
+    torch.set_num_threads(1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _WORKER_DATA = DataManager().load_cache(cache_path)
+
+
+def sample_trials(search_space=SWEEP_SEARCH_SPACE, num_trials=SWEEP_NUM_TRIALS, seed=0):
+    """
+    Arama uzayından deneme parametreleri üret
+
+    Tüm kombinasyon sayısı num_trials'dan küçük veya eşitse tam ızgara,
+    aksi halde tekrarsız rastgele örneklem döndürülür.
+
+    Args:
+        search_space (dict): Parametre adı -> aday değerler listesi
+        num_trials (int): Deneme sayısı
+        seed (int): Örnekleme tohumu
+
+    Returns:
+        list: Deneme parametre sözlükleri
+    """
+    names = list(search_space)
+    grid = list(itertools.product(*(search_space[name] for name in names)))
+    if len(grid) > num_trials:
+        rng = np.random.default_rng(seed)
+        grid = [grid[i] for i in rng.choice(len(grid), size=num_trials, replace=False)]
+
+    trials = []
+    for values in grid:
+        params = dict(DEFAULT_PARAMS)
+        params.update({name: value.item() if hasattr(value, 'item') else value
+                       for name, value in zip(names, values)})
+        trials.append(params)
+    return trials
+
+
+def _train_segment(task):
+    """
+    Bir denemeyi [start_episode, end_episode) aralığında eğit
+
+    Agent durumu (ağırlıklar, optimizer, yarım buffer) basamaklar arasında
+    anlık görüntü olarak taşınır.
+
+    Returns:
+        dict: Güncel anlık görüntü ve episode geçmişi
+    """
+    params = task['params']
+    start_time = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = PortfolioEnvironment(_WORKER_DATA)
+        state_dim = len(env.get_state())
+        action_dim = _WORKER_DATA['n_stocks'] + 1
+        agent = PPOAgent(state_dim, action_dim, lr=params['learning_rate'], eps_clip=params['eps_clip'],
+                         k_epochs=params['k_epochs'], hidden_dim=params['hidden_dim'])
+
+    if task['snapshot'] is not None:
+        agent.restore_checkpoint(task['snapshot'])
+        agent.buffer = task['snapshot']['buffer']
+
+    # Basamak bazında tekrarlanabilir tohum
+    torch.manual_seed(task['seed'] * 100003 + task['start_episode'])
+    np.random.seed(task['seed'] * 100003 + task['start_episode'])
+
+    episode_rewards = []
+    episode_returns = []
+    for episode in range(task['start_episode'], task['end_episode']):
+        episode_reward, portfolio_history = run_episode(agent, env, action_dim, training=True)
+        episode_rewards.append(episode_reward)
+        episode_returns.append((portfolio_history[-1] / INITIAL_BALANCE - 1) * 100)
+
+        if (episode + 1) % params['update_frequency'] == 0:
+            agent.update()
+
+    snapshot = agent.get_checkpoint_snapshot()
+    snapshot['buffer'] = {key: list(values) for key, values in agent.buffer.items()}
+
+    return {
+        'trial_id': task['trial_id'],
+        'snapshot': snapshot,
+        'episode_rewards': episode_rewards,
+        'episode_returns': episode_returns,
+        'elapsed_seconds': time.perf_counter() - start_time
+    }
+
+
+def run_sweep(processed_data, trials=None, min_episodes=SWEEP_MIN_EPISODES, max_episodes=SWEEP_MAX_EPISODES,
+              reduction_factor=SWEEP_REDUCTION_FACTOR, n_workers=SWEEP_WORKERS,
+              cache_path="sweep_data_cache.npz", results_path="sweep_results.csv", seed=0):
+    """
+    Ardışık yarılama ile paralel hiperparametre araması
+
+    Basamak r'de hayatta kalan denemeler toplam min_episodes * eta^r
+    episode'a kadar eğitilir; skor son basamaktaki ortalama episode
+    ödülüdür. En iyi ceil(n / eta) deneme bir sonraki basamağa geçer.
+
+    Args:
+        processed_data (dict): İşlenmiş veri (önbelleğe yazılır)
+        trials (list): Deneme parametreleri (None ise sample_trials)
+        min_episodes (int): İlk basamak bütçesi
+        max_episodes (int): Deneme başına maksimum episode
+        reduction_factor (int): Eleme oranı (eta)
+        n_workers (int): Paralel süreç sayısı
+        cache_path (str): Ortak veri önbelleği
+        results_path (str): Sonuç tablosunun yazılacağı CSV
+        seed (int): Tohum
+
+    Returns:
+        pd.DataFrame: Deneme başına sonuç tablosu (skora göre sıralı)
+    """
+    trials = trials if trials is not None else sample_trials(seed=seed)
+    DataManager().save_cache(processed_data, cache_path)
+
+    records = {
+        trial_id: {'trial_id': trial_id, **params, 'status': 'running', 'rung': 0,
+                   'episodes': 0, 'score': np.nan, 'final_return_pct': np.nan, 'train_seconds': 0.0}
+        for trial_id, params in enumerate(trials)
+    }
+    snapshots = {trial_id: None for trial_id in records}
+    survivors = list(records)
+
+    print(f"\n🔎 Hiperparametre araması: {len(trials)} deneme, {n_workers} işçi, eta={reduction_factor}")
+    print("=" * 60)
+    sweep_start = time.perf_counter()
+
+    ctx = mp.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(cache_path,)) as pool:
+        rung = 0
+        budget = min_episodes
+        while survivors:
+            budget = min(budget, max_episodes)
+            tasks = [{
+                'trial_id': trial_id,
+                'params': trials[trial_id],
+                'snapshot': snapshots[trial_id],
+                'start_episode': records[trial_id]['episodes'],
+                'end_episode': budget,
+                'seed': seed + trial_id
+            } for trial_id in survivors]
+
+            for result in pool.map(_train_segment, tasks):
+                record = records[result['trial_id']]
+                snapshots[result['trial_id']] = result['snapshot']
+                record['rung'] = rung
+                record['episodes'] = budget
+                record['score'] = float(np.mean(result['episode_rewards']))
+                record['final_return_pct'] = float(np.mean(result['episode_returns']))
+                record['train_seconds'] += result['elapsed_seconds']
+
+            ranked = sorted(survivors, key=lambda trial_id: records[trial_id]['score'], reverse=True)
+            print(f"Basamak {rung}: {len(survivors)} deneme x {budget} episode | "
+                  f"en iyi skor {records[ranked[0]]['score']:.2f}")
+
+            if budget >= max_episodes:
+                for trial_id in survivors:
+                    records[trial_id]['status'] = 'completed'
+                break
+
+            keep = max(1, math.ceil(len(survivors) / reduction_factor))
+            for trial_id in ranked[keep:]:
+                records[trial_id]['status'] = 'pruned'
+                snapshots[trial_id] = None
+            survivors = ranked[:keep]
+            rung += 1
+            budget *= reduction_factor
+
+    elapsed = time.perf_counter() - sweep_start
+    table = pd.DataFrame(list(records.values()))
+    table['_order'] = table['status'].map({'completed': 0, 'pruned': 1})
+    table = table.sort_values(['_order', 'rung', 'score'], ascending=[True, False, False]).drop(columns='_order')
+    table.to_csv(results_path, index=False)
+
+    full_budget = len(trials) * max_episodes
+    used_budget = int(table['episodes'].sum())
+    print(f"\n✅ Arama tamamlandı: {elapsed:.1f} sn, {used_budget}/{full_budget} episode "
+          f"(%{used_budget / full_budget * 100:.0f} bütçe)")
+    print(f"Sonuçlar: {results_path}")
+
+    return table
+
+
+if __name__ == "__main__":
+    import argparse
+    from config import STOCK_SYMBOLS, DATA_PERIOD
+
+    parser = argparse.ArgumentParser(description="Paralel hiperparametre araması (successive halving)")
+    parser.add_argument("--trials", type=int, default=SWEEP_NUM_TRIALS, help="Deneme sayısı")
+    parser.add_argument("--workers", type=int, default=SWEEP_WORKERS, help="Paralel süreç sayısı")
+    parser.add_argument("--min-episodes", type=int, default=SWEEP_MIN_EPISODES, help="İlk basamak bütçesi")
+    parser.add_argument("--max-episodes", type=int, default=SWEEP_MAX_EPISODES, help="Maksimum bütçe")
+    parser.add_argument("--output", default="sweep_results.csv", help="Sonuç tablosu")
+    args = parser.parse_args()
+
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, DATA_PERIOD)
+    if len(raw_data) < 2:
+        print("❌ Yeterli veri bulunamadı!")
+    else:
+        results = run_sweep(data_manager.process_data(raw_data), trials=sample_trials(num_trials=args.trials),
+                            min_episodes=args.min_episodes, max_episodes=args.max_episodes,
+                            n_workers=args.workers, results_path=args.output)
+        print(results.head(10).to_string(index=False))
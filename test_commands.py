@@ -2,10 +2,8 @@
 Model Test Komutları - Pratik Test Fonksiyonları
 """
 
-import os
 import subprocess
 import sys
-import glob
 
 def test_best_model():
     """En iyi modeli test et"""
@@ -35,14 +33,16 @@ def test_latest_model():
     print("🔥 En son model test ediliyor...")
     print("-" * 50)
     
-    # En son model dosyasını bul
-    model_files = glob.glob("portfolio_results_agent_*.pt")
+    # En son kaydedilen koşuyu çalıştırma kaydından bul
+    from run_registry import RunRegistry
+    registry = RunRegistry()
+    latest_run = registry.latest_run()
     
-    if not model_files:
-        print("❌ Portfolio results modeli bulunamadı!")
+    if latest_run is None:
+        print("❌ Kayıtlı koşu bulunamadı!")
         return None
     
-    latest_model = sorted(model_files)[-1]  # En son tarihli
+    latest_model = registry.agent_path(latest_run)
     print(f"📁 Test edilen model: {latest_model}")
     
     try:
@@ -63,53 +63,35 @@ def test_latest_model():
         return None
 
 
-def compare_all_models():
-    """Tüm modelleri karşılaştır"""
+def compare_all_models(test_days=20):
+    """Tüm modelleri karşılaştır (veri bir kez yüklenir, modeller toplu değerlendirilir)"""
     print("🔍 TÜM MODELLER KARŞILAŞTIRILIYOR")
     print("=" * 60)
     
+    from batch_evaluation import find_checkpoints, evaluate_checkpoints, print_comparison_table
+    from data_manager import DataManager
+    from config import STOCK_SYMBOLS
+    
     # Tüm model dosyalarını bul
-    model_files = ["best_portfolio_agent.pt"]
-    model_files.extend(glob.glob("portfolio_results_agent_*.pt"))
+    model_files = find_checkpoints()
+    if not model_files:
+        print("❌ Model dosyası bulunamadı!")
+        return {}
     
-    results = {}
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, "6mo")
+    if len(raw_data) < 2:
+        print("❌ Test verisi bulunamadı!")
+        return {}
     
-    for model_file in model_files:
-        if os.path.exists(model_file):
-            print(f"\n📊 Test ediliyor: {model_file}")
-            
-            try:
-                from quick_test import quick_test_model
-                result = quick_test_model(model_file, test_days=20)  # Daha hızlı
-                
-                if result:
-                    results[model_file] = result
-                    print(f"   ✅ Final: ${result['final_value']:,.0f} | Getiri: %{result['total_return']:.2f}")
-                else:
-                    print(f"   ❌ Test başarısız!")
-                    
-            except Exception as e:
-                print(f"   ❌ Hata: {e}")
+    processed_data = data_manager.process_data(raw_data)
+    processed_data = data_manager.slice_data(processed_data, 0, min(test_days + 1, processed_data['n_days']))
     
-    # Karşılaştırma tablosu
-    if len(results) > 1:
-        print(f"\n🏆 KARŞILAŞTIRMA TABLOSU")
-        print("=" * 70)
-        print(f"{'Model':<35} {'Final Değer':<15} {'Getiri (%)':<12}")
-        print("-" * 70)
-        
-        # Getiriye göre sırala
-        sorted_results = sorted(results.items(), 
-                              key=lambda x: x[1]['total_return'], 
-                              reverse=True)
-        
-        for i, (model_name, result) in enumerate(sorted_results):
-            rank = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"{i+1}."
-            short_name = model_name.replace("portfolio_results_agent_", "").replace(".pt", "")[:30]
-            
-            print(f"{rank} {short_name:<30} ${result['final_value']:>12,.0f} {result['total_return']:>10.2f}%")
+    table, _, failures = evaluate_checkpoints(model_files, processed_data)
+    print_comparison_table(table, failures)
     
-    return results
+    return {row['model']: {'final_value': row['final_value'], 'total_return': row['total_return_pct']}
+            for _, row in table.iterrows()}
 
 
 def quick_performance_check():
@@ -168,6 +150,7 @@ def help_menu():
     print("4. quick_performance_check() - Hızlı performans kontrolü")
     print("\nDetaylı test için: python test_model.py")
     print("Hızlı test için: python quick_test.py")
+    print("Tüm komutlar için: python cli.py --help")
 
 
 if __name__ == "__main__":
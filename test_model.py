@@ -7,7 +7,8 @@ import matplotlib.pyplot as plt
 from data_manager import DataManager
 from environment import PortfolioEnvironment  
 from agents import PPOAgent
-from utils import PerformanceAnalyzer
+from utils import PerformanceAnalyzer, show_figure
+from bootstrap import bootstrap_metrics, print_bootstrap_report
 from config import *
 
 
@@ -53,7 +54,7 @@ def load_and_test_model(model_path="best_portfolio_agent.pt"):
     agent = PPOAgent(state_dim, action_dim)
     
     try:
-        agent.load_agent(model_path)
+        agent.load_policy(model_path)
         print(f"✅ Model yüklendi: {model_path}")
     except FileNotFoundError:
         print(f"❌ Model dosyası bulunamadı: {model_path}")
@@ -82,9 +83,18 @@ def load_and_test_model(model_path="best_portfolio_agent.pt"):
     # Performans raporu
     analyzer.print_performance_report(agent_metrics, benchmark_metrics)
     
+    # Agent ve benchmark farkının anlamlılığı (eşli blok bootstrap)
+    bootstrap_result = bootstrap_metrics(portfolio_history, benchmark_portfolio)
+    print_bootstrap_report(bootstrap_result)
+    benchmark_family_metrics = analyzer.print_benchmark_comparison(
+        agent_metrics, analyzer.create_benchmark_portfolios(processed_data['prices'], len(portfolio_history))
+    )
+    
     return {
         'agent_metrics': agent_metrics,
         'benchmark_metrics': benchmark_metrics,
+        'benchmark_family_metrics': benchmark_family_metrics,
+        'bootstrap': bootstrap_result,
         'portfolio_history': portfolio_history,
         'benchmark_portfolio': benchmark_portfolio
     }
@@ -194,7 +204,7 @@ def plot_test_results(agent_portfolio, benchmark_portfolio, stock_data):
     axes[1, 1].grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.show()
+    show_figure(fig, "test_results")
 
 
 def compare_multiple_models():
@@ -202,41 +212,23 @@ def compare_multiple_models():
     print("🔍 Birden Fazla Model Karşılaştırması")
     print("=" * 50)
     
-    models = [
-        "best_portfolio_agent.pt",
-        "portfolio_results_agent_*.pt"  # En son kaydedilen model
-    ]
-    
-    results = {}
-    
-    for model_path in models:
-        if model_path.endswith("*.pt"):
-            # En son modeli bul
-            import glob
-            model_files = glob.glob(model_path)
-            if model_files:
-                model_path = sorted(model_files)[-1]  # En son dosya
-            else:
-                continue
-        
-        print(f"\n📊 Test ediliyor: {model_path}")
-        result = load_and_test_model(model_path)
-        if result:
-            results[model_path] = result
-    
-    # Karşılaştırma tablosu
-    if len(results) > 1:
-        print("\n🏆 MODEL KARŞILAŞTIRMA TABLOSU")
-        print("=" * 70)
-        print(f"{'Model':<30} {'Final Değer':<15} {'Toplam Getiri':<15} {'Sharpe':<10}")
-        print("-" * 70)
-        
-        for model_name, result in results.items():
-            metrics = result['agent_metrics']
-            short_name = model_name.split('/')[-1][:25]
-            print(f"{short_name:<30} ${metrics['final_value']:>10,.0f} "
-                  f"{metrics['total_return_pct']:>12.2f}% "
-                  f"{metrics['sharpe_ratio']:>8.3f}")
+    from batch_evaluation import find_checkpoints, evaluate_checkpoints, print_comparison_table
+    
+    model_files = find_checkpoints()
+    if len(model_files) < 2:
+        return None
+    
+    # Veri bir kez indirilir, tüm modeller aynı veride toplu değerlendirilir
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, "1y")
+    if len(raw_data) < 2:
+        print("❌ Test verisi bulunamadı!")
+        return None
+    
+    table, _, failures = evaluate_checkpoints(model_files, data_manager.process_data(raw_data),
+                                              rank_by='sharpe_ratio')
+    print_comparison_table(table, failures)
+    return table
 
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+"""
+Ortak test fikstürleri: sentetik fiyat verisi
+"""
+
+import numpy as np
+import pytest
+
+from data_manager import DataManager
+
+N_STOCKS = 5
+N_DAYS = 60
+
+
+@pytest.fixture
+def processed_data():
+    """Rastgele yürüyüş fiyatlarından DataManager ile işlenmiş veri"""
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0005, 0.02, (N_STOCKS, N_DAYS))
+    prices = 10 * np.cumprod(1 + returns, axis=1)
+    raw = {f"S{i}.IS": prices[i] for i in range(N_STOCKS)}
+    return DataManager().process_data(raw)
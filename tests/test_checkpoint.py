@@ -0,0 +1,181 @@
+"""
+checkpoint.py gidiş-dönüş testleri: tek dosyalı / ayrık format çözümü
+"""
+
+import os
+import random
+
+import numpy as np
+import pytest
+import torch
+
+from agents import PPOAgent
+from checkpoint import (AsyncCheckpointWriter, create_resume_snapshot, load_policy_state, load_resume_checkpoint,
+                        load_weights, resolve_split_paths, restore_resume_checkpoint, weights_path_for,
+                        training_state_path_for, write_checkpoint)
+
+STATE_DIM = 12
+ACTION_DIM = 4
+HIDDEN_DIM = 16
+
+
+def make_agent(seed):
+    torch.manual_seed(seed)
+    return PPOAgent(STATE_DIM, ACTION_DIM, hidden_dim=HIDDEN_DIM)
+
+
+def assert_same_weights(state_dict, agent):
+    expected = agent.policy.state_dict()
+    assert state_dict.keys() == expected.keys()
+    for key, value in expected.items():
+        assert torch.equal(state_dict[key], value), key
+
+
+def age_file(path, seconds=60):
+    """Dosyanın mtime değerini geçmişe çek (aynı saniyede yazımları ayırt etmek için)"""
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+def test_monolithic_round_trip(tmp_path):
+    path = str(tmp_path / "agent.pt")
+    agent = make_agent(0)
+    agent.save_agent(path)
+
+    loaded = make_agent(1)
+    loaded.load_agent(path)
+    assert_same_weights(loaded.policy.state_dict(), agent)
+    assert_same_weights(loaded.policy_old.state_dict(), agent)
+    assert_same_weights(load_policy_state(path)['state_dict'], agent)
+
+
+def test_split_round_trip(tmp_path):
+    path = str(tmp_path / "agent.pt")
+    agent = make_agent(0)
+    agent.save_agent(path, split=True)
+
+    assert not os.path.exists(path)
+    assert resolve_split_paths(path) == (weights_path_for(path), training_state_path_for(path))
+    payload = load_weights(weights_path_for(path))
+    assert (payload['state_dim'], payload['action_dim'], payload['hidden_dim']) == (STATE_DIM, ACTION_DIM, HIDDEN_DIM)
+
+    loaded = make_agent(1)
+    loaded.load_agent(path)
+    assert_same_weights(loaded.policy.state_dict(), agent)
+    assert loaded.optimizer.state_dict()['param_groups'] == agent.optimizer.state_dict()['param_groups']
+
+
+def test_split_part_paths_resolve_to_pair(tmp_path):
+    path = str(tmp_path / "agent.pt")
+    make_agent(0).save_agent(path, split=True)
+    pair = (weights_path_for(path), training_state_path_for(path))
+    assert resolve_split_paths(pair[0]) == pair
+    assert resolve_split_paths(pair[1]) == pair
+
+
+def test_newer_split_pair_wins_over_stale_monolithic(tmp_path):
+    """Depodaki eski tek dosyalı checkpoint, eğitimin ayrık yazdığı yeni modeli gölgelememeli"""
+    path = str(tmp_path / "best_portfolio_agent.pt")
+    stale = make_agent(0)
+    torch.save(stale.get_checkpoint_snapshot(), path)
+    age_file(path)
+
+    fresh = make_agent(1)
+    write_checkpoint(fresh.get_checkpoint_snapshot(), path, split=True)
+
+    assert_same_weights(load_policy_state(path)['state_dict'], fresh)
+    loaded = make_agent(2)
+    loaded.load_agent(path)
+    assert_same_weights(loaded.policy.state_dict(), fresh)
+
+
+def test_newer_monolithic_wins_over_stale_split_pair(tmp_path):
+    path = str(tmp_path / "agent.pt")
+    stale = make_agent(0)
+    stale.save_agent(path, split=True)
+    age_file(weights_path_for(path))
+    age_file(training_state_path_for(path))
+
+    fresh = make_agent(1)
+    torch.save(fresh.get_checkpoint_snapshot(), path)
+
+    assert resolve_split_paths(path) is None
+    assert_same_weights(load_policy_state(path)['state_dict'], fresh)
+
+
+def test_split_write_replaces_monolithic_file(tmp_path):
+    """Eğitimin ayrık yazdığı en iyi model, yükleyicilerin çözdüğü tek dosya olmalı"""
+    path = str(tmp_path / "best_portfolio_agent.pt")
+    torch.save(make_agent(0).get_checkpoint_snapshot(), path)
+
+    fresh = make_agent(1)
+    write_checkpoint(fresh.get_checkpoint_snapshot(), path, split=True)
+
+    assert not os.path.exists(path)
+    assert resolve_split_paths(path) == (weights_path_for(path), training_state_path_for(path))
+    assert_same_weights(load_policy_state(path)['state_dict'], fresh)
+
+
+def test_monolithic_write_replaces_split_pair(tmp_path):
+    path = str(tmp_path / "agent.pt")
+    make_agent(0).save_agent(path, split=True)
+
+    fresh = make_agent(1)
+    write_checkpoint(fresh.get_checkpoint_snapshot(), path)
+
+    assert not os.path.exists(weights_path_for(path))
+    assert not os.path.exists(training_state_path_for(path))
+    assert resolve_split_paths(path) is None
+    assert_same_weights(load_policy_state(path)['state_dict'], fresh)
+
+
+def test_async_writer_output_is_what_loaders_resolve(tmp_path):
+    path = str(tmp_path / "best_portfolio_agent.pt")
+    torch.save(make_agent(0).get_checkpoint_snapshot(), path)
+
+    fresh = make_agent(1)
+    writer = AsyncCheckpointWriter(min_interval=0.0)
+    writer.submit(fresh, path, split=True)
+    writer.close()
+
+    assert not writer.errors
+    loaded = make_agent(2)
+    loaded.load_policy(path)
+    assert_same_weights(loaded.policy.state_dict(), fresh)
+
+
+def collect(agent, n_steps):
+    """Rastgele durumlarla buffer'a n_steps geçiş ekle (tüm RNG'leri kullanır)"""
+    for _ in range(n_steps):
+        state = np.random.randn(STATE_DIM).astype(np.float32)
+        action, log_prob, value = agent.select_action(state)
+        agent.store_transition(state, action, random.random(), log_prob, value, False)
+
+
+def continue_training(agent):
+    """Devam edilen eğitimi taklit et: rollout'u tamamla ve güncelle"""
+    collect(agent, 6)
+    agent.update()
+    return {key: value.clone() for key, value in agent.policy.state_dict().items()}
+
+
+@pytest.mark.parametrize("split", [False, True])
+def test_resume_round_trip_continues_identically(tmp_path, split):
+    path = str(tmp_path / "resume.pt")
+    random.seed(0)
+    np.random.seed(0)
+    agent = make_agent(0)
+    collect(agent, 8)
+    agent.update()
+    collect(agent, 3)  # Yarım kalmış rollout
+
+    write_checkpoint(create_resume_snapshot(agent, episode=7, best_value=1.5), path, split=split)
+    expected = continue_training(agent)
+
+    resumed = make_agent(1)
+    loop_state = restore_resume_checkpoint(resumed, load_resume_checkpoint(path))
+    assert loop_state == {'episode': 7, 'best_value': 1.5}
+    assert resumed.get_buffer_size() == 3
+    resumed_weights = continue_training(resumed)
+    for key, value in expected.items():
+        assert torch.equal(resumed_weights[key], value), key
@@ -0,0 +1,88 @@
+"""
+VectorizedPortfolioEnvironment ile PortfolioEnvironment eşdeğerlik testleri
+"""
+
+import numpy as np
+
+from environment import PortfolioEnvironment, VectorizedPortfolioEnvironment
+
+N_ENVS = 3
+
+
+def run_both(processed_data, actions):
+    """Aynı aksiyon dizisini vektörize ortamda ve N_ENVS ayrı ortamda oynat"""
+    vec_env = VectorizedPortfolioEnvironment(processed_data, N_ENVS)
+    envs = [PortfolioEnvironment(processed_data) for _ in range(N_ENVS)]
+
+    vec_states = [vec_env.reset()]
+    states = [np.stack([env.reset() for env in envs])]
+    vec_rewards, rewards = [], []
+    for step_actions in actions:
+        vec_state, vec_reward, vec_done, vec_info = vec_env.step(step_actions)
+        results = [env.step(action) for env, action in zip(envs, step_actions)]
+        vec_states.append(vec_state)
+        states.append(np.stack([result[0] for result in results]))
+        vec_rewards.append(vec_reward)
+        rewards.append([result[1] for result in results])
+        assert all(vec_done == np.array([result[2] for result in results]))
+        np.testing.assert_allclose(vec_info['portfolio_weights'],
+                                   np.stack([result[3]['portfolio_weights'] for result in results]))
+    return vec_env, envs, np.array(vec_states), np.array(states), np.array(vec_rewards), np.array(rewards)
+
+
+def test_random_actions_match_scalar_environments(processed_data):
+    rng = np.random.default_rng(1)
+    n_steps = processed_data['n_days'] - 1
+    actions = rng.normal(0, 2, (n_steps, N_ENVS, processed_data['n_stocks'] + 1))
+
+    vec_env, envs, vec_states, states, vec_rewards, rewards = run_both(processed_data, actions)
+
+    np.testing.assert_allclose(vec_states, states, rtol=1e-6, atol=1e-7)
+    np.testing.assert_allclose(vec_rewards, rewards, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(vec_env.portfolio_history, [env.portfolio_history for env in envs], rtol=1e-12)
+    np.testing.assert_allclose(vec_env.calculate_portfolio_value(),
+                               [env.calculate_portfolio_value() for env in envs], rtol=1e-12)
+
+
+def test_one_hot_actions_match_scalar_environments(processed_data):
+    rng = np.random.default_rng(2)
+    n_steps = processed_data['n_days'] - 1
+    action_dim = processed_data['n_stocks'] + 1
+    actions = np.stack([
+        VectorizedPortfolioEnvironment.action_vectors(rng.integers(0, action_dim, N_ENVS), action_dim)
+        for _ in range(n_steps)
+    ])
+
+    vec_env, envs, vec_states, states, vec_rewards, rewards = run_both(processed_data, actions)
+
+    np.testing.assert_allclose(vec_rewards, rewards, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(vec_env.portfolio_history, [env.portfolio_history for env in envs], rtol=1e-12)
+
+
+def test_step_past_end_is_terminal(processed_data):
+    vec_env = VectorizedPortfolioEnvironment(processed_data, N_ENVS)
+    env = PortfolioEnvironment(processed_data)
+    action = np.zeros((N_ENVS, processed_data['n_stocks'] + 1))
+    for _ in range(processed_data['n_days'] - 1):
+        vec_env.step(action)
+        env.step(action[0])
+
+    vec_state, vec_reward, vec_done, _ = vec_env.step(action)
+    state, reward, done, _ = env.step(action[0])
+    assert done and vec_done.all()
+    assert reward == 0 and not vec_reward.any()
+    np.testing.assert_array_equal(vec_state[0], state)
+
+
+def test_build_states_matches_get_state(processed_data):
+    env = PortfolioEnvironment(processed_data)
+    rng = np.random.default_rng(3)
+    states, steps, weights = [env.reset()], [env.current_step], [env.portfolio_weights.copy()]
+    done = False
+    while not done:
+        state, _, done, _ = env.step(rng.normal(0, 2, processed_data['n_stocks'] + 1))
+        states.append(state)
+        steps.append(env.current_step)
+        weights.append(env.portfolio_weights.copy())
+
+    np.testing.assert_array_equal(env.build_states(steps, weights), np.stack(states))
@@ -0,0 +1,151 @@
+"""
+history.py testleri: parçalı geçmiş, diske taşma, checkpoint gidiş-dönüşü
+"""
+
+import os
+import pickle
+import warnings
+
+import numpy as np
+import pytest
+
+from history import (ArrayHistory, new_history_dir, relativize_history_paths, resolve_history_paths)
+
+CHUNK = 8
+
+
+def filled(history, values):
+    history.extend(values)
+    return history
+
+
+@pytest.fixture(params=["spill", "memory"])
+def history(request, tmp_path):
+    spill_path = str(tmp_path / "values.bin") if request.param == "spill" else None
+    return ArrayHistory(spill_path, chunk_size=CHUNK)
+
+
+@pytest.mark.parametrize("n_values", [0, 3, CHUNK, 2 * CHUNK + 5, 5 * CHUNK + 1])
+def test_recent_values_match_list(history, n_values):
+    values = np.arange(n_values, dtype=np.float64) * 1.5
+    filled(history, values)
+
+    assert len(history) == n_values
+    if n_values:
+        assert history[-1] == values[-1]
+        assert history[-min(n_values, CHUNK)] == values[-min(n_values, CHUNK)]
+    # Bellekte en az son bir parça kadar değer her zaman bulunur
+    np.testing.assert_array_equal(history[-CHUNK:], values[-CHUNK:])
+    np.testing.assert_array_equal(history[-3:-1], values[-3:-1])
+    assert history.summary()['count'] == n_values
+    if n_values:
+        assert history.summary()['mean'] == pytest.approx(values.mean())
+        assert history.summary()['last'] == values[-1]
+
+
+def test_spilled_history_keeps_every_value(tmp_path):
+    values = np.random.default_rng(0).normal(size=5 * CHUNK + 3)
+    history = filled(ArrayHistory(str(tmp_path / "values.bin"), chunk_size=CHUNK), values)
+
+    np.testing.assert_array_equal(history.to_numpy(), values)
+    np.testing.assert_array_equal(np.asarray(history), values)
+    assert history[0] == values[0]
+    np.testing.assert_array_equal(history[3:CHUNK * 3], values[3:CHUNK * 3])
+    np.testing.assert_array_equal(history[::3], values[::3])
+
+
+def test_memory_history_is_bounded():
+    """Taşma dosyası yoksa bellekte ve checkpoint'te yalnızca son iki parça kalır"""
+    values = np.arange(50 * CHUNK + 3, dtype=np.float64)
+    history = filled(ArrayHistory(chunk_size=CHUNK), values)
+
+    state = history.state_dict()
+    assert len(state['values']) + len(state['previous']) <= 2 * CHUNK
+    longer = filled(ArrayHistory(chunk_size=CHUNK), np.arange(500 * CHUNK + 3, dtype=np.float64))
+    assert len(pickle.dumps(longer.state_dict())) < 1.1 * len(pickle.dumps(state))
+
+    np.testing.assert_array_equal(history[-CHUNK - 3:], values[-CHUNK - 3:])
+    assert history.summary()['count'] == len(values)
+    assert history.summary()['max'] == values.max()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert np.isnan(history[0])
+
+
+def test_state_dict_round_trip(history):
+    values = np.arange(3 * CHUNK + 2, dtype=np.float64)
+    filled(history, values)
+
+    restored = ArrayHistory(history.spill_path, chunk_size=CHUNK)
+    restored.load_state_dict(pickle.loads(pickle.dumps(history.state_dict())))
+
+    assert len(restored) == len(values)
+    assert restored.summary() == history.summary()
+    np.testing.assert_array_equal(restored[-CHUNK - 2:], values[-CHUNK - 2:])
+
+    restored.extend([100.0] * CHUNK)
+    assert restored[-1] == 100.0
+    assert restored[-CHUNK - 1] == values[-1]
+
+
+def test_resume_truncates_values_written_after_checkpoint(tmp_path):
+    spill_path = str(tmp_path / "values.bin")
+    history = filled(ArrayHistory(spill_path, chunk_size=CHUNK), range(2 * CHUNK + 1))
+    state = history.state_dict()
+    # Checkpoint'ten sonra yazılıp kaybolan eğitim
+    history.extend([-1.0] * 3 * CHUNK)
+
+    resumed = ArrayHistory(spill_path, chunk_size=CHUNK)
+    resumed.load_state_dict(state)
+    resumed.extend(range(2 * CHUNK + 1, 4 * CHUNK))
+
+    np.testing.assert_array_equal(resumed.to_numpy(), np.arange(4 * CHUNK))
+    assert os.path.getsize(spill_path) == 4 * CHUNK * 8
+
+
+def test_missing_spill_file_falls_back_to_summary(tmp_path):
+    spill_path = str(tmp_path / "values.bin")
+    history = filled(ArrayHistory(spill_path, chunk_size=CHUNK), np.arange(3 * CHUNK, dtype=np.float64))
+    state = history.state_dict()
+    os.remove(spill_path)
+
+    restored = ArrayHistory(chunk_size=CHUNK)
+    restored.load_state_dict(state)
+    assert not restored.spill_available
+    assert restored.summary()['last'] == 3 * CHUNK - 1
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert np.isnan(restored.to_numpy()).all()
+
+
+def test_legacy_list_state_loads(history):
+    history.load_state_dict([1.0, 2.0, 3.0])
+    assert len(history) == 3
+    assert history[-1] == 3.0
+
+
+def test_history_paths_are_relative_to_checkpoint(tmp_path):
+    run_dir = tmp_path / "run"
+    history = filled(ArrayHistory(str(run_dir / "hist" / "values.bin"), chunk_size=CHUNK), range(2 * CHUNK))
+    checkpoint = {'loop_state': {'episode_rewards': history.state_dict()}, 'other': [1, 2]}
+
+    relative = relativize_history_paths(checkpoint, str(run_dir))
+    assert relative['loop_state']['episode_rewards']['spill_path'] == os.path.join("hist", "values.bin")
+    assert os.path.isabs(checkpoint['loop_state']['episode_rewards']['spill_path'])
+
+    # Dizin taşınsa da göreli yol yeni konuma göre çözülür
+    moved = tmp_path / "moved"
+    os.rename(run_dir, moved)
+    resolve_history_paths(relative, str(moved))
+    restored = ArrayHistory(chunk_size=CHUNK)
+    restored.load_state_dict(relative['loop_state']['episode_rewards'])
+    np.testing.assert_array_equal(restored.to_numpy(), np.arange(2 * CHUNK))
+
+
+def test_new_history_dir_is_unique(tmp_path):
+    checkpoint_path = str(tmp_path / "resume_checkpoint.pt")
+    first = new_history_dir(checkpoint_path)
+    os.makedirs(first)
+    second = new_history_dir(checkpoint_path)
+    assert first != second
+    assert os.path.dirname(first) == str(tmp_path / "resume_checkpoint_history")
@@ -0,0 +1,76 @@
+"""
+Vektörize PerformanceAnalyzer.calculate_performance_metrics eşdeğerlik testleri
+"""
+
+import numpy as np
+import pytest
+
+from utils import PerformanceAnalyzer
+
+INITIAL_BALANCE = 10000
+SHARED_KEYS = ['final_value', 'total_return_pct', 'annualized_volatility_pct', 'sharpe_ratio',
+               'max_drawdown_pct', 'win_rate_pct', 'total_days', 'positive_days', 'negative_days']
+
+
+def reference_metrics(portfolio_history, initial_balance):
+    """Vektörleştirmeden önceki tek portföylük hesaplama"""
+    portfolio_values = np.array(portfolio_history)
+    final_value = portfolio_values[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily_returns = np.diff(portfolio_values) / portfolio_values[:-1]
+    daily_returns = daily_returns[np.isfinite(daily_returns)]
+    cumulative_max = np.maximum.accumulate(portfolio_values)
+    positive_days = np.sum(daily_returns > 0)
+    negative_days = np.sum(daily_returns < 0)
+    return {
+        'final_value': final_value,
+        'total_return_pct': (final_value / initial_balance - 1) * 100,
+        'annualized_volatility_pct': np.std(daily_returns) * np.sqrt(252) * 100,
+        'sharpe_ratio': np.mean(daily_returns) / (np.std(daily_returns) + 1e-8) * np.sqrt(252),
+        'max_drawdown_pct': np.min((portfolio_values - cumulative_max) / cumulative_max * 100),
+        # Eski kod hiç artı/eksi gün yoksa 0/0 = NaN veriyordu; vektörize sürüm 0 döndürür
+        'win_rate_pct': positive_days / (positive_days + negative_days) * 100 if positive_days + negative_days else 0,
+        'total_days': len(portfolio_values),
+        'positive_days': positive_days,
+        'negative_days': negative_days
+    }
+
+
+@pytest.fixture
+def histories():
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0005, 0.02, (6, 80))
+    values = INITIAL_BALANCE * np.cumprod(np.concatenate([np.ones((6, 1)), 1 + returns], axis=1), axis=1)
+    # Sabit bir portföy ve sıfırdan geçen bir portföy (NaN/inf getiriler atlanır)
+    values[4] = INITIAL_BALANCE
+    values[5, 40:43] = 0.0
+    return values
+
+
+def test_single_history_matches_reference(histories):
+    analyzer = PerformanceAnalyzer()
+    for history in histories:
+        metrics = analyzer.calculate_performance_metrics(list(history), INITIAL_BALANCE)
+        expected = reference_metrics(history, INITIAL_BALANCE)
+        for key in SHARED_KEYS:
+            assert np.isscalar(metrics[key]) or np.ndim(metrics[key]) == 0, key
+            np.testing.assert_allclose(metrics[key], expected[key], rtol=1e-10, atol=1e-10, err_msg=key)
+
+
+def test_batch_matches_per_row(histories):
+    analyzer = PerformanceAnalyzer()
+    weights = np.random.default_rng(1).dirichlet(np.ones(4), size=(len(histories), histories.shape[1]))
+    batch = analyzer.calculate_performance_metrics(histories, INITIAL_BALANCE, weights_history=weights)
+    for i, history in enumerate(histories):
+        row = analyzer.calculate_performance_metrics(history, INITIAL_BALANCE, weights_history=weights[i])
+        for key, value in row.items():
+            batch_value = batch[key][i] if np.ndim(batch[key]) else batch[key]
+            np.testing.assert_allclose(batch_value, value, rtol=1e-12, err_msg=key)
+
+
+def test_turnover_is_mean_weight_change():
+    analyzer = PerformanceAnalyzer()
+    weights = np.array([[1.0, 0.0], [0.5, 0.5], [0.5, 0.5]])
+    metrics = analyzer.calculate_performance_metrics([100.0, 101.0, 102.0], 100.0, weights_history=weights)
+    assert metrics['turnover'] == pytest.approx(0.5)
+    assert np.isnan(analyzer.calculate_performance_metrics([100.0, 101.0], 100.0)['turnover'])
@@ -0,0 +1,35 @@
+"""
+timing.py testleri: @timed sarmalayıcısının yalnızca ölçüm açıkken bağlanması
+"""
+
+from timing import PhaseTimer
+
+
+class Sample:
+    pass
+
+
+def test_timed_binds_wrapper_only_while_enabled():
+    timer = PhaseTimer(enabled=False)
+
+    def double(self, value):
+        return value * 2
+
+    double.__qualname__ = "Sample.double"
+    double.__module__ = __name__
+    Sample.double = timer.timed("sample.double")(double)
+
+    # Kapalıyken özgün fonksiyon, ek çağrı çerçevesi yok
+    assert Sample.double is double
+    assert Sample().double(2) == 4
+    assert timer.phases == {}
+
+    timer.enable()
+    assert Sample.double is not double
+    assert Sample().double(3) == 6
+    assert timer.phases["sample.double"].count == 1
+
+    timer.disable()
+    assert Sample.double is double
+    Sample().double(4)
+    assert timer.phases["sample.double"].count == 1
@@ -0,0 +1,211 @@
+"""
+Faz Zamanlayıcı - Eğitim döngüsünün sıcak yollarını ölçen hafif araç
+
+Fazlar bağlam yöneticisi (with TIMER.phase("env.step")) veya dekoratör
+(@TIMER.timed("env.get_state")) ile sarılır. Süreler monotonik
+perf_counter_ns ile ölçülür ve faz başına toplam, sayaç ve log2 kovalı
+histogramda (nanosaniye, 2'nin kuvvetleri) biriktirilir; yüzdelikler
+histogramdan yaklaşık (en fazla 2 kat) hesaplanır. Zamanlayıcı kapalıyken
+phase() paylaşılan boş bir bağlam döndürür. Dekoratör fonksiyonu
+değiştirmeden kaydeder; ölçen sarmalayıcı yalnızca enable() ile sınıfa /
+modüle bağlanır, böylece kapalıyken sıcak yola ek çağrı çerçevesi girmez.
+"""
+
+import contextlib
+import functools
+import sys
+import time
+
+from config import TIMING_ENABLED
+
+# Histogram kova sayısı (kova b: 2^(b-1) <= süre_ns < 2^b, ~2^40 ns = 18 dk üst sınır)
+N_BUCKETS = 41
+
+# Raporda sayaç adlarının gösterimi
+RATE_LABELS = {'steps': 'adım', 'updates': 'güncelleme', 'episodes': 'episode'}
+
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class _PhaseStats:
+    """Tek bir fazın sayaç, toplam süre ve histogramı"""
+
+    __slots__ = ('count', 'total_ns', 'max_ns', 'histogram', '_start')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * N_BUCKETS
+        self._start = 0
+
+    def record(self, elapsed_ns):
+        """Bir ölçümü ekle"""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.histogram[min(elapsed_ns.bit_length(), N_BUCKETS - 1)] += 1
+
+    def percentile_ns(self, q):
+        """Histogramdan yaklaşık yüzdelik (kova üst sınırı, ns)"""
+        target = q / 100 * self.count
+        cumulative = 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            cumulative += bucket_count
+            if bucket_count and cumulative >= target:
+                return min(2 ** bucket, self.max_ns)
+        return self.max_ns
+
+    # Bağlam yöneticisi olarak kullanım (faz başına tek nesne; aynı faz iç içe açılmaz)
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.record(time.perf_counter_ns() - self._start)
+        return False
+
+
+class PhaseTimer:
+    """
+    Faz başına süre histogramları ve adım / güncelleme hızları
+
+    Ölçümler bir rapor penceresi boyunca biriktirilir; report() pencereyi
+    yazdırır ve sıfırlar.
+    """
+
+    def __init__(self, enabled=TIMING_ENABLED):
+        """
+        Args:
+            enabled (bool): Ölçüm açık mı
+        """
+        self.enabled = enabled
+        self._timed_functions = []
+        self.reset()
+
+    def enable(self):
+        """Ölçümü aç ve @timed fonksiyonların ölçen sürümlerini bağla"""
+        self.enabled = True
+        self._bind_timed(True)
+
+    def disable(self):
+        """Ölçümü kapat ve @timed fonksiyonların özgün hallerini geri bağla"""
+        self.enabled = False
+        self._bind_timed(False)
+
+    def reset(self):
+        """Rapor penceresini sıfırla"""
+        self.phases = {}
+        self.counters = {}
+        self._window_start = time.perf_counter_ns()
+
+    def phase(self, name):
+        """
+        Fazı ölçen bağlam yöneticisi
+
+        Args:
+            name (str): Faz adı
+
+        Returns:
+            Bağlam yöneticisi (kapalıyken paylaşılan boş bağlam)
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = _PhaseStats()
+        return stats
+
+    def timed(self, name):
+        """
+        Fonksiyonu faz olarak ölçen dekoratör
+
+        Fonksiyon kaydedilir ve (zamanlayıcı kapalıysa) değiştirilmeden
+        döndürülür; enable() ölçen sarmalayıcıyı sınıf / modül özniteliği
+        olarak bağlar. Sınıf metotları ve modül düzeyi fonksiyonlar içindir;
+        "from modül import fonksiyon" ile alınmış kopyalar etkilenmez.
+
+        Args:
+            name (str): Faz adı
+        """
+        def decorator(function):
+            self._timed_functions.append((function, name))
+            return self._timed_wrapper(function, name) if self.enabled else function
+        return decorator
+
+    def _timed_wrapper(self, function, name):
+        """function'ı name fazı olarak ölçen sarmalayıcı"""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def _bind_timed(self, timed):
+        """Kayıtlı fonksiyonları sahiplerine ölçen veya özgün halleriyle yeniden bağla"""
+        for function, name in self._timed_functions:
+            owner = sys.modules[function.__module__]
+            *path, attribute = function.__qualname__.split(".")
+            for part in path:
+                owner = getattr(owner, part)
+            setattr(owner, attribute, self._timed_wrapper(function, name) if timed else function)
+
+    def count(self, name, amount=1):
+        """Adım, güncelleme gibi olay sayaçlarını artır"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self):
+        """
+        Pencerenin özeti
+
+        Returns:
+            dict: elapsed_seconds, olay başına saniyelik hızlar ('<sayaç>_per_second')
+                ve faz başına count, total_seconds, share_pct, mean_us, p50_us, p99_us, max_us
+        """
+        elapsed_ns = max(time.perf_counter_ns() - self._window_start, 1)
+        result = {'elapsed_seconds': elapsed_ns / 1e9, 'phases': {}}
+        for name, amount in self.counters.items():
+            result[f'{name}_per_second'] = amount / (elapsed_ns / 1e9)
+        for name, stats in self.phases.items():
+            result['phases'][name] = {
+                'count': stats.count,
+                'total_seconds': stats.total_ns / 1e9,
+                'share_pct': stats.total_ns / elapsed_ns * 100,
+                'mean_us': stats.total_ns / max(stats.count, 1) / 1e3,
+                'p50_us': stats.percentile_ns(50) / 1e3,
+                'p99_us': stats.percentile_ns(99) / 1e3,
+                'max_us': stats.max_ns / 1e3
+            }
+        return result
+
+    def report(self, reset=True):
+        """
+        Pencere özetini tablo olarak yazdır
+
+        İç içe fazlar (ör. select_action içindeki tensor_conversion) üst
+        fazın payına da dahildir; paylar bu yüzden %100'ü geçebilir.
+
+        Args:
+            reset (bool): Yazdırdıktan sonra pencereyi sıfırla
+
+        Returns:
+            dict: summary() çıktısı
+        """
+        summary = self.summary()
+        rates = ", ".join(f"{summary[f'{name}_per_second']:,.1f} {RATE_LABELS.get(name, name)}/sn"
+                          for name in self.counters)
+        print(f"   ⏱️  Faz süreleri ({summary['elapsed_seconds']:.1f} sn): {rates}")
+        print(f"      {'Faz':<22} {'Çağrı':>8} {'Toplam (sn)':>12} {'Pay (%)':>8} "
+              f"{'Ort (µs)':>10} {'p50 (µs)':>10} {'p99 (µs)':>10}")
+        for name, stats in sorted(summary['phases'].items(), key=lambda item: -item[1]['total_seconds']):
+            print(f"      {name:<22} {stats['count']:>8} {stats['total_seconds']:>12.3f} {stats['share_pct']:>8.1f} "
+                  f"{stats['mean_us']:>10.1f} {stats['p50_us']:>10.1f} {stats['p99_us']:>10.1f}")
+        if reset:
+            self.reset()
+        return summary
+
+
+# Eğitim döngüsü, agent ve ortam tarafından paylaşılan zamanlayıcı
+TIMER = PhaseTimer()
@@ -0,0 +1,43 @@
+"""
+Eğitim Yardımcıları - Tekrar kullanılabilir episode döngüsü
+"""
+
+import numpy as np
+
+
+def run_episode(agent, env, action_dim, training=True):
+    """
+    Ortamda bir episode çalıştır
+
+    Eğitim modunda aksiyonlar örneklenir ve geçişler agent buffer'ına
+    yazılır; değerlendirme modunda en olası aksiyon seçilir.
+
+    Args:
+        agent: PPO agent
+        env: Portföy ortamı
+        action_dim (int): Aksiyon boyutu
+        training (bool): Eğitim modunda mı
+
+    Returns:
+        tuple: (episode_reward, portfolio_history)
+    """
+    state = env.reset()
+    episode_reward = 0
+    done = False
+
+    while not done:
+        action_idx, log_prob, value = agent.select_action(state, training=training)
+
+        action_vector = np.zeros(action_dim)
+        action_vector[action_idx] = 1.0
+
+        step = env.current_step
+        next_state, reward, done, info = env.step(action_vector)
+
+        if training:
+            agent.store_transition(state, action_idx, reward, log_prob, value, done, step=step)
+
+        state = next_state
+        episode_reward += reward
+
+    return episode_reward, list(env.portfolio_history)
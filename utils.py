@@ -2,11 +2,16 @@
 Yardımcı Fonksiyonlar ve Görselleştirme Araçları
 """
 
+import os
+import sys
+
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 import pandas as pd
-from datetime import datetime
-from config import FIGURE_SIZE, PLOT_ALPHA, INITIAL_BALANCE
+from run_registry import RunRegistry
+from config import (FIGURE_SIZE, PLOT_ALPHA, INITIAL_BALANCE, TRANSACTION_COST,
+                    BENCHMARK_REBALANCE_FREQUENCY, BENCHMARK_LOOKBACK, PLOT_MODE, PLOT_DIR, PLOT_MAX_POINTS)
 
 
 class PerformanceAnalyzer:
@@ -15,53 +20,94 @@ class PerformanceAnalyzer:
     def __init__(self):
         self.results = {}
     
-    def calculate_performance_metrics(self, portfolio_history, initial_balance=INITIAL_BALANCE):
+    def calculate_performance_metrics(self, portfolio_history, initial_balance=INITIAL_BALANCE,
+                                      weights_history=None):
         """
         Portföy performans metriklerini hesapla
         
+        Tek bir portföy geçmişi (liste / 1-B dizi) veya (n_portföy, n_gün)
+        boyutlu bir matris kabul eder; matris için tüm satırların metrikleri
+        tek bir vektörize geçişte hesaplanır.
+        
         Args:
-            portfolio_history (list): Portföy değer geçmişi
+            portfolio_history (list | np.array): Portföy değer geçmişi [n_gün] veya [n_portföy, n_gün]
             initial_balance (float): Başlangıç sermayesi
+            weights_history (np.array): Adım başına portföy ağırlıkları
+                [n_gün, n_varlık] veya [n_portföy, n_gün, n_varlık] (turnover için, opsiyonel)
             
         Returns:
-            dict: Performans metrikleri
+            dict: Performans metrikleri (1-B girdide skaler, 2-B girdide [n_portföy] diziler)
         """
-        portfolio_values = np.array(portfolio_history)
+        portfolio_values = np.asarray(portfolio_history, dtype=np.float64)
+        single = portfolio_values.ndim == 1
+        portfolio_values = np.atleast_2d(portfolio_values)
         
         # Temel metrikler
-        final_value = portfolio_values[-1]
+        final_value = portfolio_values[:, -1]
         total_return = (final_value / initial_balance - 1) * 100
         
-        # Günlük getiriler
-        daily_returns = np.diff(portfolio_values) / portfolio_values[:-1]
-        daily_returns = daily_returns[np.isfinite(daily_returns)]  # NaN ve inf temizle
+        # Günlük getiriler (NaN ve inf değerler hesaba katılmaz)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            daily_returns = np.diff(portfolio_values, axis=1) / portfolio_values[:, :-1]
+        finite = np.isfinite(daily_returns)
+        daily_returns = np.where(finite, daily_returns, 0.0)
+        n_returns = np.maximum(finite.sum(axis=1), 1)
         
         # Risk metrikleri
-        volatility = np.std(daily_returns) * np.sqrt(252) * 100  # Yıllık volatilite
-        sharpe_ratio = np.mean(daily_returns) / (np.std(daily_returns) + 1e-8) * np.sqrt(252)
+        mean_return = daily_returns.sum(axis=1) / n_returns
+        deviations = np.where(finite, daily_returns - mean_return[:, None], 0.0)
+        std_return = np.sqrt((deviations ** 2).sum(axis=1) / n_returns)
+        downside_std = np.sqrt((np.minimum(daily_returns, 0.0) ** 2).sum(axis=1) / n_returns)
+        
+        volatility = std_return * np.sqrt(252) * 100  # Yıllık volatilite
+        sharpe_ratio = mean_return / (std_return + 1e-8) * np.sqrt(252)
+        sortino_ratio = mean_return / (downside_std + 1e-8) * np.sqrt(252)
         
         # Drawdown hesaplama
-        cumulative_max = np.maximum.accumulate(portfolio_values)
+        cumulative_max = np.maximum.accumulate(portfolio_values, axis=1)
         drawdowns = (portfolio_values - cumulative_max) / cumulative_max * 100
-        max_drawdown = np.min(drawdowns)
+        max_drawdown = drawdowns.min(axis=1)
+        
+        # Calmar: yıllıklandırılmış getiri / |max drawdown|
+        growth = final_value / initial_balance
+        annualized_return = np.where(growth > 0, np.abs(growth) ** (252 / n_returns) - 1, -1.0) * 100
+        calmar_ratio = annualized_return / (np.abs(max_drawdown) + 1e-8)
         
         # Kazanan/Kaybeden günler
-        positive_days = np.sum(daily_returns > 0)
-        negative_days = np.sum(daily_returns < 0)
-        win_rate = positive_days / (positive_days + negative_days) * 100 if len(daily_returns) > 0 else 0
+        positive_days = (daily_returns > 0).sum(axis=1)
+        negative_days = (daily_returns < 0).sum(axis=1)
+        decided_days = positive_days + negative_days
+        win_rate = np.where(decided_days > 0, positive_days / np.maximum(decided_days, 1) * 100, 0.0)
+        
+        # Turnover: ardışık ağırlık vektörleri arasındaki ortalama mutlak değişim
+        turnover = np.full(len(portfolio_values), np.nan)
+        if weights_history is not None:
+            weights = np.asarray(weights_history, dtype=np.float64)
+            if weights.ndim == 2:
+                weights = weights[None]
+            if weights.shape[1] > 1:
+                turnover = np.abs(np.diff(weights, axis=1)).sum(axis=2).mean(axis=1)
         
         metrics = {
             'final_value': final_value,
             'total_return_pct': total_return,
+            'annualized_return_pct': annualized_return,
             'annualized_volatility_pct': volatility,
             'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
             'max_drawdown_pct': max_drawdown,
+            'calmar_ratio': calmar_ratio,
             'win_rate_pct': win_rate,
-            'total_days': len(portfolio_values),
+            'turnover': turnover,
+            'total_days': portfolio_values.shape[1],
             'positive_days': positive_days,
             'negative_days': negative_days
         }
         
+        if single:
+            metrics = {key: value[0] if isinstance(value, np.ndarray) else value
+                       for key, value in metrics.items()}
+        
         return metrics
     
     def create_benchmark_portfolio(self, stock_data, portfolio_length):
@@ -76,24 +122,89 @@ class PerformanceAnalyzer:
             list: Benchmark portföy değerleri
         """
         n_stocks = len(stock_data)
-        stock_names = list(stock_data.keys())
         
-        benchmark_portfolio = []
+        # Her hissenin ilk güne göre fiyat oranı; verisi biten hisse başlangıç değerinde kalır
+        relative_prices = np.ones((n_stocks, portfolio_length))
+        for i, prices in enumerate(stock_data.values()):
+            prices = np.asarray(prices, dtype=np.float64).reshape(-1)[:portfolio_length]
+            relative_prices[i, :len(prices)] = prices / prices[0]
         
-        for day in range(portfolio_length):
-            portfolio_value = 0
-            
-            for stock_name in stock_names:
-                if day < len(stock_data[stock_name]):
-                    # Her hisse senedine eşit ağırlık
-                    daily_return = stock_data[stock_name][day] / stock_data[stock_name][0]
-                    portfolio_value += (INITIAL_BALANCE / n_stocks) * daily_return
-                else:
-                    portfolio_value += INITIAL_BALANCE / n_stocks
-            
-            benchmark_portfolio.append(portfolio_value)
+        benchmark_portfolio = (INITIAL_BALANCE / n_stocks) * relative_prices.sum(axis=0)
+        return benchmark_portfolio.tolist()
+    
+    def create_benchmark_portfolios(self, prices, portfolio_length=None,
+                                    rebalance_frequency=BENCHMARK_REBALANCE_FREQUENCY,
+                                    lookback=BENCHMARK_LOOKBACK, transaction_cost=TRANSACTION_COST,
+                                    initial_balance=INITIAL_BALANCE):
+        """
+        Fiyat matrisinden birden fazla benchmark ailesini tek geçişte oluştur
         
-        return benchmark_portfolio
+        Aileler: eşit ağırlık al-tut, periyodik yeniden dengelenen eşit ağırlık,
+        ters volatilite ve minimum varyans. İşlem maliyeti PortfolioEnvironment
+        ile aynı kuralla, önceki hedef ağırlıklara göre toplam mutlak ağırlık
+        değişimi x transaction_cost x portföy değeri olarak düşülür (başlangıç
+        portföyü tamamen nakittir).
+        
+        Args:
+            prices (np.array | dict): [n_hisse, n_gün] fiyat matrisi veya hisse -> fiyat dizisi
+            portfolio_length (int): Benchmark uzunluğu (None ise tüm günler)
+            rebalance_frequency (int): Kaç günde bir yeniden dengeleme
+            lookback (int): Volatilite / kovaryans tahmin penceresi (gün)
+            transaction_cost (float): İşlem maliyeti oranı
+            initial_balance (float): Başlangıç sermayesi
+            
+        Returns:
+            dict: Benchmark adı -> [gün] portföy değerleri
+        """
+        if isinstance(prices, dict):
+            min_length = min(len(values) for values in prices.values())
+            prices = np.array([np.asarray(values, dtype=np.float64).reshape(-1)[:min_length]
+                               for values in prices.values()])
+        prices = np.asarray(prices, dtype=np.float64)
+        if portfolio_length is not None:
+            prices = prices[:, :portfolio_length]
+        n_stocks, n_days = prices.shape
+        
+        rebalance_days = np.arange(0, max(n_days - 1, 1), rebalance_frequency)
+        equal_weights = np.full((len(rebalance_days), n_stocks), 1.0 / n_stocks)
+        
+        # Yeniden dengeleme günlerine kadar olan getiri pencereleri: [K, n_hisse, lookback]
+        daily_returns = np.diff(prices, axis=1) / prices[:, :-1]
+        windows = np.lib.stride_tricks.sliding_window_view(daily_returns, lookback, axis=1) \
+            if daily_returns.shape[1] >= lookback else np.empty((n_stocks, 0, lookback))
+        window_index = rebalance_days - lookback
+        has_history = window_index >= 0
+        estimation = windows[:, np.clip(window_index, 0, max(windows.shape[1] - 1, 0))].transpose(1, 0, 2) \
+            if windows.shape[1] else np.zeros((len(rebalance_days), n_stocks, lookback))
+        
+        # Ters volatilite ağırlıkları
+        volatility = estimation.std(axis=2) + 1e-8
+        inverse_volatility = (1 / volatility) / (1 / volatility).sum(axis=1, keepdims=True)
+        
+        # Minimum varyans: küçültülmüş kovaryansla kapalı form, sonra negatifler kırpılır (yalnızca uzun)
+        centered = estimation - estimation.mean(axis=2, keepdims=True)
+        covariance = centered @ centered.transpose(0, 2, 1) / max(lookback - 1, 1)
+        diagonal = np.einsum('kii->ki', covariance)
+        covariance = 0.9 * covariance + 0.1 * np.einsum('ki,ij->kij', diagonal, np.eye(n_stocks))
+        covariance += 1e-10 * np.eye(n_stocks)
+        raw_minimum_variance = np.linalg.solve(covariance, np.ones((len(rebalance_days), n_stocks, 1)))[..., 0]
+        minimum_variance = np.clip(raw_minimum_variance, 0, None)
+        minimum_variance_sum = minimum_variance.sum(axis=1, keepdims=True)
+        minimum_variance = np.where(minimum_variance_sum > 0, minimum_variance / np.where(
+            minimum_variance_sum > 0, minimum_variance_sum, 1.0), equal_weights)
+        
+        # Geçmişi yetersiz dengeleme günlerinde eşit ağırlık kullan
+        inverse_volatility = np.where(has_history[:, None], inverse_volatility, equal_weights)
+        minimum_variance = np.where(has_history[:, None], minimum_variance, equal_weights)
+        
+        names = ['equal_weight_buy_hold', 'equal_weight_rebalanced', 'inverse_volatility', 'minimum_variance']
+        target_weights = np.stack([equal_weights, equal_weights, inverse_volatility, minimum_variance])
+        rebalance_mask = np.ones((len(names), len(rebalance_days)), dtype=bool)
+        rebalance_mask[0, 1:] = False  # Al-tut yalnızca ilk gün alır
+        
+        values = _simulate_rebalanced(prices, target_weights, rebalance_days, rebalance_mask,
+                                      transaction_cost, initial_balance)
+        return dict(zip(names, values))
     
     def plot_training_results(self, episode_rewards, portfolio_values, training_metrics=None):
         """
@@ -104,18 +215,22 @@ class PerformanceAnalyzer:
             portfolio_values (list): Portföy değerleri
             training_metrics (dict): Eğitim metrikleri (opsiyonel)
         """
+        # Liste veya ArrayHistory girdilerini diziye çevir
+        episode_rewards = np.asarray(episode_rewards)
+        portfolio_values = np.asarray(portfolio_values)
+        
         fig_height = 15 if training_metrics else 10
         fig, axes = plt.subplots(2, 2, figsize=(FIGURE_SIZE[0], fig_height))
         
         # Episode ödülleri
-        axes[0, 0].plot(episode_rewards, alpha=PLOT_ALPHA)
+        axes[0, 0].plot(*downsample_series(episode_rewards), alpha=PLOT_ALPHA)
         axes[0, 0].set_title('Episode Ödülleri', fontsize=14)
         axes[0, 0].set_xlabel('Episode')
         axes[0, 0].set_ylabel('Ödül')
         axes[0, 0].grid(True, alpha=0.3)
         
         # Portföy değeri gelişimi
-        axes[0, 1].plot(portfolio_values, alpha=PLOT_ALPHA, label='DRL Agent')
+        axes[0, 1].plot(*downsample_series(portfolio_values), alpha=PLOT_ALPHA, label='DRL Agent')
         axes[0, 1].axhline(y=INITIAL_BALANCE, color='r', linestyle='--', 
                           label=f'Başlangıç (${INITIAL_BALANCE:,})', alpha=PLOT_ALPHA)
         axes[0, 1].set_title('Portföy Değeri Gelişimi', fontsize=14)
@@ -126,8 +241,8 @@ class PerformanceAnalyzer:
         
         # Hareketli ortalama ödüller
         if len(episode_rewards) > 50:
-            moving_avg = pd.Series(episode_rewards).rolling(window=50).mean()
-            axes[1, 0].plot(moving_avg, color='orange', alpha=PLOT_ALPHA)
+            moving_avg = pd.Series(episode_rewards).rolling(window=50).mean().to_numpy()
+            axes[1, 0].plot(*downsample_series(moving_avg), color='orange', alpha=PLOT_ALPHA)
             axes[1, 0].set_title('Hareketli Ortalama Ödüller (50 Episode)', fontsize=14)
             axes[1, 0].set_xlabel('Episode')
             axes[1, 0].set_ylabel('Ortalama Ödül')
@@ -144,10 +259,10 @@ class PerformanceAnalyzer:
             axes[1, 1].grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.show()
+        show_figure(fig, "training_results")
         
         # Eğitim metrikleri varsa ayrı bir figür oluştur
-        if training_metrics and training_metrics.get('total_losses'):
+        if training_metrics and len(training_metrics.get('total_losses', [])):
             self._plot_training_metrics(training_metrics)
     
     def _plot_training_metrics(self, training_metrics):
@@ -155,35 +270,35 @@ class PerformanceAnalyzer:
         fig, axes = plt.subplots(2, 2, figsize=FIGURE_SIZE)
         
         # Actor Loss
-        axes[0, 0].plot(training_metrics['actor_losses'])
+        axes[0, 0].plot(*downsample_series(training_metrics['actor_losses']))
         axes[0, 0].set_title('Actor Loss')
         axes[0, 0].set_xlabel('Güncelleme')
         axes[0, 0].set_ylabel('Loss')
         axes[0, 0].grid(True, alpha=0.3)
         
         # Critic Loss
-        axes[0, 1].plot(training_metrics['critic_losses'])
+        axes[0, 1].plot(*downsample_series(training_metrics['critic_losses']))
         axes[0, 1].set_title('Critic Loss')
         axes[0, 1].set_xlabel('Güncelleme')
         axes[0, 1].set_ylabel('Loss')
         axes[0, 1].grid(True, alpha=0.3)
         
         # Total Loss
-        axes[1, 0].plot(training_metrics['total_losses'])
+        axes[1, 0].plot(*downsample_series(training_metrics['total_losses']))
         axes[1, 0].set_title('Total Loss')
         axes[1, 0].set_xlabel('Güncelleme')
         axes[1, 0].set_ylabel('Loss')
         axes[1, 0].grid(True, alpha=0.3)
         
         # Entropy
-        axes[1, 1].plot(training_metrics['entropies'])
+        axes[1, 1].plot(*downsample_series(training_metrics['entropies']))
         axes[1, 1].set_title('Policy Entropy')
         axes[1, 1].set_xlabel('Güncelleme')
         axes[1, 1].set_ylabel('Entropy')
         axes[1, 1].grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.show()
+        show_figure(fig, "training_metrics")
     
     def plot_final_comparison(self, agent_portfolio, benchmark_portfolio, stock_data):
         """
@@ -197,9 +312,8 @@ class PerformanceAnalyzer:
         fig, axes = plt.subplots(2, 1, figsize=FIGURE_SIZE)
         
         # Portföy karşılaştırması
-        days = range(len(agent_portfolio))
-        axes[0].plot(days, agent_portfolio, label='DRL Agent', linewidth=2)
-        axes[0].plot(days, benchmark_portfolio[:len(agent_portfolio)], 
+        axes[0].plot(*downsample_series(agent_portfolio), label='DRL Agent', linewidth=2)
+        axes[0].plot(*downsample_series(benchmark_portfolio[:len(agent_portfolio)]), 
                     label='Eşit Ağırlık Portföyü', alpha=PLOT_ALPHA, linewidth=2)
         axes[0].axhline(y=INITIAL_BALANCE, color='r', linestyle='--', 
                        label=f'Başlangıç (${INITIAL_BALANCE:,})', alpha=PLOT_ALPHA)
@@ -215,8 +329,7 @@ class PerformanceAnalyzer:
         for i, stock_name in enumerate(stock_names):
             if len(stock_data[stock_name]) > 0:
                 normalized_prices = np.array(stock_data[stock_name]) / stock_data[stock_name][0]
-                stock_days = range(len(normalized_prices))
-                axes[1].plot(stock_days, normalized_prices, 
+                axes[1].plot(*downsample_series(normalized_prices), 
                            label=stock_name.replace('.IS', ''), alpha=PLOT_ALPHA)
         
         axes[1].set_title('Bireysel Hisse Senedi Performansı (Normalize)', fontsize=16)
@@ -226,7 +339,7 @@ class PerformanceAnalyzer:
         axes[1].grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.show()
+        show_figure(fig, "final_comparison")
     
     def print_performance_report(self, agent_metrics, benchmark_metrics):
         """
@@ -249,7 +362,9 @@ class PerformanceAnalyzer:
             ('Toplam Getiri', 'total_return_pct', '{:.2f}%'),
             ('Yıllık Volatilite', 'annualized_volatility_pct', '{:.2f}%'),
             ('Sharpe Oranı', 'sharpe_ratio', '{:.3f}'),
+            ('Sortino Oranı', 'sortino_ratio', '{:.3f}'),
             ('Max Drawdown', 'max_drawdown_pct', '{:.2f}%'),
+            ('Calmar Oranı', 'calmar_ratio', '{:.3f}'),
             ('Kazanma Oranı', 'win_rate_pct', '{:.1f}%')
         ]
         
@@ -283,9 +398,255 @@ class PerformanceAnalyzer:
         print(f"Risk-Getiri Profili: Agent'ın Sharpe oranı {agent_metrics['sharpe_ratio']:.3f}")
         print("="*70)
 
+    
+    def print_benchmark_comparison(self, agent_metrics, benchmarks):
+        """
+        Agent'ı birden fazla benchmark ailesiyle karşılaştır
+        
+        Args:
+            agent_metrics (dict): Agent performans metrikleri
+            benchmarks (dict): Benchmark adı -> portföy değerleri (create_benchmark_portfolios çıktısı)
+            
+        Returns:
+            dict: Benchmark adı -> performans metrikleri
+        """
+        names = list(benchmarks)
+        batch_metrics = self.calculate_performance_metrics(np.array([benchmarks[name] for name in names]))
+        benchmark_metrics = {
+            name: {key: value[i] if isinstance(value, np.ndarray) else value for key, value in batch_metrics.items()}
+            for i, name in enumerate(names)
+        }
+        
+        print(f"\n{'Strateji':<28} {'Getiri (%)':>11} {'Sharpe':>8} {'Sortino':>8} {'Max DD (%)':>11}")
+        print("-" * 70)
+        for name, metrics in [('DRL Agent', agent_metrics)] + list(benchmark_metrics.items()):
+            print(f"{name:<28} {metrics['total_return_pct']:>10.2f}% {metrics['sharpe_ratio']:>8.3f} "
+                  f"{metrics['sortino_ratio']:>8.3f} {metrics['max_drawdown_pct']:>10.2f}%")
+        print("=" * 70)
+        
+        return benchmark_metrics
+
+def _simulate_rebalanced(prices, target_weights, rebalance_days, rebalance_mask,
+                         transaction_cost, initial_balance):
+    """
+    Periyodik yeniden dengelenen portföyleri tek dizi işlemiyle simüle et
+    
+    Dengeleme günleri arasında hisse adetleri sabittir; dengeleme
+    maliyeti ağırlık değişimine bağlı olduğundan her segmentin büyüme
+    çarpanı bağımsız hesaplanır ve kümülatif çarpımla birleştirilir.
+    Dengeleme yapmayan stratejilerde pozisyon (kaymış ağırlıklarla) korunur.
+    PortfolioEnvironment'taki gibi t günündeki değer, t-1'de alınan
+    pozisyonun t fiyatlarıyla değeridir.
+    
+    Args:
+        prices (np.array): [n_hisse, n_gün] fiyat matrisi
+        target_weights (np.array): [n_strateji, K, n_hisse] dengeleme günlerindeki hedef ağırlıklar
+        rebalance_days (np.array): [K] dengeleme günleri (ilki 0)
+        rebalance_mask (np.array): [n_strateji, K] strateji o gün dengeleme yapıyor mu
+        transaction_cost (float): İşlem maliyeti oranı
+        initial_balance (float): Başlangıç sermayesi
+        
+    Returns:
+        np.array: [n_strateji, n_gün] portföy değerleri
+    """
+    n_strategies = target_weights.shape[0]
+    n_days = prices.shape[1]
+    
+    # Dengeleme yapılmayan günlerde önceki hedef ağırlık geçerli kalır
+    active = np.maximum.accumulate(np.where(rebalance_mask, np.arange(len(rebalance_days)), 0), axis=1)
+    weights = np.take_along_axis(target_weights, active[:, :, None], axis=1)
+    
+    # İşlem maliyeti çarpanı: PortfolioEnvironment gibi nakit dahil ağırlık vektöründe
+    # sum|yeni - eski|; başlangıç ağırlıkları ortamın reset() durumudur (tamamen nakit)
+    full_weights = np.concatenate([weights, 1 - weights.sum(axis=2, keepdims=True)], axis=2)
+    initial_weights = np.zeros_like(full_weights[:, :1])
+    initial_weights[..., -1] = 1.0
+    previous = np.concatenate([initial_weights, full_weights[:, :-1]], axis=1)
+    turnover = np.abs(full_weights - previous).sum(axis=2)
+    cost_factor = np.where(rebalance_mask, 1 - turnover * transaction_cost, 1.0)
+    
+    # Her segmentin değerlemesi son gerçek dengeleme gününün fiyatlarına göre yapılır
+    base_days = rebalance_days[active]  # [n_strateji, K]
+    
+    def growth(days, segments):
+        """Segment ağırlıklarıyla, segment tabanına göre fiyat oranı toplamı"""
+        segment_base = np.take_along_axis(base_days, segments, axis=1)
+        relative_prices = prices[:, None, days] / prices[:, segment_base]  # [n_hisse, n_strateji, n]
+        return np.einsum('sni,isn->sn', np.take_along_axis(weights, segments[:, :, None], axis=1),
+                         relative_prices)
+    
+    all_segments = np.broadcast_to(np.arange(len(rebalance_days)), active.shape)
+    segment_end = np.append(rebalance_days[1:], n_days - 1)
+    growth_start = growth(rebalance_days, all_segments)
+    growth_end = growth(segment_end, all_segments)
+    
+    # t günü, t-1'de kurulan pozisyonla değerlenir
+    day_segment = np.clip(np.searchsorted(rebalance_days, np.arange(n_days), side='right') - 1, 0, None)
+    day_segment = np.concatenate([[0], day_segment[:-1]])
+    day_segments = np.broadcast_to(day_segment, (n_strategies, n_days))
+    
+    segment_factor = cost_factor * growth_end / growth_start
+    carried = np.cumprod(np.concatenate([np.ones((n_strategies, 1)), segment_factor[:, :-1]], axis=1), axis=1)
+    
+    values = initial_balance * (carried * cost_factor / growth_start)[:, day_segment] * \
+        growth(np.arange(n_days), day_segments)
+    values[:, 0] = initial_balance
+    return values
+
+
+def lttb_indices(y, n_out, x=None):
+    """
+    Largest-Triangle-Three-Buckets ile seyreltilecek noktaların indeksleri
+    
+    İlk ve son nokta korunur; aradaki her kovadan, bir önceki seçili nokta ve
+    sonraki kovanın ortalamasıyla en büyük üçgeni oluşturan nokta seçilir.
+    Tepe ve çukurlar böylece korunur.
+    
+    Args:
+        y (np.array): [n] değerler (sonlu)
+        n_out (int): Çıktı nokta sayısı
+        x (np.array): [n] artan x değerleri (None ise indeks)
+        
+    Returns:
+        np.array: [n_out] seçilen indeksler (artan)
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    
+    # n_out - 2 kova; kova i = [edges[i], edges[i + 1])
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges[-1] = n - 1
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (end, edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
 
-def setup_plotting():
-    """Matplotlib ayarlarını yapılandır"""
+def minmax_indices(y, n_out):
+    """
+    Min/max seyreltme: her kovanın en küçük ve en büyük noktasının indeksleri
+    
+    Tamamen vektörizedir; milyonlarca noktada LTTB'den hızlıdır ve uç
+    değerleri kesin olarak korur.
+    
+    Args:
+        y (np.array): [n] değerler (sonlu)
+        n_out (int): Yaklaşık çıktı nokta sayısı
+        
+    Returns:
+        np.array: Seçilen indeksler (artan, tekil)
+    """
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+    
+    bucket_size = -(-n // n_buckets)
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(n_buckets, bucket_size)
+    valid_rows = ~np.isnan(padded).all(axis=1)
+    offsets = np.arange(n_buckets)[valid_rows] * bucket_size
+    padded = padded[valid_rows]
+    
+    indices = np.concatenate([offsets + np.nanargmin(padded, axis=1), offsets + np.nanargmax(padded, axis=1),
+                              [0, n - 1]])
+    return np.unique(indices)
+
+
+def downsample_series(y, max_points=PLOT_MAX_POINTS, x=None, method="lttb"):
+    """
+    Çizim için şekli koruyarak seyreltilmiş (x, y) dizileri
+    
+    Sonlu olmayan değerler (ör. hareketli ortalamanın ilk günleri) atılır.
+    
+    Args:
+        y (array-like): Seri (liste, np.array veya ArrayHistory)
+        max_points (int): Maksimum nokta sayısı
+        x (array-like): x değerleri (None ise indeks)
+        method (str): "lttb" veya "minmax"
+        
+    Returns:
+        tuple: (x, y) np.array çifti
+    """
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(len(y)) if x is None else np.asarray(x)
+    finite = np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    
+    if method == "lttb":
+        indices = lttb_indices(y, max_points, x)
+    elif method == "minmax":
+        indices = minmax_indices(y, max_points)
+    else:
+        raise ValueError(f"Bilinmeyen seyreltme yöntemi: {method}")
+    return x[indices], y[indices]
+
+
+def resolve_plot_mode(mode=PLOT_MODE):
+    """
+    "auto" çizim modunu "show" veya "file" olarak çöz
+    
+    Etkileşimsiz bir backend (ör. Agg) seçiliyse veya Linux'ta ekran
+    (DISPLAY / WAYLAND_DISPLAY) yoksa figürler dosyaya yazılır.
+    """
+    if mode != "auto":
+        return mode
+    if matplotlib.get_backend().lower() in ('agg', 'pdf', 'ps', 'svg', 'cairo', 'template'):
+        return "file"
+    if sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        return "file"
+    return "show"
+
+
+def show_figure(fig, name, mode=None, output_dir=PLOT_DIR):
+    """
+    Figürü göster veya (dosya modunda) PNG olarak kaydedip kapat
+    
+    Args:
+        fig: Matplotlib figürü
+        name (str): Dosya adı (uzantısız)
+        mode (str): "show", "file" veya "auto" (None ise config.PLOT_MODE)
+        output_dir (str): Dosya modunda hedef dizin
+        
+    Returns:
+        str: Kaydedilen dosya yolu (gösterildiyse None)
+    """
+    if resolve_plot_mode(mode or PLOT_MODE) == "show":
+        plt.show()
+        return None
+    
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{name}.png")
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    print(f"🖼️  Grafik kaydedildi: {path}")
+    return path
+
+
+def setup_plotting(mode=PLOT_MODE):
+    """
+    Matplotlib ayarlarını yapılandır
+    
+    Args:
+        mode (str): Çizim modu; "file" (veya ekransız "auto") ise
+            etkileşimsiz Agg backend'i seçilir
+    """
+    if resolve_plot_mode(mode) == "file":
+        plt.switch_backend('Agg')
     plt.style.use('default')
     plt.rcParams['figure.figsize'] = FIGURE_SIZE
     plt.rcParams['font.size'] = 10
@@ -319,34 +680,28 @@ def convert_numpy_types(obj):
         return obj
 
 
-def save_results(agent, environment, metrics, filename_prefix="portfolio_results"):
+def save_results(agent, environment, metrics, filename_prefix="portfolio_results", artifacts=None):
     """
-    Sonuçları kaydet
+    Sonuçları çalıştırma kaydına (runs/<run_id>/) kaydet
     
     Args:
         agent: Eğitilmiş agent
         environment: Ortam
         metrics: Performans metrikleri
-        filename_prefix: Dosya adı öneki
+        filename_prefix: Koşu kimliği öneki
+        artifacts (dict): Koşu klasörüne taşınacak ek çıktılar (ad -> yol)
+        
+    Returns:
+        str: Koşu kimliği
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # Agent'ı kaydet
-    agent_filename = f"{filename_prefix}_agent_{timestamp}.pt"
-    agent.save_agent(agent_filename)
-    
-    # Metrikleri JSON serileştirilebilir hale getir
-    serializable_metrics = convert_numpy_types(metrics)
+    registry = RunRegistry()
+    run_id = registry.save_run(agent, metrics, prefix=filename_prefix, artifacts=artifacts)
     
-    # Metrikleri kaydet
-    metrics_filename = f"{filename_prefix}_metrics_{timestamp}.json"
-    import json
-    with open(metrics_filename, 'w') as f:
-        json.dump(serializable_metrics, f, indent=2)
-    
-    print(f"Sonuçlar kaydedildi:")
-    print(f"- Agent: {agent_filename}")
-    print(f"- Metrikler: {metrics_filename}")
+    print(f"Sonuçlar kaydedildi: {registry.run_path(run_id)}")
+    print(f"- Agent: {registry.agent_path(run_id)}")
+    print(f"- Seriler: {registry.run_path(run_id, 'series.npz')}")
+    print(f"- İndeks: {registry.index_path}")
+    return run_id
 
 
 def print_system_info():
@@ -363,4 +718,50 @@ def print_system_info():
     if torch.cuda.is_available():
         print(f"CUDA Versiyonu: {torch.version.cuda}")
         print(f"GPU: {torch.cuda.get_device_name(0)}")
-    print("="*50) 
\ No newline at end of file
+    print("="*50) 
+
+
+def benchmark_performance_metrics(path_counts=(100, 1000, 10000, 50000), n_days=252, seed=0):
+    """
+    Vektörize metrik hesabını portföy başına döngü ile karşılaştır
+    
+    Args:
+        path_counts (tuple): Denenecek portföy (yol) sayıları
+        n_days (int): Yol uzunluğu
+        seed (int): Rastgele yol üretim tohumu
+        
+    Returns:
+        list: Her yol sayısı için süre ölçümleri
+    """
+    import time
+    
+    analyzer = PerformanceAnalyzer()
+    rng = np.random.default_rng(seed)
+    results = []
+    
+    print(f"{'Yol Sayısı':>12} {'Vektörize (sn)':>16} {'Döngü (sn)':>12} {'Hızlanma':>10}")
+    print("-" * 54)
+    for n_paths in path_counts:
+        daily_returns = rng.normal(0.0004, 0.015, size=(n_paths, n_days - 1))
+        paths = INITIAL_BALANCE * np.cumprod(np.hstack([np.ones((n_paths, 1)), 1 + daily_returns]), axis=1)
+        
+        start_time = time.perf_counter()
+        analyzer.calculate_performance_metrics(paths)
+        vectorized_seconds = time.perf_counter() - start_time
+        
+        # Döngü süresi en fazla 1000 yol üzerinden ölçülüp ölçeklenir
+        loop_paths = min(n_paths, 1000)
+        start_time = time.perf_counter()
+        for path in paths[:loop_paths]:
+            analyzer.calculate_performance_metrics(path)
+        loop_seconds = (time.perf_counter() - start_time) * n_paths / loop_paths
+        
+        results.append({'n_paths': n_paths, 'vectorized_seconds': vectorized_seconds, 'loop_seconds': loop_seconds})
+        print(f"{n_paths:>12,} {vectorized_seconds:>16.4f} {loop_seconds:>12.4f} "
+              f"{loop_seconds / vectorized_seconds:>9.1f}x")
+    
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_performance_metrics()
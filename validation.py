@@ -0,0 +1,222 @@
+"""
+Arka Plan Doğrulama - Eğitim sırasında ayrılmış pencerede periyodik değerlendirme
+
+Politikanın anlık görüntüsü tek işçili bir süreç havuzuna gönderilir ve
+eğitimde kullanılmayan doğrulama penceresinde deterministik bir episode
+ile değerlendirilir. Eğitim döngüsü sonucu beklemez; poll() ile biten
+değerlendirmeler toplanır, en iyi model doğrulama metriğine göre seçilir
+ve iyileşme olmadığında erken durdurma sinyali verilir.
+"""
+
+import contextlib
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+import torch
+
+from agents import PPOAgent
+from environment import PortfolioEnvironment
+from trainer import run_episode
+from utils import PerformanceAnalyzer
+from config import VALIDATION_METRIC, EARLY_STOPPING_PATIENCE
+
+# Küçük değeri iyi olan metrikler (drawdown negatif tutulduğu için büyük olan iyidir)
+_LOWER_IS_BETTER = {'annualized_volatility_pct'}
+
+# İşçi süreç başına bir kez oluşturulan doğrulama ortamı ve agent
+_WORKER_STATE = {}
+
+
+def _init_worker(validation_data):
+    """İşçi süreç başlatıcı: doğrulama ortamını bir kez oluştur"""
+    torch.set_num_threads(1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _WORKER_STATE['env'] = PortfolioEnvironment(validation_data)
+    _WORKER_STATE['action_dim'] = validation_data['n_stocks'] + 1
+
+
+def _evaluate_policy(task):
+    """
+    Politika ağırlıklarını doğrulama penceresinde değerlendir
+
+    Returns:
+        dict: Doğrulama metrikleri
+    """
+    start_time = time.perf_counter()
+    key = (task['state_dim'], task['action_dim'], task['hidden_dim'])
+    agent = _WORKER_STATE.get(key)
+    if agent is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent = PPOAgent(task['state_dim'], task['action_dim'], hidden_dim=task['hidden_dim'])
+        # Doğrulama deterministik ağla yapılır (dropout kapalı); eğitimdeki agent etkilenmez
+        agent.policy_old.eval()
+        _WORKER_STATE[key] = agent
+
+    agent.policy_old.load_state_dict(task['policy_state_dict'])
+    agent.inference_model = None
+    _, portfolio_history = run_episode(agent, _WORKER_STATE['env'], _WORKER_STATE['action_dim'], training=False)
+
+    metrics = PerformanceAnalyzer().calculate_performance_metrics(portfolio_history)
+    metrics['elapsed_seconds'] = time.perf_counter() - start_time
+    return metrics
+
+
+class BackgroundValidator:
+    """
+    Eğitimi bloklamayan periyodik doğrulayıcı
+
+    Aynı anda en fazla bir değerlendirme çalışır ve bir tanesi bekler;
+    kuyruk doluyken gelen yeni istek bekleyen eski isteğin yerini alır.
+    """
+
+    def __init__(self, validation_data, metric=VALIDATION_METRIC, patience=EARLY_STOPPING_PATIENCE):
+        """
+        Args:
+            validation_data (dict): Eğitimde kullanılmayan doğrulama verisi
+            metric (str): En iyi modeli seçmede kullanılan metrik
+            patience (int): İyileşmesiz değerlendirme sayısı (0: erken durdurma kapalı)
+        """
+        self.metric = metric
+        self.patience = patience
+        self.history = []
+        self.best_score = None
+        self.best_episode = None
+        self.evaluations_since_best = 0
+        self.replaced = 0
+        self.last_submitted_episode = None
+
+        self._running = None
+        self._queued = None
+        self._executor = ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context('spawn'),
+                                             initializer=_init_worker, initargs=(validation_data,))
+
+    def _is_better(self, score):
+        """Skor şimdiye kadarki en iyiden iyi mi"""
+        if self.best_score is None:
+            return True
+        if self.metric in _LOWER_IS_BETTER:
+            return score < self.best_score
+        return score > self.best_score
+
+    def _start_next(self):
+        """Bekleyen isteği işçiye gönder"""
+        if self._running is None and self._queued is not None:
+            episode, snapshot = self._queued
+            self._queued = None
+            future = self._executor.submit(_evaluate_policy, {
+                'policy_state_dict': snapshot['policy_state_dict'],
+                'state_dim': snapshot['state_dim'],
+                'action_dim': snapshot['action_dim'],
+                'hidden_dim': snapshot['hidden_dim']
+            })
+            self._running = (episode, snapshot, future)
+
+    def submit(self, agent, episode):
+        """
+        Politikanın anlık görüntüsünü doğrulama için gönder (hemen döner)
+
+        Args:
+            agent (PPOAgent): Değerlendirilecek agent
+            episode (int): Anlık görüntünün alındığı episode
+        """
+        self._enqueue(episode, agent.get_checkpoint_snapshot())
+
+    def _enqueue(self, episode, snapshot):
+        """Anlık görüntüyü kuyruğa koy; işçi boşsa hemen başlat"""
+        if self._queued is not None:
+            self.replaced += 1
+        self._queued = (episode, snapshot)
+        self.last_submitted_episode = episode
+        self._start_next()
+
+    def poll(self, wait=False):
+        """
+        Biten değerlendirmeleri topla
+
+        Args:
+            wait (bool): Çalışan değerlendirmeyi bitene kadar bekle
+
+        Returns:
+            list: (episode, metrics, snapshot, is_best) demetleri; is_best True olan
+                anlık görüntü yeni en iyi modeldir
+        """
+        completed = []
+        while self._running is not None and (wait or self._running[2].done()):
+            episode, snapshot, future = self._running
+            self._running = None
+            metrics = future.result()
+            score = metrics[self.metric]
+            is_best = self._is_better(score)
+            if is_best:
+                self.best_score = score
+                self.best_episode = episode
+                self.evaluations_since_best = 0
+            else:
+                self.evaluations_since_best += 1
+
+            self.history.append({'episode': episode, **metrics})
+            completed.append((episode, metrics, snapshot, is_best))
+            self._start_next()
+        return completed
+
+    def state_dict(self):
+        """
+        Devam ettirilebilir checkpoint'e yazılacak durum
+
+        Çalışan ve bekleyen değerlendirmeler anlık görüntüleriyle saklanır;
+        load_state_dict ile aynı sırada yeniden kuyruğa alınır.
+
+        Returns:
+            dict: Geçmiş, en iyi skor / episode, sabır sayacı ve bekleyen değerlendirmeler
+        """
+        pending = [self._running[:2]] if self._running is not None else []
+        if self._queued is not None:
+            pending.append(self._queued)
+        return {
+            'history': list(self.history),
+            'best_score': self.best_score,
+            'best_episode': self.best_episode,
+            'evaluations_since_best': self.evaluations_since_best,
+            'replaced': self.replaced,
+            'last_submitted_episode': self.last_submitted_episode,
+            'pending': pending
+        }
+
+    def load_state_dict(self, state):
+        """
+        state_dict çıktısından geri yükle ve bekleyen değerlendirmeleri yeniden başlat
+
+        Args:
+            state (dict): Kaydedilmiş durum
+        """
+        self.history = list(state['history'])
+        self.best_score = state['best_score']
+        self.best_episode = state['best_episode']
+        self.evaluations_since_best = state['evaluations_since_best']
+        for episode, snapshot in state['pending']:
+            self._enqueue(episode, snapshot)
+        self.replaced = state['replaced']
+        self.last_submitted_episode = state['last_submitted_episode']
+
+    @property
+    def should_stop(self):
+        """Erken durdurma koşulu sağlandı mı"""
+        return self.patience > 0 and self.evaluations_since_best >= self.patience
+
+    def close(self, wait=True):
+        """
+        Doğrulayıcıyı kapat
+
+        Args:
+            wait (bool): Bekleyen değerlendirmeleri tamamla
+
+        Returns:
+            list: Kapanırken tamamlanan değerlendirmeler
+        """
+        completed = self.poll(wait=True) if wait else []
+        if not wait:
+            self._queued = None
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        return completed
@@ -0,0 +1,214 @@
+"""
+Paralel Walk-Forward Backtest Motoru
+
+Hizalanmış fiyat matrisi kayan eğitim/test katlarına (fold) bölünür; her
+kat ayrı bir işçi süreçte kendi eğitim penceresinde eğitilip hemen
+ardından gelen ve eğitimde görülmemiş test penceresinde değerlendirilir.
+Katlar paralel çalıştığı için toplam süre en yavaş kat kadardır.
+"""
+
+import contextlib
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+import numpy as np
+import pandas as pd
+import torch
+
+from agents import PPOAgent
+from data_manager import DataManager
+from environment import PortfolioEnvironment
+from trainer import run_episode
+from utils import PerformanceAnalyzer
+from config import (UPDATE_FREQUENCY, WALK_FORWARD_TRAIN_DAYS, WALK_FORWARD_TEST_DAYS,
+                    WALK_FORWARD_EPISODES, WALK_FORWARD_WORKERS)
+
+# Karşılaştırma tablosunda katlar arası toplanan metrikler
+SUMMARY_METRICS = ['total_return_pct', 'annualized_volatility_pct', 'sharpe_ratio',
+                   'max_drawdown_pct', 'win_rate_pct']
+
+
+def make_folds(n_days, train_days=WALK_FORWARD_TRAIN_DAYS, test_days=WALK_FORWARD_TEST_DAYS,
+               step_days=None, anchored=False):
+    """
+    Kayan (veya sabit başlangıçlı) eğitim/test katlarını oluştur
+
+    Args:
+        n_days (int): Toplam gün sayısı
+        train_days (int): Eğitim penceresi uzunluğu
+        test_days (int): Test penceresi uzunluğu
+        step_days (int): Katlar arası kayma (None ise test_days)
+        anchored (bool): True ise eğitim penceresi her zaman 0. günden başlar
+
+    Returns:
+        list: (train_start, train_end, test_start, test_end) demetleri
+    """
+    step_days = step_days or test_days
+    folds = []
+    train_end = train_days
+    while train_end + test_days <= n_days:
+        train_start = 0 if anchored else train_end - train_days
+        folds.append((train_start, train_end, train_end, train_end + test_days))
+        train_end += step_days
+    return folds
+
+
+def _run_fold(task):
+    """
+    Bir katı eğit ve test penceresinde değerlendir
+
+    Returns:
+        dict: Kat sonuçları (agent ve benchmark metrikleri, portföy geçmişi)
+    """
+    torch.set_num_threads(1)
+    torch.manual_seed(task['seed'])
+    np.random.seed(task['seed'])
+    start_time = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        data_manager = DataManager()
+        full_data = data_manager.load_cache(task['cache_path'])
+        train_start, train_end, test_start, test_end = task['fold']
+        train_data = data_manager.slice_data(full_data, train_start, train_end)
+        test_data = data_manager.slice_data(full_data, test_start, test_end)
+
+        train_env = PortfolioEnvironment(train_data)
+        test_env = PortfolioEnvironment(test_data)
+        state_dim = len(train_env.get_state())
+        action_dim = train_data['n_stocks'] + 1
+        agent = PPOAgent(state_dim, action_dim)
+
+    for episode in range(task['num_episodes']):
+        run_episode(agent, train_env, action_dim, training=True)
+        if (episode + 1) % task['update_frequency'] == 0:
+            agent.update()
+
+    _, test_portfolio = run_episode(agent, test_env, action_dim, training=False)
+
+    analyzer = PerformanceAnalyzer()
+    stock_data = {name: test_data['prices'][i] for i, name in enumerate(test_data['stock_names'])}
+    benchmark_portfolio = analyzer.create_benchmark_portfolio(stock_data, len(test_portfolio))
+
+    return {
+        'fold_id': task['fold_id'],
+        'fold': task['fold'],
+        'agent_metrics': analyzer.calculate_performance_metrics(test_portfolio),
+        'benchmark_metrics': analyzer.calculate_performance_metrics(benchmark_portfolio),
+        'test_portfolio': test_portfolio,
+        'elapsed_seconds': time.perf_counter() - start_time
+    }
+
+
+def run_walk_forward(processed_data, train_days=WALK_FORWARD_TRAIN_DAYS, test_days=WALK_FORWARD_TEST_DAYS,
+                     step_days=None, anchored=False, num_episodes=WALK_FORWARD_EPISODES,
+                     update_frequency=UPDATE_FREQUENCY, n_workers=WALK_FORWARD_WORKERS,
+                     cache_path="walk_forward_data_cache.npz", seed=0):
+    """
+    Walk-forward backtest'i paralel işçi süreçlerde çalıştır
+
+    Args:
+        processed_data (dict): Hizalanmış işlenmiş veri
+        train_days (int): Eğitim penceresi uzunluğu
+        test_days (int): Test penceresi uzunluğu
+        step_days (int): Katlar arası kayma
+        anchored (bool): Genişleyen eğitim penceresi kullan
+        num_episodes (int): Kat başına eğitim episode sayısı
+        update_frequency (int): Kaç episode'da bir güncelleme
+        n_workers (int): Paralel süreç sayısı
+        cache_path (str): İşçilerin okuyacağı veri önbelleği
+        seed (int): Tohum (kat indeksiyle kaydırılır)
+
+    Returns:
+        tuple: (kat tablosu DataFrame, katlar arası özet DataFrame, ham kat sonuçları)
+    """
+    folds = make_folds(processed_data['n_days'], train_days, test_days, step_days, anchored)
+    if not folds:
+        raise ValueError(f"{processed_data['n_days']} gün, {train_days}+{test_days} günlük kat için yetersiz")
+
+    DataManager().save_cache(processed_data, cache_path)
+    tasks = [{
+        'fold_id': fold_id,
+        'fold': fold,
+        'cache_path': cache_path,
+        'num_episodes': num_episodes,
+        'update_frequency': update_frequency,
+        'seed': seed + fold_id
+    } for fold_id, fold in enumerate(folds)]
+
+    print(f"\n🧭 Walk-forward backtest: {len(folds)} kat, {n_workers} işçi")
+    print("=" * 60)
+    start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context('spawn')) as pool:
+        fold_results = list(pool.map(_run_fold, tasks))
+
+    elapsed = time.perf_counter() - start_time
+
+    rows = []
+    for result in fold_results:
+        train_start, train_end, test_start, test_end = result['fold']
+        row = {'fold_id': result['fold_id'], 'train_start': train_start, 'train_end': train_end,
+               'test_start': test_start, 'test_end': test_end, 'seconds': result['elapsed_seconds']}
+        for key in SUMMARY_METRICS:
+            row[f'agent_{key}'] = result['agent_metrics'][key]
+            row[f'benchmark_{key}'] = result['benchmark_metrics'][key]
+        row['excess_return_pct'] = row['agent_total_return_pct'] - row['benchmark_total_return_pct']
+        rows.append(row)
+
+    fold_table = pd.DataFrame(rows)
+    metric_columns = [column for column in fold_table.columns if column.startswith(('agent_', 'benchmark_'))]
+    summary = fold_table[metric_columns + ['excess_return_pct']].agg(['mean', 'std', 'min', 'max']).T
+    summary['outperform_rate'] = np.nan
+    summary.loc['excess_return_pct', 'outperform_rate'] = float((fold_table['excess_return_pct'] > 0).mean())
+
+    sequential = fold_table['seconds'].sum()
+    print(f"✅ Walk-forward tamamlandı: {elapsed:.1f} sn (katlar toplamı {sequential:.1f} sn, "
+          f"en yavaş kat {fold_table['seconds'].max():.1f} sn)")
+
+    return fold_table, summary, fold_results
+
+
+def print_walk_forward_report(fold_table, summary):
+    """Kat bazında ve katlar arası özet raporu yazdır"""
+    print("\n" + "=" * 70)
+    print("                  WALK-FORWARD (TEST DIŞI) RAPORU")
+    print("=" * 70)
+    print(f"{'Kat':<5} {'Test Günleri':<15} {'Agent Getiri':<15} {'Benchmark':<15} {'Sharpe':<10}")
+    print("-" * 70)
+    for _, row in fold_table.iterrows():
+        days = f"{int(row['test_start'])}-{int(row['test_end'])}"
+        print(f"{int(row['fold_id']):<5} {days:<15} {row['agent_total_return_pct']:>10.2f}%    "
+              f"{row['benchmark_total_return_pct']:>10.2f}%    {row['agent_sharpe_ratio']:>8.3f}")
+    print("-" * 70)
+    print(f"Ortalama Agent Getirisi: %{summary.loc['agent_total_return_pct', 'mean']:.2f} "
+          f"(std %{summary.loc['agent_total_return_pct', 'std']:.2f})")
+    print(f"Ortalama Agent Sharpe: {summary.loc['agent_sharpe_ratio', 'mean']:.3f}")
+    print(f"Benchmark'ı Geçme Oranı: %{summary.loc['excess_return_pct', 'outperform_rate'] * 100:.0f}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    import argparse
+    from config import STOCK_SYMBOLS, DATA_PERIOD
+
+    parser = argparse.ArgumentParser(description="Paralel walk-forward backtest")
+    parser.add_argument("--train-days", type=int, default=WALK_FORWARD_TRAIN_DAYS, help="Eğitim penceresi")
+    parser.add_argument("--test-days", type=int, default=WALK_FORWARD_TEST_DAYS, help="Test penceresi")
+    parser.add_argument("--episodes", type=int, default=WALK_FORWARD_EPISODES, help="Kat başına episode")
+    parser.add_argument("--workers", type=int, default=WALK_FORWARD_WORKERS, help="Paralel süreç sayısı")
+    parser.add_argument("--anchored", action="store_true", help="Genişleyen eğitim penceresi")
+    parser.add_argument("--output", default="walk_forward_results.csv", help="Kat tablosu")
+    args = parser.parse_args()
+
+    data_manager = DataManager()
+    raw_data = data_manager.download_stock_data(STOCK_SYMBOLS, DATA_PERIOD)
+    if len(raw_data) < 2:
+        print("❌ Yeterli veri bulunamadı!")
+    else:
+        fold_table, summary, _ = run_walk_forward(
+            data_manager.process_data(raw_data), train_days=args.train_days, test_days=args.test_days,
+            anchored=args.anchored, num_episodes=args.episodes, n_workers=args.workers)
+        fold_table.to_csv(args.output, index=False)
+        print_walk_forward_report(fold_table, summary)